@@ -0,0 +1,305 @@
+"""
+Stage-level benchmarks for the resume scoring pipeline.
+
+Times each scoring stage and the full /analyze-resumes endpoint on synthetic
+corpora of increasing size, reports throughput and peak memory, checks that the
+service still produces exactly the scores of the frozen reference code, and
+fails on regressions against a stored baseline.
+
+    python benchmarks/run_benchmarks.py                      # run and compare with baseline.json
+    python benchmarks/run_benchmarks.py --update-baseline    # record a new baseline
+    python benchmarks/run_benchmarks.py --sizes 10 100 --repeat 1
+
+The Azure OpenAI client is replaced by a stub, so no network access is needed.
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, "..", "src", "services"))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import jobDescriptionAnalyzer as service
+import reference_scoring
+from synthetic_corpus import build_corpus, pdf_bytes
+from fastapi.testclient import TestClient
+
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+# Canned LLM answer used instead of calling Azure OpenAI
+STUB_ANALYSIS = """## Technical Skills:
+- Python, React, Docker, Kubernetes
+- PostgreSQL
+## Soft Skills:
+- Communication
+## Experience Requirements:
+1. 5+ years of backend development
+## Education Requirements:
+* Bachelor's degree in Computer Science
+"""
+
+class StubCompletions:
+    async def create(self, **kwargs):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=STUB_ANALYSIS))])
+
+class StubClient:
+    chat = SimpleNamespace(completions=StubCompletions())
+
+    async def close(self):
+        pass
+
+def reset_caches():
+    """Start every measurement with cold in-process caches."""
+    service._job_profile_cache = service.LRUCache(service.JOB_PROFILE_CACHE_SIZE)
+    service._skill_matcher_cache = service.LRUCache(service.SKILL_MATCHER_CACHE_SIZE)
+    service._skill_index_cache = service.LRUCache(service.SKILL_MATCHER_CACHE_SIZE)
+    service._phrase_embedder = None
+    service._scored_batch_cache = service.LRUCache(service.RERANK_BATCH_CACHE_SIZE)
+    service._batch_resume_cache = service.LRUCache(
+        service.RERANK_BATCH_CACHE_SIZE, max_total_size=service.BATCH_RESUME_CACHE_MB * 1024 * 1024
+    )
+    service._extracted_text_cache = None
+    service._job_analysis_cache = service.JobAnalysisCache(path=None)
+    service._job_analysis_requests = {}
+
+def measure(function, repeat):
+    """Best wall time over repeat runs, then peak traced memory of one more run."""
+    timings = []
+    for _ in range(repeat):
+        reset_caches()
+        gc.collect()
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+
+    reset_caches()
+    gc.collect()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak / 1024
+
+def reference_keyword_sets(resumes, job_description):
+    """Full keyword match and miss sets of the reference code per resume id, before the cut to ten."""
+    keyword_sets = {}
+    for resume in resumes:
+        text = service.resolve_resume_text(service.Resume(**resume))
+        _, matches, misses = reference_scoring.calculate_keyword_match(text, job_description["description"])
+        keyword_sets[resume["id"]] = {"matches": set(matches), "misses": set(misses)}
+    return keyword_sets
+
+def normalized(results, keyword_sets):
+    """
+    Results in a comparable form. Match and miss lists are compared sorted, and
+    skill context lines, which follow the matched skills' set order, by their
+    prefix. Keyword matches and misses are cut to ten entries drawn from a set,
+    so which ten depends on set order: when the reference's full set is longer,
+    any ten of its members compare equal.
+    """
+    normalized_results = []
+    for result in results:
+        result = service.ResumeScore(**result).model_dump()
+        for detail in result["scoreDetails"]:
+            for field in ("matches", "misses"):
+                values = sorted(detail[field])
+                full = keyword_sets[result["resumeId"]][field]
+                if detail["category"] == "Keywords" and len(full) > 10 and len(values) == 10 and full.issuperset(values):
+                    values = ["ten of", *sorted(full)]
+                detail[field] = values
+        result["evaluationDetails"] = [
+            "Skill context" if line.startswith("Skill context") else line for line in result["evaluationDetails"]
+        ]
+        normalized_results.append(result)
+    return normalized_results
+
+def check_equivalence(client, resumes, job_descriptions):
+    """Compare the service with the reference code on every job description; returns failure messages."""
+    failures = []
+    for job_description in job_descriptions:
+        keyword_sets = reference_keyword_sets(resumes, job_description)
+        expected = normalized(reference_scoring.analyze_resumes(
+            service.JobDescription(**job_description), [service.Resume(**resume) for resume in resumes]
+        ), keyword_sets)
+        response = client.post("/analyze-resumes", json={"jobDescription": job_description, "resumes": resumes})
+        actual = normalized(response.json(), keyword_sets)
+        if actual != expected:
+            mismatch = next(
+                (index for index, (a, e) in enumerate(zip(actual, expected)) if a != e),
+                min(len(actual), len(expected))
+            )
+            failures.append(
+                f"{job_description['title']} with {len(resumes)} resumes: first difference at rank {mismatch}"
+            )
+            continue
+
+        top_k = max(len(resumes) // 10, 1)
+        response = client.post(
+            "/analyze-resumes", json={"jobDescription": job_description, "resumes": resumes, "topK": top_k}
+        )
+        if normalized(response.json(), keyword_sets) != expected[:top_k]:
+            failures.append(f"{job_description['title']} with {len(resumes)} resumes: topK={top_k} differs")
+        
+        response = client.post(
+            "/analyze-resumes?view=summary", json={"jobDescription": job_description, "resumes": resumes}
+        )
+        summary_fields = list(service.ResumeSummary.model_fields)
+        if response.json() != [{field: result[field] for field in summary_fields} for result in expected]:
+            failures.append(f"{job_description['title']} with {len(resumes)} resumes: view=summary differs")
+    return failures
+
+def stages(client, size, seed):
+    """(name, item count, function) for every benchmarked stage at one corpus size."""
+    resumes, job_descriptions = build_corpus(size, seed=seed)
+    texts = [service.resolve_resume_text(service.Resume(**resume)) for resume in resumes]
+    pdfs = [pdf_bytes(text) for text in texts]
+    profile = service.compile_job_profile(service.JobDescription(**job_descriptions[0]))
+    skills = list(profile.skills)
+    requirements = list(profile.requirements)
+    # Profile with BM25 keyword weights over this corpus, for the score_matrix_bm25 stage
+    keyword_scorer = service.KEYWORD_SCORER
+    service.KEYWORD_SCORER = "bm25"
+    try:
+        bm25_profile = asyncio.run(service.weigh_job_keywords([service.Resume(**resume) for resume in resumes], profile))
+    finally:
+        service.KEYWORD_SCORER = keyword_scorer
+
+    def analyze_resumes():
+        for job_description in job_descriptions:
+            response = client.post("/analyze-resumes", json={"jobDescription": job_description, "resumes": resumes})
+            response.raise_for_status()
+
+    def analyze_resumes_summary():
+        for job_description in job_descriptions:
+            response = client.post(
+                "/analyze-resumes?view=summary", json={"jobDescription": job_description, "resumes": resumes}
+            )
+            response.raise_for_status()
+
+    return resumes, job_descriptions, [
+        ("extract_text_from_pdf", size, lambda: [service.extract_text_from_pdf(pdf) for pdf in pdfs]),
+        ("extract_resume_sections", size, lambda: [service.extract_resume_sections(text) for text in texts]),
+        ("calculate_keyword_match", size, lambda: [
+            service.calculate_keyword_match(text, profile.description, profile.keywords) for text in texts
+        ]),
+        ("enhanced_skills_match", size, lambda: [service.enhanced_skills_match(text, skills) for text in texts]),
+        ("calculate_experience_match", size, lambda: [
+            service.calculate_experience_match(text, requirements, profile.required_years) for text in texts
+        ]),
+        ("calculate_education_match", size, lambda: [
+            service.calculate_education_match(text, requirements, profile.required_level) for text in texts
+        ]),
+        ("score_matrix", size, lambda: service.score_matrix(
+            [service.ResumeDocument(text) for text in texts], profile
+        )),
+        ("score_matrix_bm25", size, lambda: service.score_matrix(
+            [service.ResumeDocument(text) for text in texts], bm25_profile
+        )),
+        ("analyze_resumes", size * len(job_descriptions), analyze_resumes),
+        ("analyze_resumes_summary", size * len(job_descriptions), analyze_resumes_summary)
+    ]
+
+def job_description_stage(client, count=20):
+    """The /analyze-job-description endpoint with the stubbed LLM: prompt building, parsing and caching."""
+    def analyze_job_descriptions():
+        for index in range(count):
+            response = client.post("/analyze-job-description", json={
+                "title": f"Job {index}", "company": "Example", "description": f"Build services, variant {index}"
+            })
+            response.raise_for_status()
+    return ("analyze_job_description", count, analyze_job_descriptions)
+
+def compare_with_baseline(results, baseline, tolerance, min_seconds):
+    """Failure messages for stages slower, or using more memory, than the baseline allows."""
+    failures = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        allowed = reference["seconds"] * (1 + tolerance)
+        if result["seconds"] > allowed and result["seconds"] - reference["seconds"] > min_seconds:
+            failures.append(f"{key}: {result['seconds']:.4f}s vs baseline {reference['seconds']:.4f}s")
+        if result["peakKb"] > reference["peakKb"] * (1 + tolerance) and result["peakKb"] - reference["peakKb"] > 1024:
+            failures.append(f"{key}: peak {result['peakKb']:.0f}KB vs baseline {reference['peakKb']:.0f}KB")
+    return failures
+
+def max_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best one counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown or memory growth (0.25 = 25%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.01, help="ignore slowdowns smaller than this")
+    parser.add_argument("--equivalence-limit", type=int, default=100,
+                        help="largest corpus checked against the reference scores (0 disables the check)")
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    service.client = StubClient()
+    # The reference scores are those of the substring keyword scorer
+    service.KEYWORD_SCORER = "substring"
+    reference_scoring.nlp = service.get_nlp()
+    failures = []
+    results = {}
+
+    print(f"{'stage':<28}{'size':>7}{'seconds':>11}{'items/s':>12}{'peak MB':>10}")
+    with TestClient(service.app) as client:
+        benchmarks = []
+        for size in args.sizes:
+            resumes, job_descriptions, size_stages = stages(client, size, args.seed)
+            if size <= args.equivalence_limit:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    failures += check_equivalence(client, resumes, job_descriptions)
+            benchmarks += [(size, stage) for stage in size_stages]
+        benchmarks.append((None, job_description_stage(client)))
+
+        for size, (name, items, function) in benchmarks:
+            with contextlib.redirect_stdout(io.StringIO()):
+                seconds, peak_kb = measure(function, args.repeat)
+            key = f"{name}@{size if size is not None else items}"
+            results[key] = {"seconds": round(seconds, 6), "itemsPerSecond": round(items / seconds, 2),
+                            "peakKb": round(peak_kb, 1)}
+            print(f"{name:<28}{size if size is not None else items:>7}{seconds:>11.4f}"
+                  f"{items / seconds:>12.1f}{peak_kb / 1024:>10.2f}")
+
+    print(f"max RSS: {max_rss_mb():.1f} MB")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            failures += compare_with_baseline(results, json.load(file), args.tolerance, args.min_seconds)
+    else:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Synthetic, seeded corpus for the benchmarks: resumes with sections, projects
+and date ranges, job descriptions, and minimal PDF/DOCX files of the resumes
+written without any third-party document libraries.
+"""
+import base64
+import io
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+SKILLS = [
+    "Python", "JavaScript", "TypeScript", "Java", "Go", "C#", "C++", ".NET", "React", "Angular",
+    "Vue.js", "Node.js", "Django", "Flask", "FastAPI", "Spring", "SQL", "PostgreSQL", "MongoDB",
+    "Redis", "AWS", "Azure", "GCP", "Docker", "Kubernetes", "k8s", "Terraform", "CI/CD", "GraphQL",
+    "REST API", "machine learning", "ML", "NLP", "TensorFlow", "PyTorch", "Kafka", "Spark",
+    "React Native", "object-oriented programming", "microservices"
+]
+WORDS = [
+    "scalable", "services", "team", "platform", "design", "data", "pipelines", "customers",
+    "backend", "frontend", "cloud", "testing", "performance", "architecture", "api", "mobile",
+    "analytics", "payments", "search", "reporting", "infrastructure", "automation"
+]
+TITLES = ["Software Engineer", "Senior Developer", "Backend Engineer", "Data Engineer", "Full Stack Developer"]
+EDUCATION = [
+    "PhD in Computer Science", "Master of Science (M.S.) in Computer Science", "MBA",
+    "Bachelor of Science, B.S. in Software Engineering", "B.A. in Mathematics",
+    "Associate degree A.S. in Information Technology", "AWS Certified Solutions Architect",
+    "High School Diploma"
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+def _date_range(rng, start_year, current):
+    end = "Present" if current else str(start_year + rng.randint(1, 4))
+    style = rng.random()
+    if style < 0.4:
+        return f"{start_year} - {end}"
+    if style < 0.7:
+        return f"{rng.choice(MONTHS)} {start_year} - {end}"
+    return f"{rng.randint(1, 12):02d}/{start_year} - {end}"
+
+def resume_text(rng, index):
+    """One synthetic resume with summary, skills, experience, projects and education sections."""
+    skills = rng.sample(SKILLS, rng.randint(3, 12))
+    lines = [f"Candidate {index}", f"candidate{index}@example.com", "", "Summary"]
+    if rng.random() < 0.6:
+        lines.append(f"{rng.choice(TITLES)} with {rng.randint(1, 15)}+ years of experience in {rng.choice(skills)}.")
+    else:
+        lines.append(f"Motivated engineer focused on {rng.choice(WORDS)} and {rng.choice(WORDS)}.")
+
+    lines += ["", "Technical Skills", ", ".join(skill if rng.random() < 0.7 else skill.lower() for skill in skills)]
+    lines.append(f"- Proficient in {rng.choice(skills)} and {rng.choice(WORDS)}")
+    lines.append(f"• Experience with {rng.choice(skills)}, {rng.choice(skills)}")
+
+    lines += ["", "Work Experience"]
+    year = rng.randint(2008, 2022)
+    for job in range(rng.randint(1, 4)):
+        lines.append(f"{rng.choice(TITLES)} at Company{rng.randint(1, 99)} {_date_range(rng, year, job == 0)}")
+        for _ in range(rng.randint(2, 4)):
+            lines.append(
+                f"- Developed {rng.choice(WORDS)} {rng.choice(WORDS)} using {rng.choice(skills)} "
+                f"and {rng.choice(SKILLS)}-based {rng.choice(WORDS)}"
+            )
+        lines.append(f"- Worked with {rng.choice(skills)} to improve {rng.choice(WORDS)} by {rng.randint(5, 60)}%")
+        year -= rng.randint(1, 4)
+
+    if rng.random() < 0.75:
+        lines += ["", "Projects"]
+        for project in range(rng.randint(1, 3)):
+            lines.append(f"Project {project + 1}: {rng.choice(WORDS).title()} {rng.choice(WORDS)}")
+            lines.append(
+                f"- Built a {rng.choice(WORDS)} {rng.choice(WORDS)} with {', '.join(rng.sample(SKILLS, 2))} "
+                f"for {rng.randint(100, 9000)} users"
+            )
+            lines.append(f"Technologies used: {', '.join(rng.sample(skills, min(3, len(skills))))}")
+
+    lines += ["", "Education", rng.choice(EDUCATION), f"Graduated {rng.randint(1995, 2022)}"]
+    if rng.random() < 0.3:
+        lines += ["", "Certifications", f"Certified in {rng.choice(skills)}"]
+    return "\n".join(lines)
+
+def job_description(rng, index, with_skills=True):
+    """One synthetic job description in the shape /analyze-resumes expects."""
+    skills = rng.sample(SKILLS, rng.randint(4, 10))
+    description = (
+        f"We are hiring a {rng.choice(TITLES)} to build {rng.choice(WORDS)} {rng.choice(WORDS)}. "
+        f"You need proficiency in {skills[0]} and experience with {skills[1]}. "
+        f"Knowledge of {skills[2]} is a plus. Build scalable services on AWS for customers "
+        f"using Python and React. Strong communication skills and ownership of {rng.choice(WORDS)}."
+    )
+    requirements = [
+        f"{rng.randint(2, 8)}+ years of experience",
+        rng.choice(["Bachelor's degree in Computer Science", "Master's degree preferred", "PhD", "High school diploma"]),
+        "At least 3 years with cloud platforms"
+    ]
+    return {
+        "title": f"Job {index}",
+        "description": description,
+        "skills": skills if with_skills else [],
+        "requirements": requirements
+    }
+
+def _pdf_string(text):
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+def pdf_bytes(text, lines_per_page=50):
+    """A minimal, valid PDF with one Helvetica text line per input line."""
+    lines = [line.encode("cp1252", "replace").decode("cp1252") for line in text.split("\n")]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # Objects 1-3 are the catalog, page tree and font; each page adds a page and a content object
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    page_ids = []
+    for page_lines in pages:
+        content = "BT /F1 10 Tf 14 TL 40 800 Td " + " ".join(f"{_pdf_string(line)} Tj T*" for line in page_lines) + " ET"
+        content = content.encode("cp1252")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        page_ids.append(len(objects) + 1)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects),)
+        )
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids)
+    )
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref_offset = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b"%010d 00000 n \n" % offset)
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return output.getvalue()
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+def docx_bytes(text):
+    """A minimal DOCX with one paragraph per input line."""
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in text.split("\n")
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", DOCX_RELS)
+        archive.writestr("word/document.xml", document)
+    return output.getvalue()
+
+def build_corpus(size, seed=0, file_share=0.2):
+    """
+    size resumes in the /analyze-resumes request shape plus three job descriptions
+    (the last without skills). About file_share of the resumes carry a PDF or
+    DOCX file as base64Data instead of plain content.
+    """
+    rng = random.Random(seed)
+    resumes = []
+    for index in range(size):
+        text = resume_text(rng, index)
+        resume = {
+            "id": f"resume-{index}",
+            "name": f"Candidate {index}",
+            "fileName": f"candidate-{index}.txt",
+            "uploadDate": "2024-01-01T00:00:00",
+            "content": text
+        }
+        if rng.random() < file_share:
+            if rng.random() < 0.5:
+                resume["fileName"] = f"candidate-{index}.pdf"
+                resume["base64Data"] = "data:application/pdf;base64," + base64.b64encode(pdf_bytes(text)).decode()
+            else:
+                resume["fileName"] = f"candidate-{index}.docx"
+                resume["base64Data"] = base64.b64encode(docx_bytes(text)).decode()
+            resume["content"] = ""
+        resumes.append(resume)
+
+    job_descriptions = [job_description(rng, index, with_skills=index < 2) for index in range(3)]
+    return resumes, job_descriptions
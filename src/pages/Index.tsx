@@ -48,8 +48,16 @@ const Index = () => {
     setIsAnalyzing(true);
     
     try {
-      const newScores = await analyzeResumes(resumesToAnalyze, jd);
-      setResumeScores((prev) => [...prev, ...newScores]);
+      // Show each score as soon as it is ready, then replace them with the final ranking
+      const streamedScores: ResumeScore[] = [];
+      const newScores = await analyzeResumes(resumesToAnalyze, jd, (score) => {
+        streamedScores.push(score);
+        setResumeScores((prev) => [...prev, score]);
+      });
+      setResumeScores((prev) => [
+        ...prev.filter((score) => !streamedScores.includes(score)),
+        ...newScores
+      ]);
       
       if (newScores.length > 0) {
         toast({
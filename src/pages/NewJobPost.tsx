@@ -165,7 +165,8 @@ const NewJobPost = () => {
     setAnalyzingJob(true);
     
     try {
-      // Call the API to analyze the job description
+      // Call the API to analyze the job description, showing sections as they arrive
+      const streamedSections: AnalyzedSection[] = [];
       const analysisResult = await analyzeJobDescription({
         title: jobDescription.title,
         company: jobDescription.company || "",
@@ -176,6 +177,9 @@ const NewJobPost = () => {
         location: jobDescription.location,
         salaryRange: jobDescription.salary,
         applicationDeadline: jobDescription.applicationDeadline?.toISOString()
+      }, (section) => {
+        streamedSections.push(section);
+        setJobAnalysis({ sections: [...streamedSections] });
       });
       
       // Store the analysis result
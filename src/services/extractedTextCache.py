@@ -0,0 +1,118 @@
+"""
+Content-addressed cache of text extracted from resume files.
+
+Entries are keyed by the SHA-256 of the file bytes and the file extension. A
+size-bounded in-memory LRU sits in front of an optional on-disk tier, which is
+also bounded and evicts the least recently used files first.
+"""
+import hashlib
+import logging
+import os
+import threading
+
+from lruCache import LRUCache
+
+# In-memory tier budget in megabytes, counting one byte per character of cached text
+EXTRACTED_TEXT_CACHE_MB = float(os.getenv("EXTRACTED_TEXT_CACHE_MB", "64"))
+# Directory of the on-disk tier; the tier is disabled when unset
+EXTRACTED_TEXT_CACHE_DIR = os.getenv("EXTRACTED_TEXT_CACHE_DIR") or None
+EXTRACTED_TEXT_CACHE_DISK_MB = float(os.getenv("EXTRACTED_TEXT_CACHE_DISK_MB", "512"))
+
+logger = logging.getLogger("resume_rank.extracted_text_cache")
+
+def file_key(file_data, file_extension):
+    """Cache key for the given file contents."""
+    return hashlib.sha256(file_data).hexdigest() + file_extension.lower()
+
+class ExtractedTextCache:
+    """Two-tier LRU cache mapping file keys to extracted text."""
+
+    def __init__(self, max_characters=EXTRACTED_TEXT_CACHE_MB * 1024 * 1024, directory=EXTRACTED_TEXT_CACHE_DIR,
+                 max_disk_bytes=EXTRACTED_TEXT_CACHE_DISK_MB * 1024 * 1024):
+        self.directory = directory
+        # Text sized by its characters, and the index of the files on disk sized by their bytes
+        self._memory = LRUCache(None, max_total_size=max_characters)
+        self._disk = LRUCache(None, max_total_size=max_disk_bytes)
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load_disk_index()
+
+    def _load_disk_index(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".txt"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index_disk(key, size)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".txt")
+
+    def _index_disk(self, key, size):
+        for evicted, _ in self._disk.put(key, size, size):
+            try:
+                os.unlink(self._path(evicted))
+            except OSError:
+                pass
+
+    def _read_disk(self, key):
+        try:
+            with open(self._path(key), encoding="utf-8") as file:
+                text = file.read()
+            os.utime(self._path(key))
+        except OSError:
+            self._disk.pop(key)
+            return None
+        # Counts as a use of the file, like the mtime update above
+        self._disk.get(key)
+        return text
+
+    def _write_disk(self, key, text):
+        data = text.encode("utf-8")
+        temp_path = self._path(key) + f".{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            logger.warning("Error writing extracted text cache entry: %s", e)
+            return
+        self._index_disk(key, len(data))
+
+    def get(self, key):
+        """Cached text for a key, or None."""
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                return text
+            if key in self._disk:
+                text = self._read_disk(key)
+                if text is not None:
+                    self._memory.put(key, text, len(text))
+                    self.disk_hits += 1
+                    return text
+            self.misses += 1
+            return None
+
+    def put(self, key, text):
+        with self._lock:
+            self._memory.put(key, text, len(text))
+            if self.directory and key not in self._disk:
+                self._write_disk(key, text)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self._memory.hits + self.disk_hits,
+                "memoryHits": self._memory.hits,
+                "diskHits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._memory),
+                "characters": self._memory.total_size,
+                "diskEntries": len(self._disk),
+                "diskBytes": self._disk.total_size
+            }
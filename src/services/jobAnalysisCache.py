@@ -0,0 +1,105 @@
+"""
+Cache of parsed job description analyses returned by the LLM.
+
+Entries expire after a TTL and the least recently used ones are evicted beyond
+a fixed size. When a file path is configured the cache is loaded from it on
+startup and written back shortly after changes, so analyses survive restarts.
+Writes happen on a background timer thread that batches changes made within
+the flush delay, so callers on the event loop never wait for the file.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from lruCache import LRUCache
+
+JOB_ANALYSIS_CACHE_SIZE = int(os.getenv("JOB_ANALYSIS_CACHE_SIZE", "256"))
+# Seconds an analysis is reused for
+JOB_ANALYSIS_CACHE_TTL = float(os.getenv("JOB_ANALYSIS_CACHE_TTL", "86400"))
+# JSON file the cache is persisted to; kept in memory only when unset
+JOB_ANALYSIS_CACHE_PATH = os.getenv("JOB_ANALYSIS_CACHE_PATH") or None
+# Seconds changes are collected for before the file is rewritten
+JOB_ANALYSIS_CACHE_FLUSH_DELAY = float(os.getenv("JOB_ANALYSIS_CACHE_FLUSH_DELAY", "1"))
+
+logger = logging.getLogger("resume_rank.job_analysis_cache")
+
+class JobAnalysisCache:
+    """LRU cache with per-entry expiry and optional JSON persistence."""
+
+    def __init__(self, maxsize=JOB_ANALYSIS_CACHE_SIZE, ttl=JOB_ANALYSIS_CACHE_TTL, path=JOB_ANALYSIS_CACHE_PATH,
+                 flush_delay=JOB_ANALYSIS_CACHE_FLUSH_DELAY):
+        self.ttl = ttl
+        self.path = path
+        self.flush_delay = flush_delay
+        # Values are (expiry time, analysis) pairs
+        self._entries = LRUCache(maxsize)
+        self._lock = threading.Lock()
+        # Held while writing the file, so snapshots are written in the order they were taken
+        self._save_lock = threading.Lock()
+        self._flush_timer = None
+        self._dirty = False
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                entries = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning("Error loading job analysis cache: %s", e)
+            return
+        now = time.time()
+        for key, expires, value in entries:
+            if expires > now:
+                self._entries.put(key, (expires, value))
+
+    def _save(self, entries):
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(entries, file)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning("Error saving job analysis cache: %s", e)
+
+    def _schedule_flush(self):
+        # Called with the lock held; one timer covers every change until it fires
+        self._dirty = True
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Write pending changes to the file now; does nothing when there are none."""
+        with self._save_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                entries = [[key, expires, value] for key, (expires, value) in self._entries.items()]
+            self._save(entries)
+
+    def get(self, key):
+        """Cached value for a key, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.peek(key)
+            if entry is not None and entry[0] <= time.time():
+                # Dropped first, so the lookup below counts it as a miss
+                self._entries.pop(key)
+            entry = self._entries.get(key)
+            return None if entry is None else entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries.put(key, (time.time() + self.ttl, value))
+            if self.path:
+                self._schedule_flush()
+
+    def stats(self):
+        return self._entries.stats()
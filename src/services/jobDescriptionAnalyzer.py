@@ -1,21 +1,215 @@
-from fastapi import FastAPI, Body, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, Body, HTTPException, Request, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional, Union
-import openai
+from typing import List, Dict, Any, Optional, Union, Tuple
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from functools import cached_property
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import heapq
+import logging
+import multiprocessing
 import os
 import json
+import math
 import base64
-import tempfile
-import PyPDF2
-import docx2txt
+import hashlib
+import io
+import threading
 import re
-import spacy
+import sys
+import time
 from datetime import datetime
 import uuid
 import httpx
+import numpy as np
+from rankingJobs import RankingJobStore
+from resumeCorpus import ResumeCorpus, term_counts, tokenize
+from extractedTextCache import ExtractedTextCache, file_key
+from jobAnalysisCache import JobAnalysisCache
+from lruCache import LRUCache
+from skillEmbeddings import EMBEDDING_BACKEND, CachedEmbedder, HashingEmbedder, SkillIndex, SpacyEmbedder
+import serviceMetrics as metrics
+from serviceMetrics import time_stage
 
-app = FastAPI()
+# Optional faster response encoders
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Log level of the service (DEBUG also logs the skills of every scored resume) and
+# log format: "text", or "json" for one JSON object per line
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+
+logger = logging.getLogger("resume_rank")
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_LOG_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class JsonLogFormatter(logging.Formatter):
+    """Format a record as one JSON object, including the fields passed through `extra`."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _LOG_RECORD_FIELDS)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+def configure_logging():
+    """Send the service's logs to stderr at LOG_LEVEL, once per process."""
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+
+configure_logging()
+
+class LazyApp:
+    """
+    ASGI entry point of the service. Routes, middleware and event handlers are recorded
+    at import and the FastAPI app is only built from them on first use, so scoring
+    workers, which import this module for its functions, never build it.
+    """
+
+    def __init__(self):
+        self._registrations = []
+        self._app = None
+        self._lock = threading.Lock()
+
+    def _register(self, method, args, kwargs, endpoint=None):
+        with self._lock:
+            if self._app is None:
+                self._registrations.append((method, args, kwargs, endpoint))
+                return
+        self._apply(self._app, method, args, kwargs, endpoint)
+
+    @staticmethod
+    def _apply(app, method, args, kwargs, endpoint):
+        if endpoint is None:
+            getattr(app, method)(*args, **kwargs)
+        else:
+            getattr(app, method)(*args, **kwargs)(endpoint)
+
+    def _decorator(self, method, args, kwargs):
+        def register(endpoint):
+            self._register(method, args, kwargs, endpoint)
+            return endpoint
+        return register
+
+    def get(self, *args, **kwargs):
+        return self._decorator("get", args, kwargs)
+
+    def post(self, *args, **kwargs):
+        return self._decorator("post", args, kwargs)
+
+    def delete(self, *args, **kwargs):
+        return self._decorator("delete", args, kwargs)
+
+    def on_event(self, *args, **kwargs):
+        return self._decorator("on_event", args, kwargs)
+
+    def add_middleware(self, *args, **kwargs):
+        self._register("add_middleware", args, kwargs)
+
+    def build(self):
+        """The FastAPI app, built on first use."""
+        with self._lock:
+            if self._app is None:
+                app = FastAPI()
+                for registration in self._registrations:
+                    self._apply(app, *registration)
+                self._app = app
+            return self._app
+
+    async def __call__(self, scope, receive, send):
+        await self.build()(scope, receive, send)
+
+app = LazyApp()
+
+# Limits on how much of an uploaded PDF is extracted
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "200000"))
+
+# Number of compiled job descriptions kept in memory across requests
+JOB_PROFILE_CACHE_SIZE = int(os.getenv("JOB_PROFILE_CACHE_SIZE", "128"))
+
+# Worker processes used to score resumes (0 scores on a thread in the API process)
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", str(os.cpu_count() or 1)))
+# Number of resumes sent to a scoring worker per task
+SCORING_CHUNK_SIZE = int(os.getenv("SCORING_CHUNK_SIZE", "8"))
+
+# Weights of the keyword, skills, experience and education scores in the overall score
+SCORE_WEIGHTS = (0.05, 0.45, 0.35, 0.15)
+# Scored batches kept in memory for re-ranking with other weights or skills
+RERANK_BATCH_CACHE_SIZE = int(os.getenv("RERANK_BATCH_CACHE_SIZE", "64"))
+# Budget in megabytes of the resumes kept with those batches for the detail endpoint,
+# counting one byte per character of resume text
+BATCH_RESUME_CACHE_MB = float(os.getenv("BATCH_RESUME_CACHE_MB", "128"))
+
+# Background workers running queued ranking jobs, and the resumes each job scores
+# between two progress updates (also the work lost when a job is interrupted)
+RANKING_JOB_WORKERS = int(os.getenv("RANKING_JOB_WORKERS", "1"))
+RANKING_JOB_STEP = int(os.getenv("RANKING_JOB_STEP", "200"))
+
+# Keyword scorer: "substring" scores the share of job keywords found anywhere in a resume,
+# "bm25" weighs whole-word keyword matches by rarity and frequency across the batch
+KEYWORD_SCORER = os.getenv("KEYWORD_SCORER", "substring").lower()
+# BM25 term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Skill matching: "lexical" (skill variations and synonyms) or "semantic", which also accepts
+# resume phrases whose embedding has at least SEMANTIC_THRESHOLD cosine similarity to a skill
+SKILL_MATCHING = os.getenv("SKILL_MATCHING", "lexical").lower()
+SEMANTIC_THRESHOLD = float(os.getenv("SEMANTIC_THRESHOLD", "0.75"))
+# Most similar resume phrases reported per semantically matched skill
+SEMANTIC_TOP_K = int(os.getenv("SEMANTIC_TOP_K", "3"))
+
+# Encoder of scoring responses: "standard" validates them against the response models,
+# "orjson" encodes them directly with orjson (clients may also ask for MessagePack)
+JSON_ENCODER = os.getenv("JSON_ENCODER", "standard").lower()
+if JSON_ENCODER == "orjson" and orjson is None:
+    logger.warning("JSON_ENCODER=orjson but orjson is not installed; using the standard encoder")
+    JSON_ENCODER = "standard"
+# Responses of at least GZIP_MIN_SIZE bytes are gzip-compressed for clients that accept it
+# (0 disables compression)
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "0"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+
+class NonStreamingGZipMiddleware(GZipMiddleware):
+    """
+    GZip compression for every response except those of the streaming endpoints,
+    whose messages would otherwise wait in the compressor's buffer.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
 
 # Add CORS middleware
 app.add_middleware(
@@ -24,31 +218,105 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Batch-Id"],
 )
 
+# Request counts, latencies and requests in flight for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
+if GZIP_MIN_SIZE > 0:
+    app.add_middleware(NonStreamingGZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL)
+
 # Azure OpenAI configuration
-endpoint = ""
-api_key = ""
-api_version = "2024-02-15-preview"
-deployment_name = "gpt-4o"
-
-# Initialize the Azure OpenAI client
-client = openai.AzureOpenAI(
-    azure_endpoint=endpoint,
-    api_key=api_key,
-    api_version=api_version,
-    http_client=httpx.Client()
-)
+endpoint = os.getenv("AZURE_OPENAI_ENDPOINT", "")
+api_key = os.getenv("AZURE_OPENAI_API_KEY", "")
+api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
+deployment_name = os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o")
 
-# Try to load spaCy NLP model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    import subprocess
-    subprocess.call([
-        "python", "-m", "spacy", "download", "en_core_web_sm"
-    ])
-    nlp = spacy.load("en_core_web_sm")
+# Timeouts in seconds, retry count and connection pool size for Azure OpenAI calls
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+
+# Azure OpenAI client, created on first use
+client = None
+
+# spaCy model name, and whether a missing model may be downloaded instead of failing fast
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+SPACY_AUTO_DOWNLOAD = os.getenv("SPACY_AUTO_DOWNLOAD", "1").lower() not in ("0", "false", "no")
+SPACY_DOWNLOAD_TIMEOUT = float(os.getenv("SPACY_DOWNLOAD_TIMEOUT", "300"))
+
+# Whether the warm-up also starts the scoring worker processes
+WARM_UP_SCORING_POOL = os.getenv("WARM_UP_SCORING_POOL", "1").lower() not in ("0", "false", "no")
+# A failed warm-up is retried after 1 second, doubling up to this many seconds
+WARM_UP_MAX_RETRY_DELAY = float(os.getenv("WARM_UP_MAX_RETRY_DELAY", "60"))
+
+def get_openai_client():
+    """
+    The Azure OpenAI client, created on first use. Calls are awaited so they never
+    block the event loop; failed calls are retried with exponential backoff.
+    """
+    global client
+    if client is None:
+        import openai
+        
+        client = openai.AsyncAzureOpenAI(
+            azure_endpoint=endpoint,
+            api_key=api_key,
+            api_version=api_version,
+            max_retries=OPENAI_MAX_RETRIES,
+            timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=OPENAI_MAX_CONNECTIONS
+                ),
+                timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT)
+            )
+        )
+    return client
+
+# spaCy NLP model, loaded once per process on first use
+_nlp = None
+_nlp_error = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """
+    The spaCy NLP model of this process, loaded on first use. If the model is
+    missing it is downloaded when SPACY_AUTO_DOWNLOAD allows it; otherwise, or if
+    that fails, the error is raised now and on every later call.
+    """
+    global _nlp, _nlp_error
+    if _nlp is not None:
+        return _nlp
+    with _nlp_lock:
+        if _nlp is None:
+            if _nlp_error is not None:
+                raise _nlp_error
+            import spacy
+            
+            try:
+                try:
+                    _nlp = spacy.load(SPACY_MODEL)
+                except OSError:
+                    if not SPACY_AUTO_DOWNLOAD:
+                        raise
+                    import subprocess
+                    subprocess.run(
+                        [sys.executable, "-m", "spacy", "download", SPACY_MODEL],
+                        check=True, timeout=SPACY_DOWNLOAD_TIMEOUT
+                    )
+                    _nlp = spacy.load(SPACY_MODEL)
+            except Exception as e:
+                _nlp_error = RuntimeError(f"spaCy model '{SPACY_MODEL}' could not be loaded: {str(e)}")
+                raise _nlp_error
+        return _nlp
+
+# Warm-up state reported by /readyz
+_warm_up = {"status": "starting", "detail": None, "seconds": None}
+_warm_up_task = None
 
 # Data Models
 class JobDescriptionRequest(BaseModel):
@@ -93,7 +361,7 @@ class ResumeScoreDetail(BaseModel):
     feedback: str
     contexts: Optional[Dict[str, List[str]]] = None
 
-class ResumeScore(BaseModel):
+class ResumeSummary(BaseModel):
     resumeId: str
     resumeName: str
     fileName: str
@@ -102,117 +370,289 @@ class ResumeScore(BaseModel):
     skillsMatch: int
     experienceMatch: int
     educationMatch: int
+
+class ResumeScore(ResumeSummary):
     evaluationDetails: List[str]
     scoreDetails: List[ResumeScoreDetail]
 
 class ResumeAnalysisRequest(BaseModel):
     jobDescription: JobDescription
     resumes: List[Resume]
+    topK: Optional[int] = None  # Only fully score and return the best K resumes
+
+class CorpusRankRequest(BaseModel):
+    jobDescription: JobDescription
+    resumeIds: Optional[List[str]] = None  # Search the whole corpus when omitted
+    topK: Optional[int] = None
+
+class ScoreWeights(BaseModel):
+    keyword: float = SCORE_WEIGHTS[0]
+    skills: float = SCORE_WEIGHTS[1]
+    experience: float = SCORE_WEIGHTS[2]
+    education: float = SCORE_WEIGHTS[3]
+
+class RerankRequest(BaseModel):
+    batchId: str
+    weights: Optional[ScoreWeights] = None  # Relative weights, normalized to sum to 1
+    disabledSkills: List[str] = []  # Job skills left out of the skills score
+    topK: Optional[int] = None
+
+class RerankedResume(BaseModel):
+    resumeId: str
+    overallScore: int
+    keywordMatch: int
+    skillsMatch: int
+    experienceMatch: int
+    educationMatch: int
+
+class JobMatchRequest(BaseModel):
+    jobDescriptions: List[JobDescription]
+    resumes: List[Resume]
+    topK: Optional[int] = None  # Length of each job's ranking
+
+class JobRanking(BaseModel):
+    title: str
+    batchId: str  # For /rerank
+    ranking: List[str]  # Resume ids, best first
+
+class JobMatchResponse(BaseModel):
+    resumeIds: List[str]
+    # jobs × resumes matrices, in request order
+    overallScores: List[List[int]]
+    keywordScores: List[List[int]]
+    skillsScores: List[List[int]]
+    experienceScores: List[List[int]]
+    educationScores: List[List[int]]
+    rankings: List[JobRanking]
+
+class RankingJob(BaseModel):
+    jobId: str
+    status: str  # "queued", "running", "done" or "failed"
+    total: int
+    completed: int
+    error: Optional[str] = None
+    createdAt: float
+    updatedAt: float
+
+class RankingJobResults(BaseModel):
+    jobId: str
+    total: int
+    offset: int
+    limit: int
+    results: List[ResumeScore]
+
+# Job Description Compilation
+# Education levels and the keywords that identify them, highest level first
+EDUCATION_LEVELS = {
+    "phd": ["phd", "ph.d", "doctor of philosophy", "doctorate"],
+    "masters": ["master", "ms", "m.s", "m.a", "mba", "m.b.a"],
+    "bachelors": ["bachelor", "bs", "b.s", "b.a", "undergraduate degree"],
+    "associate": ["associate", "a.s", "a.a"],
+    "certificate": ["certificate", "certification", "certified"],
+    "high school": ["high school", "hs", "diploma", "ged"]
+}
+
+# Skills used when neither the request nor the description yields any
+FALLBACK_JOB_SKILLS = ["Programming", "Development", "Software", "Web", "Mobile", "Cloud"]
+
+@dataclass(frozen=True)
+class KeywordWeights:
+    """
+    BM25 statistics of the job keywords for one batch of resumes: the distinct keyword
+    tokens, the positions of each keyword's tokens among them, their inverse document
+    frequencies and the average resume length in tokens.
+    """
+    terms: Tuple[str, ...]
+    keyword_terms: Tuple[Tuple[int, ...], ...]
+    idf: Tuple[float, ...]
+    average_length: float
+
+@dataclass(frozen=True)
+class JobProfile:
+    """
+    A job description compiled once into everything the resume scorers need. Profiles
+    scored with BM25 also carry the keyword weights of the batch being ranked.
+    """
+    description: str
+    requirements: Tuple[str, ...]
+    skills: Tuple[str, ...]
+    keywords: Tuple[str, ...]
+    required_years: int
+    required_level: str
+    keyword_weights: Optional[KeywordWeights] = None
+
+_job_profile_cache = LRUCache(JOB_PROFILE_CACHE_SIZE)
+
+# Parsed LLM analyses of job descriptions, loaded on first use, and the upstream
+# calls still in flight
+_job_analysis_cache = None
+_job_analysis_cache_lock = threading.Lock()
+_job_analysis_requests = {}
+
+# Text extracted from resume files, keyed by file content and created on first use
+_extracted_text_cache = None
+_extracted_text_cache_lock = threading.Lock()
+
+# Stored resume corpus, opened on first use
+_resume_corpus = None
+_resume_corpus_lock = threading.Lock()
+
+# Component scores of recently ranked batches, and their resumes in ranking order,
+# by batch id; the resumes are sized by their text and may be evicted first
+_scored_batch_cache = LRUCache(RERANK_BATCH_CACHE_SIZE)
+_batch_resume_cache = LRUCache(RERANK_BATCH_CACHE_SIZE, max_total_size=BATCH_RESUME_CACHE_MB * 1024 * 1024)
+
+# Ranking job queue, opened on first use, and the background workers draining it
+_ranking_job_store = None
+_ranking_job_store_lock = threading.Lock()
+_ranking_job_workers = []
+_ranking_job_wakeup = None
+
+# Process pool shared by all scoring requests, created on first use
+_scoring_pool = None
+_scoring_pool_lock = threading.Lock()
 
 # Helper Functions for Resume Analysis
-def extract_text_from_pdf(pdf_file):
-    """Extract text from a PDF file."""
-    try:
-        # First attempt: Standard parsing with strict=False
-        pdf_reader = PyPDF2.PdfReader(pdf_file, strict=False)
-        text = ""
-        for page in pdf_reader.pages:
-            try:
-                text += page.extract_text() + "\n"
-            except Exception as e:
-                print(f"Error extracting text from page: {str(e)}")
+# PDF trailer markers are looked for in the last kilobyte only
+PDF_TAIL_SIZE = 1024
+PDF_STARTXREF_PATTERN = re.compile(rb'startxref\s+(\d+)')
+PDF_OBJECT_HEADER_PATTERN = re.compile(rb'\d+\s+\d+\s+obj\b')
+
+# Streams are matched whole so literal strings are only taken from uncompressed ones
+PDF_RAW_TOKEN_PATTERN = re.compile(rb'(?<![a-z])stream\r?\n(.*?)endstream|\(([^)]+)\)', re.DOTALL)
+PDF_LITERAL_STRING_PATTERN = re.compile(rb'\(([^)]+)\)')
+
+def read_pdf_bytes(pdf_file):
+    """PDF contents as bytes from bytes, a memoryview, a binary file object or a path."""
+    if isinstance(pdf_file, bytes):
+        return pdf_file
+    if isinstance(pdf_file, (bytearray, memoryview)):
+        return bytes(pdf_file)
+    if isinstance(pdf_file, (str, os.PathLike)):
+        with open(pdf_file, 'rb') as file:
+            return file.read()
+    if isinstance(pdf_file, io.BytesIO):
+        # Shares the buffer of a BytesIO built from bytes instead of copying it
+        return pdf_file.getvalue()
+    pdf_file.seek(0)
+    return pdf_file.read()
+
+def repair_pdf_trailer(pdf_content):
+    """
+    Cheap trailer check run before parsing: add a missing %%EOF marker and point a
+    startxref offset that does not land on the cross-reference table at the last
+    "xref" keyword, so the parser does not fail or rescan the whole file.
+    """
+    tail_start = max(len(pdf_content) - PDF_TAIL_SIZE, 0)
+    tail = pdf_content[tail_start:]
+    if b"%%EOF" not in tail:
+        pdf_content += b"\n%%EOF"
+    
+    pointers = list(PDF_STARTXREF_PATTERN.finditer(tail))
+    if not pointers:
+        return pdf_content
+    startxref = pointers[-1]
+    
+    offset = int(startxref.group(1))
+    target = pdf_content[offset:offset + 32]
+    if target.startswith(b"xref") or PDF_OBJECT_HEADER_PATTERN.match(target):
+        return pdf_content
+    
+    # The last "xref" keyword that is not itself part of a "startxref"
+    xref_offset = pdf_content.rfind(b"xref", 0, tail_start + startxref.start())
+    while xref_offset >= 0 and pdf_content.endswith(b"start", 0, xref_offset):
+        xref_offset = pdf_content.rfind(b"xref", 0, xref_offset)
+    if xref_offset < 0:
+        return pdf_content
+    logger.warning("Broken startxref pointer (%d) - using the xref table at %d", offset, xref_offset)
+    number_start = tail_start + startxref.start(1)
+    number_end = tail_start + startxref.end(1)
+    return pdf_content[:number_start] + str(xref_offset).encode() + pdf_content[number_end:]
+
+def extract_pdf_pages(pdf_content):
+    """Page text of a parsed PDF, stopping at PDF_MAX_PAGES pages or PDF_MAX_CHARS characters."""
+    import PyPDF2
+    
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content), strict=False)
+    parts = []
+    length = 0
+    for page_number, page in enumerate(pdf_reader.pages):
+        if page_number >= PDF_MAX_PAGES or length >= PDF_MAX_CHARS:
+            break
+        try:
+            extracted = page.extract_text() + "\n"
+        except Exception as e:
+            logger.warning("Error extracting text from page: %s", e)
+            continue
+        parts.append(extracted)
+        length += len(extracted)
+    return "".join(parts)[:PDF_MAX_CHARS]
+
+def extract_raw_pdf_strings(pdf_content):
+    """
+    Last resort for PDFs that cannot be parsed: collect the literal strings found
+    outside streams and in unfiltered streams, skipping compressed stream data.
+    """
+    chunks = []
+    length = 0
+    for match in PDF_RAW_TOKEN_PATTERN.finditer(pdf_content):
+        if match.group(2) is not None:
+            candidates = [match.group(2)]
+        else:
+            # The stream dictionary sits between the object header and the stream keyword
+            header_start = max(pdf_content.rfind(b"obj", max(match.start() - 4096, 0), match.start()), 0)
+            if b"/Filter" in pdf_content[header_start:match.start()]:
                 continue
+            candidates = PDF_LITERAL_STRING_PATTERN.findall(match.group(1))
         
+        for chunk in candidates:
+            if len(chunk) > 4:  # Avoid short chunks that are likely not text
+                decoded = chunk.decode('utf-8', errors='ignore')
+                if any(c.isalpha() for c in decoded):
+                    chunks.append(decoded)
+                    length += len(decoded) + 1
+        if length >= PDF_MAX_CHARS:
+            break
+    
+    return (" ".join(chunks) + " ")[:PDF_MAX_CHARS] if chunks else ""
+
+def extract_text_from_pdf(pdf_file):
+    """Extract text from a PDF given as bytes, a memoryview, a binary file object or a path."""
+    try:
+        pdf_content = repair_pdf_trailer(read_pdf_bytes(pdf_file))
+    except Exception as e:
+        logger.warning("Error reading PDF file: %s", e)
+        return "Could not extract text from PDF due to file corruption or format issues."
+    
+    try:
+        text = extract_pdf_pages(pdf_content)
         if text.strip():
             return text
-            
+        
         # If we failed to extract any text, the PDF might be corrupted
         raise Exception("No text extracted from PDF")
     except Exception as e:
-        print(f"Error reading PDF file: {str(e)}")
-        
-        # Second attempt: Try a more permissive approach
-        try:
-            # Reopen the file and try with special handling for startxref errors
-            pdf_file.seek(0)
-            
-            # Read the file content
-            pdf_content = pdf_file.read()
-            
-            # Fix common issues with startxref pointers
-            try:
-                # Clean the content for PyPDF2 - this helps with some corrupted PDFs
-                if b"startxref" in pdf_content:
-                    # Ensure the file has an EOF marker
-                    if not pdf_content.strip().endswith(b"%%EOF"):
-                        pdf_content = pdf_content + b"\n%%EOF"
-                        
-                # Write the cleaned content to a temporary file
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                    temp_file.write(pdf_content)
-                    temp_path = temp_file.name
-                
-                # Try to read with the cleaned file
-                with open(temp_path, 'rb') as fixed_file:
-                    pdf_reader = PyPDF2.PdfReader(fixed_file, strict=False)
-                    text = ""
-                    for i in range(len(pdf_reader.pages)):
-                        try:
-                            page = pdf_reader.pages[i]
-                            extracted = page.extract_text()
-                            if extracted:
-                                text += extracted + "\n"
-                        except Exception as page_error:
-                            print(f"Error on page {i}: {str(page_error)}")
-                            continue
-                
-                # Clean up the temporary file
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
-                    
-                if text.strip():
-                    return text
-            except Exception as repair_error:
-                print(f"Repair attempt failed: {str(repair_error)}")
-                
-            # Third attempt: Try to extract text directly using a more basic approach
-            pdf_file.seek(0)
-            content = pdf_file.read()
-            
-            # Look for text using a simple pattern matching approach
-            import re
-            text_chunks = re.findall(b'\\(([^)]+)\\)', content)
-            extracted_text = b""
-            for chunk in text_chunks:
-                if len(chunk) > 4:  # Avoid short chunks that are likely not text
-                    try:
-                        # Try to decode as ASCII or UTF-8
-                        decoded = chunk.decode('utf-8', errors='ignore')
-                        if any(c.isalpha() for c in decoded):
-                            extracted_text += chunk + b" "
-                    except:
-                        pass
-            
-            if extracted_text:
-                try:
-                    return extracted_text.decode('utf-8', errors='ignore')
-                except:
-                    pass
-            
-            return "Could not extract text from PDF due to file corruption or format issues."
-        except Exception as third_error:
-            print(f"All recovery attempts failed: {str(third_error)}")
-            return "Could not extract text from PDF due to file corruption or format issues."
+        logger.warning("Error reading PDF file: %s", e)
+    
+    # Try to extract text directly using a more basic approach
+    try:
+        extracted_text = extract_raw_pdf_strings(pdf_content)
+        if extracted_text:
+            return extracted_text
+    except Exception as raw_error:
+        logger.warning("All recovery attempts failed: %s", raw_error)
+    
+    return "Could not extract text from PDF due to file corruption or format issues."
 
 def extract_text_from_docx(docx_file):
     """Extract text from a DOCX file."""
+    import docx2txt
+    
     text = docx2txt.process(docx_file)
     return text
 
 def extract_text_from_resume(file_path, file_extension):
-    """Extract text based on file type."""
+    """Extract text based on file type. Accepts a path or a binary file object."""
     if file_extension.lower() == '.pdf':
         return extract_text_from_pdf(file_path)
     elif file_extension.lower() in ['.docx', '.doc']:
@@ -220,22 +660,212 @@ def extract_text_from_resume(file_path, file_extension):
     else:
         return ""
 
-def calculate_keyword_match(resume_text, job_description_text):
-    """Calculate keyword match score based on important terms in job description."""
-    # Use NLP to extract important keywords from job description
-    job_doc = nlp(job_description_text.lower())
-    resume_doc = nlp(resume_text.lower())
-    
-    # Extract nouns, proper nouns, and adjectives as keywords
+def extract_text_from_file(file_data, file_extension):
+    """Extract text from file contents held in memory, without writing a temporary file."""
+    with time_stage("extraction"):
+        if file_extension.lower() == '.pdf':
+            return extract_text_from_pdf(file_data)
+        return extract_text_from_resume(io.BytesIO(file_data), file_extension)
+
+def is_extracted_text(text):
+    """Whether an extraction result holds usable resume text."""
+    return bool(text and text.strip() and not text.startswith("Could not extract"))
+
+# spaCy components each kind of NLP work needs; everything else is disabled
+POS_COMPONENTS = ("tok2vec", "tagger", "attribute_ruler")
+NER_COMPONENTS = ("tok2vec", "ner")
+
+def _components_except(needed):
+    """Names of the loaded pipeline components that a call site can skip."""
+    return [name for name in get_nlp().pipe_names if name not in needed]
+
+def pos_docs(texts):
+    """Run only the POS tagging components over a batch of texts."""
+    return get_nlp().pipe(texts, disable=_components_except(POS_COMPONENTS))
+
+def ner_docs(texts):
+    """Run only the entity recognizer over a batch of texts."""
+    return get_nlp().pipe(texts, disable=_components_except(NER_COMPONENTS))
+
+def _keywords_from_doc(job_doc):
+    """Unique nouns, proper nouns and adjectives of a tagged job description."""
+    # Keep first-occurrence order so results are stable across processes
     job_keywords = [token.text for token in job_doc if token.pos_ in ['NOUN', 'PROPN', 'ADJ'] 
                     and not token.is_stop and len(token.text) > 2]
+    return tuple(dict.fromkeys(job_keywords))
+
+def extract_job_keywords(job_description_text):
+    """Extract the unique keywords (nouns, proper nouns and adjectives) of a job description."""
+    return _keywords_from_doc(next(pos_docs([job_description_text.lower()])))
+
+def extract_job_skills(description, entity_doc=None):
+    """
+    Extract likely skills from a job description that came without an explicit skills list.
+    entity_doc may carry the description already run through the entity recognizer.
+    """
+    extracted_skills = []
+    
+    # Extract skills that are explicitly mentioned with common phrases
+    skill_phrases = [
+        r'proficiency (?:in|with) ([\w\s\./]+)',
+        r'experience (?:in|with) ([\w\s\./]+)',
+        r'knowledge of ([\w\s\./]+)',
+        r'familiar with ([\w\s\./]+)', 
+        r'skills (?:in|with) ([\w\s\./]+)',
+        r'expertise (?:in|with) ([\w\s\./]+)'
+    ]
+    
+    for pattern in skill_phrases:
+        matches = re.findall(pattern, description, re.IGNORECASE)
+        for match in matches:
+            # Clean up and add to extracted skills
+            skill = match.strip().rstrip('.,:;')
+            if len(skill) > 2:  # Ignore very short matches
+                extracted_skills.append(skill)
+    
+    # Also extract technical terms that might be skills
+    doc = entity_doc if entity_doc is not None else next(ner_docs([description]))
+    for ent in doc.ents:
+        if ent.label_ in ['ORG', 'PRODUCT', 'WORK_OF_ART'] and len(ent.text) > 2:
+            extracted_skills.append(ent.text)
+    
+    # Add common programming languages and frameworks if they appear
+    common_tech = [
+        "JavaScript", "TypeScript", "Python", "Java", "C#", "C++", "Ruby", "PHP", 
+        "React", "Angular", "Vue", "Node.js", "Django", "Flask", "Express", 
+        "AWS", "Azure", "GCP", "SQL", "NoSQL", "MongoDB"
+    ]
+    
+    for tech in common_tech:
+        if re.search(r'\b' + re.escape(tech) + r'\b', description, re.IGNORECASE):
+            extracted_skills.append(tech)
+    
+    # Remove duplicates
+    return list(dict.fromkeys(extracted_skills))
+
+# Years of experience asked for in a (lowercased) job requirement
+REQUIRED_YEARS_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*years'),
+    re.compile(r'(\d+)\+?\s*\+\s*years'),
+    re.compile(r'minimum\s+(?:of\s+)?(\d+)'),
+    re.compile(r'at\s+least\s+(\d+)')
+]
+
+def extract_required_years(job_requirements):
+    """Find the years of experience a job asks for, defaulting to 2."""
+    required_years = 0
+    for req in job_requirements:
+        req_lower = req.lower()
+        for pattern in REQUIRED_YEARS_PATTERNS:
+            matches = pattern.findall(req_lower)
+            if matches:
+                try:
+                    required_years = max(required_years, int(matches[0]))
+                except:
+                    pass
+    
+    # If no explicit year requirement, default to 2 years
+    if required_years == 0:
+        required_years = 2
+    
+    return required_years
+
+def extract_required_education(job_requirements):
+    """Find the education level a job asks for, defaulting to a bachelor's degree."""
+    required_level = None
+    for req in job_requirements:
+        req_lower = req.lower()
+        for level, keywords in EDUCATION_LEVELS.items():
+            if any(keyword in req_lower for keyword in keywords):
+                required_level = level
+                break
+        if required_level:
+            break
+    
+    # If no explicit education requirement, default to bachelors
+    if not required_level:
+        required_level = "bachelors"
+    
+    return required_level
+
+def _job_profile_key(job_description):
+    """Content hash of the job description fields that affect scoring."""
+    payload = json.dumps(
+        [job_description.description, list(job_description.skills), list(job_description.requirements)]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def compile_job_profiles(job_descriptions):
+    """
+    Compile job descriptions into JobProfiles, reusing cached profiles for identical
+    content. The NLP work for all uncached descriptions runs as batched pipe calls.
+    """
+    keys = [_job_profile_key(job_description) for job_description in job_descriptions]
+    profiles = [_job_profile_cache.get(key) for key in keys]
+    pending = {}
+    for index, profile in enumerate(profiles):
+        if profile is None:
+            pending.setdefault(keys[index], index)
+    if not pending:
+        return profiles
+    
+    todo = [job_descriptions[index] for index in pending.values()]
+    with time_stage("nlp"):
+        compiled = _compile_pending_profiles(pending, todo)
+    return [profile if profile is not None else compiled[key] for key, profile in zip(keys, profiles)]
+
+def _compile_pending_profiles(keys, todo):
+    """Run the batched NLP work for uncached job descriptions and cache the new profiles by key."""
+    keyword_docs = pos_docs([job_description.description.lower() for job_description in todo])
+    
+    # Extract skills from job description if none were provided
+    # This could happen if the job description wasn't analyzed separately before
+    without_skills = [job_description for job_description in todo if not job_description.skills]
+    entity_docs = dict(zip(
+        [id(job_description) for job_description in without_skills],
+        ner_docs([job_description.description for job_description in without_skills])
+    ))
+    
+    compiled = {}
+    for key, job_description, keyword_doc in zip(keys, todo, keyword_docs):
+        skills = list(job_description.skills) or extract_job_skills(
+            job_description.description, entity_docs.get(id(job_description))
+        )
+        if not skills:
+            # If still no skills, use a general fallback
+            skills = FALLBACK_JOB_SKILLS
+        
+        profile = JobProfile(
+            description=job_description.description,
+            requirements=tuple(job_description.requirements),
+            skills=tuple(skills),
+            keywords=_keywords_from_doc(keyword_doc),
+            required_years=extract_required_years(job_description.requirements),
+            required_level=extract_required_education(job_description.requirements)
+        )
+        _job_profile_cache.put(key, profile)
+        compiled[key] = profile
+    return compiled
+
+def compile_job_profile(job_description):
+    """Compile a single job description into a JobProfile (see compile_job_profiles)."""
+    return compile_job_profiles([job_description])[0]
+
+def calculate_keyword_match(resume, job_description_text, job_keywords=None):
+    """Calculate keyword match score based on important terms in job description."""
+    document = as_resume_document(resume)
+    
+    # Use NLP to extract important keywords from job description
+    if job_keywords is None:
+        job_keywords = extract_job_keywords(job_description_text)
     
     # Count unique keywords
-    unique_keywords = set(job_keywords)
+    unique_keywords = job_keywords
+    resume_lower = document.lower
     matches = []
     
     for keyword in unique_keywords:
-        if keyword in resume_text.lower():
+        if keyword in resume_lower:
             matches.append(keyword)
     
     # Calculate score (0-100)
@@ -247,47 +877,53 @@ def calculate_keyword_match(resume_text, job_description_text):
     
     return score, matches, misses
 
-def calculate_skills_match(resume_text, required_skills):
-    """Calculate skills match score based on required skills."""
-    if not resume_text or not required_skills:
-        return 0, [], required_skills
+# Common technology abbreviations and their full forms
+TECH_SYNONYMS = {
+    "js": ["javascript"],
+    "ts": ["typescript"],
+    "py": ["python"],
+    "react": ["reactjs", "react.js", "react js"],
+    "react native": ["reactnative"],
+    "node": ["node.js", "nodejs", "node js"],
+    "vue": ["vuejs", "vue.js", "vue js"],
+    "angular": ["angularjs", "angular.js", "angular js"],
+    "ai": ["artificial intelligence"],
+    "ml": ["machine learning"],
+    "dl": ["deep learning"],
+    "db": ["database"],
+    "ui": ["user interface"],
+    "ux": ["user experience"],
+    "aws": ["amazon web services"],
+    "gcp": ["google cloud platform", "google cloud"],
+    "azure": ["microsoft azure"],
+    "k8s": ["kubernetes"],
+    "ci/cd": ["ci", "cd", "continuous integration", "continuous deployment", "continuous delivery"],
+    "oop": ["object oriented programming", "object-oriented programming"],
+    ".net": ["dotnet", "dot net", "asp.net", "asp net"],
+    "c#": ["csharp", "c sharp"],
+    "java": ["java programming", "core java"],
+    "nlp": ["natural language processing"]
+}
 
-    matches = []
-    resume_lower = resume_text.lower()
-    
-    # Common technology abbreviations and their full forms
-    tech_synonyms = {
-        "js": ["javascript"],
-        "ts": ["typescript"],
-        "py": ["python"],
-        "react": ["reactjs", "react.js", "react js"],
-        "react native": ["reactnative"],
-        "node": ["node.js", "nodejs", "node js"],
-        "vue": ["vuejs", "vue.js", "vue js"],
-        "angular": ["angularjs", "angular.js", "angular js"],
-        "ai": ["artificial intelligence"],
-        "ml": ["machine learning"],
-        "dl": ["deep learning"],
-        "db": ["database"],
-        "ui": ["user interface"],
-        "ux": ["user experience"],
-        "aws": ["amazon web services"],
-        "gcp": ["google cloud platform", "google cloud"],
-        "azure": ["microsoft azure"],
-        "k8s": ["kubernetes"],
-        "ci/cd": ["ci", "cd", "continuous integration", "continuous deployment", "continuous delivery"],
-        "oop": ["object oriented programming", "object-oriented programming"],
-        ".net": ["dotnet", "dot net", "asp.net", "asp net"],
-        "c#": ["csharp", "c sharp"],
-        "java": ["java programming", "core java"],
-        "nlp": ["natural language processing"]
-    }
-    
-    # Convert skill variations to standard forms
+# Number of compiled skill matchers kept in memory across requests
+SKILL_MATCHER_CACHE_SIZE = int(os.getenv("SKILL_MATCHER_CACHE_SIZE", "128"))
+
+# Suffixes accepted directly after a skill ("APIs", "testing", "cloud-based", ...)
+SKILL_SUFFIX_PATTERN = re.compile(r'(?:s|ing|[\-\s]based|[\-\s]related)\b')
+
+# Phrases that introduce a skill ("experience with X", "knowledge of X", ...)
+SKILL_CONTEXT_PATTERN = re.compile(
+    r'\b(?:experience\s+(?:with|in|using)?\s+|knowledge\s+of\s+|proficient\s+(?:with|in)?\s+|skills?\s+(?:with|in)?\s+)'
+)
+
+WORD_CHAR_PATTERN = re.compile(r'\w')
+
+def build_skill_variations(skills):
+    """Map every spelling, separator variant and synonym of the given skills to the skill itself."""
     skill_variations = {}
     
     # Build a comprehensive synonym map
-    for skill in required_skills:
+    for skill in skills:
         skill_lower = skill.lower().strip()
         # Add the original skill
         if skill_lower not in skill_variations:
@@ -308,45 +944,220 @@ def calculate_skills_match(resume_text, required_skills):
                 
         # Add known synonyms
         skill_key = skill_lower.strip()
-        if skill_key in tech_synonyms:
-            for synonym in tech_synonyms[skill_key]:
+        if skill_key in TECH_SYNONYMS:
+            for synonym in TECH_SYNONYMS[skill_key]:
                 skill_variations[synonym] = skill
                 
         # Also check if this skill is a synonym for other skills
-        for tech, synonyms in tech_synonyms.items():
+        for tech, synonyms in TECH_SYNONYMS.items():
             if skill_lower in synonyms:
                 skill_variations[tech] = skill
     
-    # Check for skills in resume using better pattern matching
-    for skill_var, original_skill in skill_variations.items():
-        # Escape special regex characters
-        pattern = re.escape(skill_var)
+    return skill_variations
+
+def _trie_pattern(node):
+    """Render a character trie as a regex that matches the longest term along the text's path."""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    terminal = "" in node
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if terminal else group
+
+def _is_word_boundary(text, index):
+    """Equivalent of a regex \\b test at the given position."""
+    before = index > 0 and WORD_CHAR_PATTERN.match(text, index - 1) is not None
+    after = index < len(text) and WORD_CHAR_PATTERN.match(text, index) is not None
+    return before != after
+
+class SkillMatcher:
+    """
+    Finds every variation of a skill set in a single pass over a lowercased text.
+    All variations are compiled into one trie-shaped regex; each hit reports its
+    offsets so boundary, suffix and context rules are checked locally.
+    """
+
+    def __init__(self, skills):
+        self.skills = tuple(skills)
+        self.variations = build_skill_variations(self.skills)
+        terms = [variation for variation in self.variations if variation]
+        self._has_empty = len(terms) != len(self.variations)
         
-        # Different matching patterns
-        patterns = [
-            r'\b' + pattern + r'\b',  # Exact word boundary match
-            r'\b' + pattern + r's\b',  # Plural form
-            r'\b' + pattern + r'ing\b',  # Gerund form
-            r'\b' + pattern + r'[\-\s]based\b',  # For "X-based" pattern
-            r'\b' + pattern + r'[\-\s]related\b',  # For "X-related" pattern
-            r'\bexperience\s+(?:with|in|using)?\s+' + pattern + r'\b',  # "experience with X" pattern
-            r'\bknowledge\s+of\s+' + pattern + r'\b',  # "knowledge of X" pattern
-            r'\bproficient\s+(?:with|in)?\s+' + pattern + r'\b',  # "proficient in X" pattern
-            r'\bskills?\s+(?:with|in)?\s+' + pattern + r'\b',  # "skills in X" pattern
-        ]
+        trie = {}
+        for term in terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        self._pattern = re.compile("(?=(" + _trie_pattern(trie) + "))") if terms else None
         
-        # Check all patterns
-        for p in patterns:
-            if re.search(p, resume_lower, re.IGNORECASE):
-                if original_skill not in matches:
-                    matches.append(original_skill)
-                break
+        # The regex reports the longest term at each position; shorter terms that
+        # start at the same position are exactly the prefixes of that term
+        self._prefixes = {term: [other for other in terms if other != term and term.startswith(other)] for term in terms}
+        
+        # Column of every variation in a resume × variation matrix, and the incidence
+        # matrix folding those columns into one column per distinct skill
+        self.variation_columns = {variation: column for column, variation in enumerate(self.variations)}
+        self.skill_columns = list(dict.fromkeys(self.variations.values()))
+        column_of = {skill: column for column, skill in enumerate(self.skill_columns)}
+        self.skill_incidence = np.zeros((len(self.variations), len(self.skill_columns)), dtype=np.int32)
+        self.skill_incidence[
+            np.arange(len(self.variations)),
+            np.array([column_of[skill] for skill in self.variations.values()], dtype=np.intp)
+        ] = 1
+
+    def find(self, text):
+        """Return (start, end, variation) for every occurrence of every variation in text."""
+        occurrences = []
+        if self._pattern is None:
+            return occurrences
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            longest = match.group(1)
+            occurrences.append((start, start + len(longest), longest))
+            for shorter in self._prefixes[longest]:
+                occurrences.append((start, start + len(shorter), shorter))
+        return occurrences
+
+    def contained_in(self, text):
+        """Variations that occur anywhere in text, as plain substrings."""
+        found = {variation for _, _, variation in self.find(text)}
+        if self._has_empty:
+            found.add("")
+        return found
+
+    def exact_matches(self, text):
+        """Variations that occur in text as whole words or phrases."""
+        found = {
+            variation for start, end, variation in self.find(text)
+            if _is_word_boundary(text, start) and _is_word_boundary(text, end)
+        }
+        if self._has_empty and WORD_CHAR_PATTERN.search(text):
+            found.add("")
+        return found
+
+    def match(self, text):
+        """
+        Return (matched, exact) variation sets for text. A variation is matched as a
+        whole word, with a plural/gerund/"-based"/"-related" suffix, or right after a
+        phrase such as "experience with"; exact only holds whole-word hits.
+        """
+        matched = set()
+        exact = set()
+        context_ends = None
+        for start, end, variation in self.find(text):
+            before = _is_word_boundary(text, start)
+            after = _is_word_boundary(text, end)
+            if before and after:
+                exact.add(variation)
+                matched.add(variation)
+            elif variation in matched:
+                continue
+            elif before and SKILL_SUFFIX_PATTERN.match(text, end):
+                matched.add(variation)
+            elif after:
+                if context_ends is None:
+                    context_ends = {m.end() for m in SKILL_CONTEXT_PATTERN.finditer(text)}
+                if start in context_ends:
+                    matched.add(variation)
+        if self._has_empty and WORD_CHAR_PATTERN.search(text):
+            exact.add("")
+            matched.add("")
+        return matched, exact
+
+_skill_matcher_cache = LRUCache(SKILL_MATCHER_CACHE_SIZE)
+
+def get_skill_matcher(skills):
+    """Return the compiled SkillMatcher for a skill list, building it on first use."""
+    key = tuple(skills)
+    matcher = _skill_matcher_cache.get(key)
+    if matcher is None:
+        matcher = SkillMatcher(key)
+        _skill_matcher_cache.put(key, matcher)
+    return matcher
+
+# Embedder of skill and resume phrases, created on first use
+_phrase_embedder = None
+_phrase_embedder_lock = threading.Lock()
+
+_skill_index_cache = LRUCache(SKILL_MATCHER_CACHE_SIZE)
+
+def get_phrase_embedder():
+    """The cached phrase embedder of this process, using EMBEDDING_BACKEND."""
+    global _phrase_embedder
+    with _phrase_embedder_lock:
+        if _phrase_embedder is None:
+            if EMBEDDING_BACKEND == "hashing":
+                embedder = HashingEmbedder()
+            elif EMBEDDING_BACKEND == "spacy":
+                embedder = SpacyEmbedder(get_nlp())
+            else:
+                raise ValueError(f"Unknown EMBEDDING_BACKEND '{EMBEDDING_BACKEND}', expected 'hashing' or 'spacy'")
+            _phrase_embedder = CachedEmbedder(embedder)
+        return _phrase_embedder
+
+def get_skill_index(skills):
+    """The SkillIndex of a skill list, with columns in the order of its SkillMatcher's skill_columns."""
+    key = tuple(skills)
+    index = _skill_index_cache.get(key)
+    if index is None:
+        matcher = get_skill_matcher(key)
+        index = SkillIndex(matcher.variations, matcher.skill_columns, get_phrase_embedder())
+        _skill_index_cache.put(key, index)
+    return index
+
+def semantic_skill_matches(documents, skills):
+    """
+    Per document, {skill: [(phrase, similarity), ...]} for the skills that one of its
+    phrases is semantically close to, with up to SEMANTIC_TOP_K phrases best first.
+    The phrases of all documents are embedded together and each document's phrases
+    are compared with every skill in one matrix product.
+    """
+    index = get_skill_index(skills)
+    phrase_lists = [document.skill_phrases for document in documents]
+    unique_phrases = list(dict.fromkeys(phrase for phrases in phrase_lists for phrase in phrases))
+    vectors = get_phrase_embedder().embed(unique_phrases)
+    row_of = {phrase: row for row, phrase in enumerate(unique_phrases)}
     
-    # Also check for exact skills to catch anything missed
+    matches = []
+    for phrases in phrase_lists:
+        document_matches = {}
+        if phrases:
+            rows, similarities = index.top_k(vectors[[row_of[phrase] for phrase in phrases]], SEMANTIC_TOP_K)
+            for column, skill in enumerate(index.skills):
+                similar = [
+                    (phrases[row], round(float(similarity), 2))
+                    for row, similarity in zip(rows[:, column], similarities[:, column])
+                    if similarity >= SEMANTIC_THRESHOLD
+                ]
+                if similar:
+                    document_matches[skill] = similar
+        matches.append(document_matches)
+    return matches
+
+def calculate_skills_match(resume, required_skills):
+    """Calculate skills match score based on required skills."""
+    document = as_resume_document(resume)
+    if not document.text or not required_skills:
+        return 0, [], required_skills
+
+    matches = []
+    resume_lower = document.lower
+    
+    # Check for skills in resume using the compiled skill matcher
+    matcher = get_skill_matcher(required_skills)
+    matched_variations, exact_variations = matcher.match(resume_lower)
+    for skill_var, original_skill in matcher.variations.items():
+        if skill_var in matched_variations and original_skill not in matches:
+            matches.append(original_skill)
+    
+    # Also check for exact skills to catch anything missed
     for skill in required_skills:
         skill_clean = skill.lower().strip()
         # Look for the skill as a whole word or phrase
-        if skill not in matches and re.search(r'\b' + re.escape(skill_clean) + r'\b', resume_lower):
+        if skill not in matches and skill_clean in exact_variations:
             matches.append(skill)
     
     # Calculate score (0-100)
@@ -363,75 +1174,110 @@ def calculate_skills_match(resume_text, required_skills):
     
     return score, detailed_matches, misses
 
+# Claims of years of experience, in order of preference: the first claim of the first
+# pattern with any is the resume's years of experience
+EXPERIENCE_CLAIM_PATTERNS = (
+    r'(\d+)\+?\s*years?\s+(?:of\s+)?(?:work\s+)?experience',
+    r'experience\s*:?\s*(\d+)\+?\s*years?',
+    r'(?:professional|work)\s+experience\s*:?\s*(\d+)\+?\s*years?',
+    r'worked\s+(?:for|as)(?:\s+an?)?(?:\s+\w+){1,4}\s+(?:for|over)\s+(\d+)\+?\s*years?'
+)
+# Work history date ranges, capturing the start year or month; without a claim, experience
+# is counted from the earliest start
+DATE_RANGE_PATTERNS = (
+    r'(\d{4})\s*-\s*(?:present|current|now|\d{4})',
+    r'(\d{2}/\d{4})\s*-\s*(?:present|current|now|\d{2}/\d{4})'
+)
+
+# All claims and date ranges of a text in one pass. Each pattern is wrapped in a group named
+# after its position in EXPERIENCE_PATTERNS, and its own capturing group, the value, comes
+# right after. No two of the patterns can match from the same character, so the alternation
+# reports every match; and only one character is consumed per match, so matches of different
+# patterns never hide one another.
+EXPERIENCE_PATTERNS = EXPERIENCE_CLAIM_PATTERNS + DATE_RANGE_PATTERNS
+EXPERIENCE_GROUPS = {f"exp_{index}": index for index in range(len(EXPERIENCE_PATTERNS))}
+# The scanner starts with a character class any of the patterns can start with, which lets
+# the regex engine search for candidates without entering the pattern at every position.
+# That character is consumed, so the patterns have to be tested from one character back:
+# a one-character lookbehind holding a lookahead puts them exactly there.
+EXPERIENCE_SCANNER = re.compile(
+    r'[\dEePpWw](?<=(?=(?i:'
+    + "|".join(f"(?P<{name}>{EXPERIENCE_PATTERNS[index]})" for name, index in EXPERIENCE_GROUPS.items())
+    + ')).)'
+)
+
+# Every education keyword of a lowercased text in one pass: a keyword's first character is
+# consumed and the rest checked in a lookahead, and the empty group named after the keyword's
+# position in EDUCATION_KEYWORDS closing each alternative tells which keyword matched
+EDUCATION_KEYWORDS = [(keyword, level) for level, keywords in EDUCATION_LEVELS.items() for keyword in keywords]
+EDUCATION_SCANNER = re.compile("|".join(
+    f"{re.escape(keyword[0])}(?={re.escape(keyword[1:])}\\b)(?P<edu_{index}>)"
+    for index, (keyword, _) in enumerate(EDUCATION_KEYWORDS)
+))
+EDUCATION_GROUP_LEVELS = {f"edu_{index}": level for index, (_, level) in enumerate(EDUCATION_KEYWORDS)}
+EDUCATION_LEVEL_ORDER = list(EDUCATION_LEVELS)
+
+def scan_experience(text):
+    """
+    (claimed years or None, start years of the date ranges) of a text, in one pass of
+    EXPERIENCE_SCANNER. Claims and date ranges are exactly those re.findall would find
+    with each pattern on its own, ignoring case.
+    """
+    claim_count = len(EXPERIENCE_CLAIM_PATTERNS)
+    claimed_years, claim_pattern = None, claim_count
+    range_starts = []
+    # Date ranges of one pattern don't overlap: each starts after the previous one ends
+    range_ends = [0] * len(DATE_RANGE_PATTERNS)
+    for match in EXPERIENCE_SCANNER.finditer(text):
+        start = match.start()
+        index = EXPERIENCE_GROUPS[match.lastgroup]
+        whole = match.group(match.lastgroup)
+        # lastindex is the named group, which closes after the value group opened inside it
+        value = match.group(match.lastindex + 1)
+        if index < claim_count:
+            if index < claim_pattern:
+                claimed_years, claim_pattern = int(value), index
+        elif start >= range_ends[index - claim_count]:
+            range_ends[index - claim_count] = start + len(whole)
+            range_starts.append(int(value.split('/')[1]) if '/' in value else int(value))
+        if claim_pattern == 0:
+            # Nothing can beat a claim of the preferred pattern
+            break
+    return claimed_years, tuple(range_starts)
+
+def scan_education_level(resume_lower):
+    """Highest education level with a keyword in a lowercased text, in one pass of EDUCATION_SCANNER."""
+    best = len(EDUCATION_LEVEL_ORDER)
+    for match in EDUCATION_SCANNER.finditer(resume_lower):
+        if not _is_word_boundary(resume_lower, match.start()):
+            continue
+        rank = EDUCATION_LEVEL_ORDER.index(EDUCATION_GROUP_LEVELS[match.lastgroup])
+        if rank < best:
+            best = rank
+            if best == 0:
+                break
+    return EDUCATION_LEVEL_ORDER[best] if best < len(EDUCATION_LEVEL_ORDER) else None
+
+def experience_years(claimed_years, range_start_years):
+    """Years of experience: the claim if there is one, else the years since the earliest start."""
+    if claimed_years is not None:
+        return claimed_years
+    if range_start_years:
+        return max(datetime.now().year - min(range_start_years), 1)
+    return 0
+
 def extract_experience_info(resume_text):
     """Extract years of experience from resume text."""
-    experience_patterns = [
-        r'(\d+)\+?\s*years?\s+(?:of\s+)?(?:work\s+)?experience',
-        r'experience\s*:?\s*(\d+)\+?\s*years?',
-        r'(?:professional|work)\s+experience\s*:?\s*(\d+)\+?\s*years?',
-        r'worked\s+(?:for|as)(?:\s+an?)?(?:\s+\w+){1,4}\s+(?:for|over)\s+(\d+)\+?\s*years?'
-    ]
-    
-    # Try to find years of experience
-    for pattern in experience_patterns:
-        matches = re.findall(pattern, resume_text, re.IGNORECASE)
-        if matches:
-            try:
-                return int(matches[0])
-            except:
-                pass
-    
-    # If explicit year count not found, estimate from work history
-    job_patterns = [
-        r'(\d{4})\s*-\s*(?:present|current|now|\d{4})',
-        r'(\d{2}/\d{4})\s*-\s*(?:present|current|now|\d{2}/\d{4})'
-    ]
-    
-    all_years = []
-    for pattern in job_patterns:
-        matches = re.findall(pattern, resume_text, re.IGNORECASE)
-        for match in matches:
-            try:
-                if '/' in match:  # MM/YYYY format
-                    year = int(match.split('/')[1])
-                else:
-                    year = int(match)
-                all_years.append(year)
-            except:
-                pass
-    
-    if all_years:
-        return max(datetime.now().year - min(all_years), 1)
-    
-    return 0  # No experience info found
+    return experience_years(*scan_experience(resume_text))
 
-def calculate_experience_match(resume_text, job_requirements):
+def calculate_experience_match(resume, job_requirements, required_years=None):
     """Calculate experience match score based on job requirements."""
     # Extract years of experience from resume
-    resume_years = extract_experience_info(resume_text)
+    resume_years = as_resume_document(resume).experience_years
     
     # Look for required years of experience in job requirements
-    required_years = 0
-    for req in job_requirements:
-        req_lower = req.lower()
-        year_patterns = [
-            r'(\d+)\+?\s*years',
-            r'(\d+)\+?\s*\+\s*years',
-            r'minimum\s+(?:of\s+)?(\d+)',
-            r'at\s+least\s+(\d+)'
-        ]
-        
-        for pattern in year_patterns:
-            matches = re.findall(pattern, req_lower)
-            if matches:
-                try:
-                    required_years = max(required_years, int(matches[0]))
-                except:
-                    pass
-    
-    # If no explicit year requirement, default to 2 years
-    if required_years == 0:
-        required_years = 2
+    if required_years is None:
+        required_years = extract_required_years(job_requirements)
     
     # Calculate score (0-100)
     if resume_years >= required_years:
@@ -453,43 +1299,14 @@ def calculate_experience_match(resume_text, job_requirements):
     
     return score, matches, misses
 
-def calculate_education_match(resume_text, job_requirements):
+def calculate_education_match(resume, job_requirements, required_level=None):
     """Calculate education match score based on education requirements."""
-    # Define education levels and corresponding keywords
-    education_levels = {
-        "phd": ["phd", "ph.d", "doctor of philosophy", "doctorate"],
-        "masters": ["master", "ms", "m.s", "m.a", "mba", "m.b.a"],
-        "bachelors": ["bachelor", "bs", "b.s", "b.a", "undergraduate degree"],
-        "associate": ["associate", "a.s", "a.a"],
-        "certificate": ["certificate", "certification", "certified"],
-        "high school": ["high school", "hs", "diploma", "ged"]
-    }
-    
     # Look for required education level in job requirements
-    required_level = None
-    for req in job_requirements:
-        req_lower = req.lower()
-        for level, keywords in education_levels.items():
-            if any(keyword in req_lower for keyword in keywords):
-                required_level = level
-                break
-        if required_level:
-            break
-    
-    # If no explicit education requirement, default to bachelors
-    if not required_level:
-        required_level = "bachelors"
-    
-    # Determine resume education level
-    resume_level = None
-    resume_lower = resume_text.lower()
+    if required_level is None:
+        required_level = extract_required_education(job_requirements)
     
-    # Check in order of highest to lowest level
-    for level in ["phd", "masters", "bachelors", "associate", "certificate", "high school"]:
-        keywords = education_levels[level]
-        if any(re.search(r'\b' + re.escape(keyword) + r'\b', resume_lower) for keyword in keywords):
-            resume_level = level
-            break
+    # Highest education level mentioned in the resume
+    resume_level = as_resume_document(resume).education_level
     
     # Calculate score (0-100)
     education_rank = {
@@ -526,19 +1343,19 @@ def calculate_education_match(resume_text, job_requirements):
     
     return score, matches, misses
 
+# Common section headers in resumes
+RESUME_SECTION_HEADERS = {
+    'education': ['education', 'academic background', 'academic qualifications', 'qualifications', 'degrees'],
+    'experience': ['experience', 'work experience', 'employment history', 'work history', 'professional experience', 'career history'],
+    'skills': ['skills', 'technical skills', 'core skills', 'competencies', 'expertise', 'technical expertise', 'proficiencies'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects', 'project experience', 'project work'],
+    'achievements': ['achievements', 'accomplishments', 'awards', 'honors', 'recognitions'],
+    'certifications': ['certifications', 'certificates', 'professional certifications', 'accreditations'],
+    'summary': ['summary', 'professional summary', 'profile', 'about me', 'career objective', 'objective', 'career summary']
+}
+
 def extract_resume_sections(resume_text):
     """Extract different sections from a resume."""
-    # Define common section headers in resumes
-    section_headers = {
-        'education': ['education', 'academic background', 'academic qualifications', 'qualifications', 'degrees'],
-        'experience': ['experience', 'work experience', 'employment history', 'work history', 'professional experience', 'career history'],
-        'skills': ['skills', 'technical skills', 'core skills', 'competencies', 'expertise', 'technical expertise', 'proficiencies'],
-        'projects': ['projects', 'personal projects', 'academic projects', 'key projects', 'project experience', 'project work'],
-        'achievements': ['achievements', 'accomplishments', 'awards', 'honors', 'recognitions'],
-        'certifications': ['certifications', 'certificates', 'professional certifications', 'accreditations'],
-        'summary': ['summary', 'professional summary', 'profile', 'about me', 'career objective', 'objective', 'career summary']
-    }
-    
     # Initialize sections dictionary
     sections = {
         'education': "",
@@ -563,20 +1380,22 @@ def extract_resume_sections(resume_text):
         if not line:
             continue
             
-        # Check if this line is a section header
+        # Check if this line is a section header (only short lines can be headers)
         found_header = False
-        for section, headers in section_headers.items():
-            # Look for section headers (case insensitive)
-            if any(header.lower() in line.lower() for header in headers) and len(line) < 50:
-                # If we were collecting content for a previous section, save it
-                if section_content:
-                    sections[current_section] += "\n".join(section_content) + "\n"
-                    section_content = []
-                
-                # Switch to new section
-                current_section = section
-                found_header = True
-                break
+        if len(line) < 50:
+            line_lower = line.lower()
+            for section, headers in RESUME_SECTION_HEADERS.items():
+                # Look for section headers (case insensitive)
+                if any(header in line_lower for header in headers):
+                    # If we were collecting content for a previous section, save it
+                    if section_content:
+                        sections[current_section] += "\n".join(section_content) + "\n"
+                        section_content = []
+                    
+                    # Switch to new section
+                    current_section = section
+                    found_header = True
+                    break
         
         # If not a header, add to current section content
         if not found_header:
@@ -588,203 +1407,225 @@ def extract_resume_sections(resume_text):
     
     return sections
 
-def analyze_resume_projects(resume_text):
-    """Analyze projects mentioned in the resume to extract skills and experience."""
-    sections = extract_resume_sections(resume_text)
+def _find_project_chunks(sections):
+    """Split the projects of a resume (or project-like experience) into raw text chunks."""
     projects_text = sections['projects']
     
     if not projects_text:
         # Try to find projects in experience section if not found in dedicated section
         experience_text = sections['experience']
+        experience_lower = experience_text.lower()
         
         # Look for project indicators in experience
         project_indicators = ['project:', 'project -', 'project name:', 'developed', 'implemented', 'created', 'built']
         for indicator in project_indicators:
-            if indicator.lower() in experience_text.lower():
+            if indicator in experience_lower:
                 projects_text = experience_text
                 break
     
-    project_skills = []
-    project_descriptions = []
-    
-    if projects_text:
-        # Split by potential project separators
-        project_chunks = re.split(r'\n(?=[\•\-\*]\s+|[A-Z][a-z]+\s+[Pp]roject:?|[Pp]roject\s+\d+:?)', projects_text)
-        
-        for chunk in project_chunks:
-            if len(chunk.strip()) > 20:  # Ignore very short chunks
-                project_descriptions.append(chunk.strip())
-                
-                # Extract technical terms that might be skills
-                doc = nlp(chunk)
-                for token in doc:
-                    if token.pos_ in ['NOUN', 'PROPN'] and len(token.text) > 2 and not token.is_stop:
-                        potential_skill = token.text.lower()
-                        project_skills.append(potential_skill)
+    if not projects_text:
+        return []
     
-    return project_descriptions, project_skills
+    # Split by potential project separators
+    project_chunks = re.split(r'\n(?=[\•\-\*]\s+|[A-Z][a-z]+\s+[Pp]roject:?|[Pp]roject\s+\d+:?)', projects_text)
+    return [chunk for chunk in project_chunks if len(chunk.strip()) > 20]  # Ignore very short chunks
+
+class ResumeDocument:
+    """
+    A resume's text together with the features scorers derive from it. Every feature
+    is computed the first time a scorer asks for it and reused for the rest of the request.
+    """
+
+    def __init__(self, text):
+        self.text = text
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def sections(self):
+        return extract_resume_sections(self.text)
+
+    @cached_property
+    def lower_sections(self):
+        return {section_name: section_text.lower() for section_name, section_text in self.sections.items()}
+
+    @cached_property
+    def term_counts(self):
+        """Token counts of the resume and its length in tokens, for BM25 keyword scoring."""
+        return term_counts(self.text)
+
+    @cached_property
+    def skill_phrases(self):
+        """Distinct one- and two-word phrases of every line, compared with skills by semantic matching."""
+        phrases = {}
+        for line in self.lower.splitlines():
+            tokens = tokenize(line)
+            for position, token in enumerate(tokens):
+                phrases[token] = None
+                if position + 1 < len(tokens):
+                    phrases[token + " " + tokens[position + 1]] = None
+        return list(phrases)
+
+    @cached_property
+    def project_chunks(self):
+        return _find_project_chunks(self.sections)
+
+    @cached_property
+    def project_descriptions(self):
+        return [chunk.strip() for chunk in self.project_chunks]
+
+    def prepare_sections(self):
+        """
+        Split the resume into sections and find its project descriptions now, so the
+        skills and experience scorers sharing them find them cached. Returns the
+        project descriptions.
+        """
+        return self.project_descriptions
+
+    @cached_property
+    def experience_text(self):
+        """Experience section plus project descriptions, or the whole resume without projects."""
+        if not self.project_descriptions:
+            return self.text
+        return self.sections['experience'] + "\n" + "\n".join(self.project_descriptions)
+
+    @cached_property
+    def experience_claims(self):
+        """(claimed years of experience or None, start years of the date ranges), see scan_experience."""
+        return scan_experience(self.text)
+
+    @cached_property
+    def experience_years(self):
+        return experience_years(*self.experience_claims)
+
+    @cached_property
+    def education_level(self):
+        """Highest education level mentioned, see scan_education_level."""
+        return scan_education_level(self.lower)
+
+    @cached_property
+    def section_skill_phrases(self):
+        """Per section, the (lowercased phrase, context) pairs captured by SECTION_SKILL_PATTERNS."""
+        phrases = {}
+        for section_name, patterns in SECTION_SKILL_PATTERNS.items():
+            section_text = self.sections[section_name]
+            if not section_text:
+                continue
+            phrases[section_name] = [
+                (match.lower(), f"Found in {section_name} section: '{match.strip()}'")
+                for p in patterns for match in p.findall(section_text) if isinstance(match, str)
+            ]
+        return phrases
 
-def extract_contextual_skills(resume_text, job_skills):
+    def skill_mentions(self, matcher):
+        """
+        Where the variations of a SkillMatcher occur, computed once per matcher: for each
+        non-empty section a (section name, whole-word mentions, contexts captured by the
+        section patterns per variation) triple, and a (project, whole-word mentions) pair
+        for each project description.
+        """
+        mentions = self.__dict__.setdefault("_skill_mentions", {})
+        if matcher not in mentions:
+            section_mentions = []
+            for section_name, section_text in self.sections.items():
+                if not section_text:
+                    continue
+                found_contexts = {}
+                for phrase, context in self.section_skill_phrases.get(section_name, []):
+                    for skill_var in matcher.contained_in(phrase):
+                        found_contexts.setdefault(skill_var, []).append(context)
+                section_mentions.append(
+                    (section_name, matcher.exact_matches(self.lower_sections[section_name]), found_contexts)
+                )
+            project_mentions = [(project, matcher.exact_matches(project.lower())) for project in self.project_descriptions]
+            mentions[matcher] = (section_mentions, project_mentions)
+        return mentions[matcher]
+
+def as_resume_document(resume):
+    """Accept either raw resume text or a ResumeDocument."""
+    return resume if isinstance(resume, ResumeDocument) else ResumeDocument(resume)
+
+# Analysis patterns for each resume section
+SECTION_SKILL_PATTERNS = {
+    'experience': [
+        r'(?:used|utilized|developed with|worked with|experienced in|expertise in)\s+([\w\s\.\-\,\/]+)',
+        r'(?:proficient in|experience with|knowledge of)\s+([\w\s\.\-\,\/]+)'
+    ],
+    'skills': [
+        r'[\•\-\*]\s*([\w\s\.\-\,\/]+)',
+        r'([\w\s\.\-\,\/]+?)(?:[\:\,]|\s+and\s+)'
+    ],
+    'projects': [
+        r'(?:using|with|built with|developed with|implemented using)\s+([\w\s\.\-\,\/]+)',
+        r'(?:technologies|tech stack|tools|frameworks|languages)(?:\s+used)?(?:\s+include)?(?:\s*:)?\s+([\w\s\.\-\,\/]+)'
+    ],
+    'education': [
+        r'(?:studied|coursework in|focused on|specialized in)\s+([\w\s\.\-\,\/]+)'
+    ]
+}
+SECTION_SKILL_PATTERNS = {
+    section: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    for section, patterns in SECTION_SKILL_PATTERNS.items()
+}
+
+def extract_contextual_skills(resume, job_skills):
     """
     Extract skills from the resume with context awareness.
     Looks for skills in different sections and understands the context they're mentioned in.
     """
-    # Get resume sections
-    sections = extract_resume_sections(resume_text)
-    
-    # Extract projects and their skills
-    project_descriptions, project_skills = analyze_resume_projects(resume_text)
+    document = as_resume_document(resume)
     
     # Create a dictionary to track where skills are found and their context
     skill_contexts = {}
     
-    # Common technology abbreviations and their full forms
-    tech_synonyms = {
-        "js": ["javascript"],
-        "ts": ["typescript"],
-        "py": ["python"],
-        "react": ["reactjs", "react.js", "react js"],
-        "react native": ["reactnative"],
-        "node": ["node.js", "nodejs", "node js"],
-        "vue": ["vuejs", "vue.js", "vue js"],
-        "angular": ["angularjs", "angular.js", "angular js"],
-        "ai": ["artificial intelligence"],
-        "ml": ["machine learning"],
-        "dl": ["deep learning"],
-        "db": ["database"],
-        "ui": ["user interface"],
-        "ux": ["user experience"],
-        "aws": ["amazon web services"],
-        "gcp": ["google cloud platform", "google cloud"],
-        "azure": ["microsoft azure"],
-        "k8s": ["kubernetes"],
-        "ci/cd": ["ci", "cd", "continuous integration", "continuous deployment", "continuous delivery"],
-        "oop": ["object oriented programming", "object-oriented programming"],
-        ".net": ["dotnet", "dot net", "asp.net", "asp net"],
-        "c#": ["csharp", "c sharp"],
-        "java": ["java programming", "core java"],
-        "nlp": ["natural language processing"]
-    }
+    def add_context(skill, context):
+        if skill not in skill_contexts:
+            skill_contexts[skill] = []
+        if context not in skill_contexts[skill]:
+            skill_contexts[skill].append(context)
     
-    # Build a dictionary of skill variations for each job skill
-    skill_variations = {}
-    for skill in job_skills:
-        skill_lower = skill.lower().strip()
-        # Add the original skill
-        if skill_lower not in skill_variations:
-            skill_variations[skill_lower] = skill
-            
-        # Add variations with spaces, hyphens, dots
-        variations = [
-            skill_lower.replace(' ', ''),  # Remove spaces
-            skill_lower.replace(' ', '-'),  # Replace spaces with hyphens
-            skill_lower.replace(' ', '.'),  # Replace spaces with dots
-            skill_lower.replace('-', ' '),  # Replace hyphens with spaces
-            skill_lower.replace('.', ' '),  # Replace dots with spaces
-        ]
-        
-        for variation in variations:
-            if variation and variation != skill_lower:
-                skill_variations[variation] = skill
-                
-        # Add known synonyms
-        skill_key = skill_lower.strip()
-        if skill_key in tech_synonyms:
-            for synonym in tech_synonyms[skill_key]:
-                skill_variations[synonym] = skill
-                
-        # Also check if this skill is a synonym for other skills
-        for tech, synonyms in tech_synonyms.items():
-            if skill_lower in synonyms:
-                skill_variations[tech] = skill
+    # Compiled matcher holding every variation of each job skill
+    matcher = get_skill_matcher(job_skills)
+    skill_variations = matcher.variations
     
-    # Analysis patterns for each section
-    section_patterns = {
-        'experience': [
-            r'(?:used|utilized|developed with|worked with|experienced in|expertise in)\s+([\w\s\.\-\,\/]+)',
-            r'(?:proficient in|experience with|knowledge of)\s+([\w\s\.\-\,\/]+)'
-        ],
-        'skills': [
-            r'[\•\-\*]\s*([\w\s\.\-\,\/]+)',
-            r'([\w\s\.\-\,\/]+?)(?:[\:\,]|\s+and\s+)'
-        ],
-        'projects': [
-            r'(?:using|with|built with|developed with|implemented using)\s+([\w\s\.\-\,\/]+)',
-            r'(?:technologies|tech stack|tools|frameworks|languages)(?:\s+used)?(?:\s+include)?(?:\s*:)?\s+([\w\s\.\-\,\/]+)'
-        ],
-        'education': [
-            r'(?:studied|coursework in|focused on|specialized in)\s+([\w\s\.\-\,\/]+)'
-        ]
-    }
+    # Word boundary mentions and pattern contexts of every variation, per section and project
+    section_mentions, project_mentions = document.skill_mentions(matcher)
     
     # Analyze each section for skills with context
-    for section_name, section_text in sections.items():
-        if not section_text:
-            continue
-            
-        # Check for direct skill mentions in this section
+    for section_name, mentioned, found_contexts in section_mentions:
         for skill_var, original_skill in skill_variations.items():
-            # Escape special regex characters
-            pattern = re.escape(skill_var)
-            
-            # Different matching patterns based on section
-            if section_name in section_patterns:
-                matched = False
-                
-                # Try section-specific patterns first
-                for p in section_patterns[section_name]:
-                    matches = re.findall(p, section_text, re.IGNORECASE)
-                    for match in matches:
-                        if isinstance(match, str) and skill_var in match.lower():
-                            if original_skill not in skill_contexts:
-                                skill_contexts[original_skill] = []
-                            context = f"Found in {section_name} section: '{match.strip()}'"
-                            if context not in skill_contexts[original_skill]:
-                                skill_contexts[original_skill].append(context)
-                            matched = True
-                
-                # Also try direct word boundary match
-                if not matched:
-                    if re.search(r'\b' + pattern + r'\b', section_text, re.IGNORECASE):
-                        if original_skill not in skill_contexts:
-                            skill_contexts[original_skill] = []
-                        context = f"Mentioned in {section_name} section"
-                        if context not in skill_contexts[original_skill]:
-                            skill_contexts[original_skill].append(context)
-            else:
-                # For sections without specific patterns, use simple word boundary match
-                if re.search(r'\b' + pattern + r'\b', section_text, re.IGNORECASE):
-                    if original_skill not in skill_contexts:
-                        skill_contexts[original_skill] = []
-                    context = f"Mentioned in {section_name} section"
-                    if context not in skill_contexts[original_skill]:
-                        skill_contexts[original_skill].append(context)
+            if skill_var in found_contexts:
+                for context in found_contexts[skill_var]:
+                    add_context(original_skill, context)
+            elif skill_var in mentioned:
+                add_context(original_skill, f"Mentioned in {section_name} section")
     
     # Also analyze project descriptions specifically
-    for i, project in enumerate(project_descriptions):
+    for project, mentioned in project_mentions:
+        if not mentioned:
+            continue
+        
+        # Capture a brief project context
+        project_brief = project[:100] + "..." if len(project) > 100 else project
+        context = f"Used in project: '{project_brief}'"
         for skill_var, original_skill in skill_variations.items():
-            pattern = re.escape(skill_var)
-            if re.search(r'\b' + pattern + r'\b', project, re.IGNORECASE):
-                if original_skill not in skill_contexts:
-                    skill_contexts[original_skill] = []
-                    
-                # Capture a brief project context
-                project_brief = project[:100] + "..." if len(project) > 100 else project
-                context = f"Used in project: '{project_brief}'"
-                if context not in skill_contexts[original_skill]:
-                    skill_contexts[original_skill].append(context)
+            if skill_var in mentioned:
+                add_context(original_skill, context)
     
     # Return matched skills with their contexts
     matched_skills = list(skill_contexts.keys())
     return matched_skills, skill_contexts
 
-def enhanced_skills_match(resume_text, required_skills):
+def enhanced_skills_match(resume, required_skills):
     """Enhanced skills match with context awareness from different resume sections."""
-    if not resume_text or not required_skills:
+    document = as_resume_document(resume)
+    if not document.text or not required_skills:
         return 0, [], [], {}
     
     # Get contextual skills extraction
-    matched_skills, skill_contexts = extract_contextual_skills(resume_text, required_skills)
+    matched_skills, skill_contexts = extract_contextual_skills(document, required_skills)
     
     # Calculate score (0-100)
     if not required_skills:
@@ -795,50 +1636,8 @@ def enhanced_skills_match(resume_text, required_skills):
     
     return score, matched_skills, misses, skill_contexts
 
-@app.post("/analyze-job-description", response_model=JobDescriptionAnalysis)
-async def analyze_job_description(request: JobDescriptionRequest = Body(...)):
-    """
-    Analyze a job description and extract sections, requirements, and skills.
-    Now includes analysis of all job fields, not just the description.
-    """
-    try:
-        # Combine all fields into a comprehensive prompt
-        all_fields_text = f"""
-        Job Title: {request.title}
-        Company: {request.company}
-        """
-        
-        if request.department:
-            all_fields_text += f"Department: {request.department}\n"
-        
-        all_fields_text += f"\nJob Description:\n{request.description}\n"
-        
-        if request.requiredExperience:
-            all_fields_text += f"\nRequired Experience: {request.requiredExperience}\n"
-            
-        if request.employmentType:
-            all_fields_text += f"Employment Type: {request.employmentType}\n"
-            
-        if request.location:
-            all_fields_text += f"Location: {request.location}\n"
-            
-        if request.salaryRange:
-            all_fields_text += f"Salary Range: {request.salaryRange}\n"
-            
-        if request.applicationDeadline:
-            all_fields_text += f"Application Deadline: {request.applicationDeadline}\n"
-        
-        if request.jobRequirements:
-            all_fields_text += f"\nJob Requirements:\n{request.jobRequirements}\n"
-            
-        if request.jobResponsibilities:
-            all_fields_text += f"\nJob Responsibilities:\n{request.jobResponsibilities}\n"
-        
-        # Send the comprehensive job data for analysis
-        response = client.chat.completions.create(
-            model=deployment_name,
-            messages=[
-                {"role": "system", "content": """
+# System prompt for job description analysis
+JOB_ANALYSIS_SYSTEM_PROMPT = """
                 You are an AI assistant specialized in analyzing job descriptions.
                 Your task is to extract key sections, requirements, and skills from a job description.
                 Parse all fields provided including job title, company, department, experience, employment type, 
@@ -860,88 +1659,149 @@ async def analyze_job_description(request: JobDescriptionRequest = Body(...)):
                 For each section, provide a list of clear, concise points. 
                 For skills sections, list each skill separately and include all technical skills mentioned.
                 """
-                },
-                {"role": "user", "content": all_fields_text}
-            ],
-            temperature=0.3,
-            max_tokens=2000
-        )
+
+# Sampling settings for job description analysis
+JOB_ANALYSIS_TEMPERATURE = 0.3
+JOB_ANALYSIS_MAX_TOKENS = 2000
+
+def build_job_description_prompt(request):
+    """Combine all fields of a job description request into the user prompt."""
+    all_fields_text = f"""
+        Job Title: {request.title}
+        Company: {request.company}
+        """
+    
+    if request.department:
+        all_fields_text += f"Department: {request.department}\n"
+    
+    all_fields_text += f"\nJob Description:\n{request.description}\n"
+    
+    if request.requiredExperience:
+        all_fields_text += f"\nRequired Experience: {request.requiredExperience}\n"
         
-        analysis_text = response.choices[0].message.content.strip()
+    if request.employmentType:
+        all_fields_text += f"Employment Type: {request.employmentType}\n"
         
-        # Parse the analysis text into sections
-        sections = []
-        current_section = None
-        current_requirements = []
+    if request.location:
+        all_fields_text += f"Location: {request.location}\n"
         
-        for line in analysis_text.split('\n'):
-            stripped_line = line.strip()
+    if request.salaryRange:
+        all_fields_text += f"Salary Range: {request.salaryRange}\n"
+        
+    if request.applicationDeadline:
+        all_fields_text += f"Application Deadline: {request.applicationDeadline}\n"
+    
+    if request.jobRequirements:
+        all_fields_text += f"\nJob Requirements:\n{request.jobRequirements}\n"
+        
+    if request.jobResponsibilities:
+        all_fields_text += f"\nJob Responsibilities:\n{request.jobResponsibilities}\n"
+    
+    return all_fields_text
+
+class AnalysisSectionParser:
+    """
+    Incremental parser for the LLM analysis text. Text can be fed in arbitrary
+    chunks; each section is returned as soon as the next header closes it, and
+    the fallback and derived skills sections are produced by finish().
+    """
+
+    def __init__(self):
+        self.sections = []
+        self.current_section = None
+        self.current_requirements = []
+        self.fallback_requirements = []
+        self._pending = ""
+
+    def _close_section(self):
+        # Save previous section if it exists
+        if self.current_section and self.current_requirements:
+            section = {
+                "section_name": self.current_section,
+                "requirements": self.current_requirements
+            }
+            self.sections.append(section)
+            return section
+        return None
+
+    def feed_line(self, line):
+        """Parse one line; returns the section it closed, if any."""
+        stripped_line = line.strip()
+        
+        # Lines the fallback parser would keep if no sections are found
+        if stripped_line and len(stripped_line) > 10 and not stripped_line.isupper():
+            self.fallback_requirements.append(stripped_line)
+        
+        # Check if this is a section header
+        if (stripped_line and 
+            (stripped_line.endswith(':') or 
+             any(stripped_line.startswith(prefix) for prefix in ['#', '##', '**']) or
+             stripped_line.isupper())):
             
-            # Check if this is a section header
-            if (stripped_line and 
-                (stripped_line.endswith(':') or 
-                 any(stripped_line.startswith(prefix) for prefix in ['#', '##', '**']) or
-                 stripped_line.isupper())):
-                
-                # Save previous section if it exists
-                if current_section and current_requirements:
-                    sections.append({
-                        "section_name": current_section,
-                        "requirements": current_requirements
-                    })
-                    
-                # Start new section
-                current_section = stripped_line.rstrip(':').replace('#', '').replace('*', '').strip()
-                current_requirements = []
-                
-            # Check if this is a requirement (bullet point)
-            elif stripped_line.startswith(('-', '•', '*', '>', '·')) and stripped_line[1:].strip():
-                requirement = stripped_line[1:].strip()
-                if requirement and current_section:
-                    current_requirements.append(requirement)
-                    
-            # Check if this might be a numbered requirement
-            elif re.match(r'^\d+[\.\)]', stripped_line) and stripped_line[2:].strip():
-                requirement = re.sub(r'^\d+[\.\)]', '', stripped_line).strip()
-                if requirement and current_section:
-                    current_requirements.append(requirement)
+            closed = self._close_section()
             
-            # Check for "keyword:" format
-            elif ':' in stripped_line and not current_section:
-                parts = stripped_line.split(':', 1)
-                if len(parts) == 2 and parts[0].strip() and parts[1].strip():
-                    # This might be a requirement in "key: value" format
-                    requirement = stripped_line
-                    if current_section:
-                        current_requirements.append(requirement)
+            # Start new section
+            self.current_section = stripped_line.rstrip(':').replace('#', '').replace('*', '').strip()
+            self.current_requirements = []
+            return closed
+        
+        # Check if this is a requirement (bullet point)
+        elif stripped_line.startswith(('-', '•', '*', '>', '·')) and stripped_line[1:].strip():
+            requirement = stripped_line[1:].strip()
+            if requirement and self.current_section:
+                self.current_requirements.append(requirement)
+        
+        # Check if this might be a numbered requirement
+        elif re.match(r'^\d+[\.\)]', stripped_line) and stripped_line[2:].strip():
+            requirement = re.sub(r'^\d+[\.\)]', '', stripped_line).strip()
+            if requirement and self.current_section:
+                self.current_requirements.append(requirement)
+        
+        # Lines in "keyword: value" format outside any section are not requirements
+        return None
+
+    def feed(self, text):
+        """Parse a chunk of streamed text; returns the sections closed by its complete lines."""
+        lines = (self._pending + text).split('\n')
+        self._pending = lines.pop()
+        closed = [self.feed_line(line) for line in lines]
+        return [section for section in closed if section]
+
+    def finish(self):
+        """Close the last section and return it along with the fallback and derived sections."""
+        remaining = []
+        if self._pending:
+            line, self._pending = self._pending, ""
+            section = self.feed_line(line)
+            if section:
+                remaining.append(section)
         
         # Add the last section if it exists
-        if current_section and current_requirements:
-            sections.append({
-                "section_name": current_section,
-                "requirements": current_requirements
-            })
-            
-        # If no sections were found, try a different approach to parse the text
-        if not sections:
-            # Simple alternative parsing approach
-            current_section = "General Requirements"
-            current_requirements = []
-            
-            for line in analysis_text.split('\n'):
-                stripped_line = line.strip()
-                if stripped_line and len(stripped_line) > 10 and not stripped_line.isupper():
-                    current_requirements.append(stripped_line)
-            
-            if current_requirements:
-                sections.append({
-                    "section_name": current_section,
-                    "requirements": current_requirements
-                })
+        section = self._close_section()
+        if section:
+            remaining.append(section)
+        self.current_section = None
+        
+        # If no sections were found, use every substantial line as a general requirement
+        if not self.sections and self.fallback_requirements:
+            section = {
+                "section_name": "General Requirements",
+                "requirements": self.fallback_requirements
+            }
+            self.sections.append(section)
+            remaining.append(section)
         
+        section = self.technical_skills_section()
+        if section:
+            self.sections.append(section)
+            remaining.append(section)
+        return remaining
+
+    def technical_skills_section(self):
+        """Individual skills split out of the skills sections, unless a technical skills section exists."""
         # Additional processing for technical skills
         technical_skills = []
-        for section in sections:
+        for section in self.sections:
             # If this is a skills section, extract individual skills
             if 'skill' in section["section_name"].lower() or 'technolog' in section["section_name"].lower():
                 for req in section["requirements"]:
@@ -957,341 +1817,1699 @@ async def analyze_job_description(request: JobDescriptionRequest = Body(...)):
                         technical_skills.append(req)
         
         # If we found technical skills, add them as a separate section if not already present
-        if technical_skills and not any('technical skill' in s["section_name"].lower() for s in sections):
-            sections.append({
+        if technical_skills and not any('technical skill' in s["section_name"].lower() for s in self.sections):
+            return {
                 "section_name": "Individual Technical Skills",
                 "requirements": technical_skills
-            })
+            }
+        return None
+
+def parse_analysis_sections(analysis_text):
+    """Parse the complete LLM analysis text into sections of requirements."""
+    parser = AnalysisSectionParser()
+    for line in analysis_text.split('\n'):
+        parser.feed_line(line)
+    parser.finish()
+    return parser.sections
+
+def job_analysis_key(all_fields_text):
+    """Cache key for an analysis: the whitespace-normalized prompt plus the model settings."""
+    payload = json.dumps([
+        " ".join(all_fields_text.split()),
+        " ".join(JOB_ANALYSIS_SYSTEM_PROMPT.split()),
+        deployment_name,
+        JOB_ANALYSIS_TEMPERATURE
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+@contextmanager
+def track_llm_call():
+    """Time an Azure OpenAI call and count it, by outcome, and while it is in flight."""
+    outcome = "error"
+    try:
+        with metrics.in_flight(metrics.LLM_REQUESTS_IN_FLIGHT), time_stage("llm"):
+            yield
+        outcome = "success"
+    finally:
+        metrics.LLM_REQUESTS.labels(outcome).inc()
+
+async def request_job_analysis(all_fields_text):
+    """Run the LLM analysis of a job description prompt and parse it into sections."""
+    with track_llm_call():
+        response = await get_openai_client().chat.completions.create(
+            model=deployment_name,
+            messages=[
+                {"role": "system", "content": JOB_ANALYSIS_SYSTEM_PROMPT},
+                {"role": "user", "content": all_fields_text}
+            ],
+            temperature=JOB_ANALYSIS_TEMPERATURE,
+            max_tokens=JOB_ANALYSIS_MAX_TOKENS
+        )
+    
+    analysis_text = response.choices[0].message.content.strip()
+    return parse_analysis_sections(analysis_text)
+
+async def stream_job_analysis(all_fields_text):
+    """Run the LLM analysis of a job description prompt, yielding the text as it is generated."""
+    with track_llm_call():
+        stream = await get_openai_client().chat.completions.create(
+            model=deployment_name,
+            messages=[
+                {"role": "system", "content": JOB_ANALYSIS_SYSTEM_PROMPT},
+                {"role": "user", "content": all_fields_text}
+            ],
+            temperature=JOB_ANALYSIS_TEMPERATURE,
+            max_tokens=JOB_ANALYSIS_MAX_TOKENS,
+            stream=True
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.response.aclose()
+
+async def analyze_job_prompt(all_fields_text):
+    """
+    Sections for a job description prompt. Cached analyses are reused, and
+    concurrent requests for the same prompt share a single upstream call.
+    """
+    key = job_analysis_key(all_fields_text)
+    sections = get_job_analysis_cache().get(key)
+    if sections is not None:
+        return sections
+    
+    task = _job_analysis_requests.get(key)
+    if task is None:
+        task = asyncio.ensure_future(request_job_analysis(all_fields_text))
+        _job_analysis_requests[key] = task
+        
+        def finish(task):
+            _job_analysis_requests.pop(key, None)
+            if not task.cancelled() and task.exception() is None:
+                get_job_analysis_cache().put(key, task.result())
+        task.add_done_callback(finish)
+    
+    # Shielded so a client disconnecting does not cancel the call others are waiting on
+    return await asyncio.shield(task)
+
+@app.post("/analyze-job-description", response_model=JobDescriptionAnalysis)
+async def analyze_job_description(request: JobDescriptionRequest = Body(...)):
+    """
+    Analyze a job description and extract sections, requirements, and skills.
+    Now includes analysis of all job fields, not just the description.
+    """
+    try:
+        # Combine all fields into a comprehensive prompt
+        all_fields_text = build_job_description_prompt(request)
+        
+        # Send the comprehensive job data for analysis, unless it was analyzed before
+        sections = await analyze_job_prompt(all_fields_text)
         
         # Return the analysis
         return {"sections": sections}
         
     except Exception as e:
-        print(f"Error analyzing job description: {str(e)}")
+        logger.error("Error analyzing job description: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/analyze-resumes", response_model=List[ResumeScore])
-async def analyze_resumes(request: ResumeAnalysisRequest = Body(...)):
-    try:
-        job_description = request.jobDescription
-        resumes = request.resumes
-        
-        # Validate and preprocess job description
-        if not job_description.skills or len(job_description.skills) == 0:
-            # Extract skills from job description if none were provided
-            # This could happen if the job description wasn't analyzed separately before
-            extracted_skills = []
-            
-            # Extract skills that are explicitly mentioned with common phrases
-            skill_phrases = [
-                r'proficiency (?:in|with) ([\w\s\./]+)',
-                r'experience (?:in|with) ([\w\s\./]+)',
-                r'knowledge of ([\w\s\./]+)',
-                r'familiar with ([\w\s\./]+)', 
-                r'skills (?:in|with) ([\w\s\./]+)',
-                r'expertise (?:in|with) ([\w\s\./]+)'
-            ]
-            
-            for pattern in skill_phrases:
-                matches = re.findall(pattern, job_description.description, re.IGNORECASE)
-                for match in matches:
-                    # Clean up and add to extracted skills
-                    skill = match.strip().rstrip('.,:;')
-                    if len(skill) > 2:  # Ignore very short matches
-                        extracted_skills.append(skill)
-            
-            # Also extract technical terms that might be skills
-            doc = nlp(job_description.description)
-            for ent in doc.ents:
-                if ent.label_ in ['ORG', 'PRODUCT', 'WORK_OF_ART'] and len(ent.text) > 2:
-                    extracted_skills.append(ent.text)
+@app.post("/analyze-job-description/stream")
+async def analyze_job_description_stream(request: JobDescriptionRequest = Body(...), format: str = "ndjson"):
+    """
+    Streaming variant of /analyze-job-description. Emits a "section" message for each
+    section as soon as the model finishes writing it, the derived "Individual Technical
+    Skills" section last, then a "done" message with all sections. Use ?format=sse for
+    Server-Sent Events instead of NDJSON.
+    """
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+    
+    all_fields_text = build_job_description_prompt(request)
+    key = job_analysis_key(all_fields_text)
+    
+    async def messages():
+        try:
+            sections = get_job_analysis_cache().get(key)
+            if sections is None:
+                parser = AnalysisSectionParser()
+                async for text in stream_job_analysis(all_fields_text):
+                    for section in parser.feed(text):
+                        yield _stream_message({"type": "section", "section": section}, format)
+                for section in parser.finish():
+                    yield _stream_message({"type": "section", "section": section}, format)
+                sections = parser.sections
+                get_job_analysis_cache().put(key, sections)
+            else:
+                for section in sections:
+                    yield _stream_message({"type": "section", "section": section}, format)
             
-            # Add common programming languages and frameworks if they appear
-            common_tech = [
-                "JavaScript", "TypeScript", "Python", "Java", "C#", "C++", "Ruby", "PHP", 
-                "React", "Angular", "Vue", "Node.js", "Django", "Flask", "Express", 
-                "AWS", "Azure", "GCP", "SQL", "NoSQL", "MongoDB"
-            ]
-            
-            for tech in common_tech:
-                if re.search(r'\b' + re.escape(tech) + r'\b', job_description.description, re.IGNORECASE):
-                    extracted_skills.append(tech)
-            
-            # Remove duplicates and update job description
-            job_description.skills = list(set(extracted_skills))
+            yield _stream_message({"type": "done", "sections": sections}, format)
+        except Exception as e:
+            logger.error("Error analyzing job description: %s", e)
+            yield _stream_message({"type": "error", "detail": str(e)}, format)
+    
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(messages(), media_type=media_type)
+
+def calculate_overall_score(keyword_score, skills_score, experience_score, education_score, weights=SCORE_WEIGHTS):
+    """
+    Weighted average of the component scores, for single scores or NumPy arrays of
+    them. weights are the (keyword, skills, experience, education) weights.
+    """
+    keyword_weight, skills_weight, experience_weight, education_weight = weights
+    weighted = (
+        keyword_score * keyword_weight +
+        skills_score * skills_weight +
+        experience_score * experience_weight +
+        education_score * education_weight
+    )
+    # Arrays are truncated like int(); scores are never negative
+    return weighted.astype(np.int64) if isinstance(weighted, np.ndarray) else int(weighted)
+
+def coverage_scores(hits, total):
+    """
+    min(100, int(matched / total * 100)) for every row of a boolean resume × term
+    matrix, in the same float arithmetic as the per-resume scorers; 0 when total is 0.
+    """
+    if total == 0:
+        return np.zeros(hits.shape[0], dtype=np.int64)
+    return np.minimum(100, (hits.sum(axis=1) / total * 100).astype(np.int64))
+
+def keyword_terms(keywords):
+    """Distinct tokens of the job keywords, and per keyword the positions of its tokens among them."""
+    terms = {}
+    positions = []
+    for keyword in keywords:
+        positions.append(tuple(terms.setdefault(token, len(terms)) for token in dict.fromkeys(tokenize(keyword))))
+    return tuple(terms), tuple(positions)
+
+def bm25_idf(document_frequency, total):
+    """BM25 inverse document frequency of a term found in document_frequency of total documents."""
+    return math.log(1 + (total - document_frequency + 0.5) / (document_frequency + 0.5))
+
+def keyword_row(document, job_profile):
+    """
+    The document's row of the keyword matrix: whether each job keyword occurs in the
+    resume text, or with BM25 weights how often each keyword token occurs in it.
+    """
+    weights = job_profile.keyword_weights
+    if weights is None:
+        resume_lower = document.lower
+        return [keyword in resume_lower for keyword in job_profile.keywords]
+    counts, _ = document.term_counts
+    return [counts[term] for term in weights.terms]
+
+def score_keyword_rows(rows, documents, job_profile):
+    """
+    The resume × job keyword hit matrix and the keyword score of every resume, from
+    the keyword_row of each document.
+    
+    Without keyword weights a keyword is hit when it occurs anywhere in the resume and
+    the score is the share of keywords hit, as in calculate_keyword_match. With BM25
+    weights a keyword is hit when all its tokens occur as whole words, and the score is
+    the IDF-weighted average of each token's BM25 term frequency, capped at 1: one
+    mention counts fully in a resume of average length, longer resumes need more.
+    The scores are a matrix product of the saturated term frequencies and the IDFs.
+    """
+    weights = job_profile.keyword_weights
+    if weights is None:
+        hits = np.array(rows, dtype=bool).reshape(len(rows), len(job_profile.keywords))
+        return hits, coverage_scores(hits, len(job_profile.keywords))
+    
+    frequencies = np.array(rows, dtype=np.float64).reshape(len(rows), len(weights.terms))
+    present = frequencies > 0
+    hits = np.zeros((len(rows), len(weights.keyword_terms)), dtype=bool)
+    for column, positions in enumerate(weights.keyword_terms):
+        if positions:
+            hits[:, column] = present[:, list(positions)].all(axis=1)
+    
+    idf = np.array(weights.idf, dtype=np.float64)
+    if not idf.size:
+        return hits, np.zeros(len(rows), dtype=np.int64)
+    lengths = np.array([document.term_counts[1] for document in documents], dtype=np.float64)
+    length_norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / weights.average_length)
+    saturated = np.minimum(1.0, frequencies * (BM25_K1 + 1) / (frequencies + length_norm[:, None]))
+    return hits, np.minimum(100, (saturated @ idf / idf.sum() * 100).astype(np.int64))
+
+def matched_skill_variations(document, matcher):
+    """Variations extract_contextual_skills finds anywhere: mentioned in a section or project, or in a pattern context."""
+    section_mentions, project_mentions = document.skill_mentions(matcher)
+    found = set()
+    for _, mentioned, found_contexts in section_mentions:
+        found |= mentioned
+        found.update(found_contexts)
+    for _, mentioned in project_mentions:
+        found |= mentioned
+    return found
+
+@dataclass
+class BatchScores:
+    """
+    Scores of a batch of resumes against one job profile; entry i of every array
+    belongs to resume i. keyword_hits (resumes × job keywords) and skill_hits
+    (resumes × distinct job skills) are the boolean matrices behind the keyword
+    and skills scores. With semantic skill matching, semantic_matches holds the
+    semantic_skill_matches of every resume.
+    """
+    keyword_hits: np.ndarray
+    skill_hits: np.ndarray
+    keyword: np.ndarray
+    skills: np.ndarray
+    experience: np.ndarray
+    education: np.ndarray
+    overall: np.ndarray
+    experience_details: List[Tuple[list, list]]  # (matches, misses) per resume
+    education_details: List[Tuple[list, list]]
+    semantic_matches: Optional[List[Dict[str, list]]] = None
+
+def score_matrix(documents, job_profile):
+    """
+    Score many resumes against a job profile at once. Every document is checked for the
+    job keywords and scanned once for all skill variations; the hits fill resume × keyword
+    and resume × variation matrices, and the keyword, skills and overall scores of the
+    whole batch are array operations over them. The scores are exactly those of
+    calculate_keyword_match (unless the profile carries BM25 keyword weights, see
+    score_keyword_rows), enhanced_skills_match and calculate_overall_score.
+    """
+    required_skills = list(job_profile.skills)
+    skill_matcher = get_skill_matcher(required_skills)
+    
+    keyword_rows = []
+    variation_hits = ([], [])
+    experience, experience_details = [], []
+    education, education_details = [], []
+    for row, document in enumerate(documents):
+        # Sections and projects, shared by the skills and experience scorers
+        with time_stage("sectioning"):
+            document.prepare_sections()
         
-        results = []
+        with time_stage("keywords"):
+            keyword_rows.append(keyword_row(document, job_profile))
         
-        # Process each resume
-        for resume in resumes:
-            resume_text = resume.content
-            
-            # If we have base64 data, try to extract text from the file
-            if resume.base64Data:
-                try:
-                    # Decode base64 data
-                    file_data = base64.b64decode(resume.base64Data.split(',')[1] if ',' in resume.base64Data else resume.base64Data)
-                    
-                    # Determine file extension
-                    file_extension = os.path.splitext(resume.fileName)[1]
-                    
-                    # Create a temporary file to process
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-                        temp_file.write(file_data)
-                        temp_file_path = temp_file.name
-                    
-                    try:
-                        # Extract text based on file type
-                        extracted_text = extract_text_from_resume(temp_file_path, file_extension)
-                        
-                        # If we got text from the file, use it instead of the provided content
-                        if extracted_text and extracted_text.strip() and not extracted_text.startswith("Could not extract"):
-                            resume_text = extracted_text
-                    except Exception as extraction_error:
-                        print(f"Error extracting text from file: {str(extraction_error)}")
-                        # Continue with the provided content if extraction fails
-                    
-                    # Clean up the temporary file
-                    try:
-                        os.unlink(temp_file_path)
-                    except:
-                        pass  # Ignore errors during temp file cleanup
-                        
-                except Exception as e:
-                    print(f"Error processing base64 data: {str(e)}")
-                    # Continue with the provided content if extraction fails
-            
-            # Get resume sections for better analysis
-            resume_sections = extract_resume_sections(resume_text)
-            project_descriptions, project_skills = analyze_resume_projects(resume_text)
-            
-            # Calculate keyword match
-            keyword_score, keyword_matches, keyword_misses = calculate_keyword_match(
-                resume_text, job_description.description
-            )
-            
-            # Ensure we have skills to match against
-            if not job_description.skills:
-                # If still no skills, use a general fallback
-                job_description.skills = ["Programming", "Development", "Software", "Web", "Mobile", "Cloud"]
-            
-            # Use our enhanced skills match function for better context-aware matching
-            skills_score, skills_matches, skills_misses, skills_contexts = enhanced_skills_match(
-                resume_text, job_description.skills
-            )
-            
-            # Log values for debugging
-            print(f"Resume: {resume.fileName}")
-            print(f"Skills to match: {job_description.skills}")
-            print(f"Skills matched: {skills_matches}")
-            print(f"Skills score: {skills_score}")
-            
-            # Calculate experience match with added context from projects
-            experience_text = resume_sections['experience']
-            if project_descriptions:
-                # Add project information to experience assessment
-                combined_experience = experience_text + "\n" + "\n".join(project_descriptions)
-                experience_score, experience_matches, experience_misses = calculate_experience_match(
-                    combined_experience, job_description.requirements
-                )
-            else:
-                experience_score, experience_matches, experience_misses = calculate_experience_match(
-                    resume_text, job_description.requirements
-                )
-            
-            education_score, education_matches, education_misses = calculate_education_match(
-                resume_text, job_description.requirements
+        if document.text and required_skills:
+            with time_stage("skills"):
+                for skill_var in matched_skill_variations(document, skill_matcher):
+                    variation_hits[0].append(row)
+                    variation_hits[1].append(skill_matcher.variation_columns[skill_var])
+        
+        with time_stage("experience"):
+            score, matches, misses = calculate_experience_match(
+                document.experience_text, job_profile.requirements, job_profile.required_years
             )
-            
-            # Calculate overall score (weighted average)
-            overall_score = int(
-                keyword_score * 0.05 +
-                skills_score * 0.45 +
-                experience_score * 0.35 +
-                education_score * 0.15
+        experience.append(score)
+        experience_details.append((matches, misses))
+        
+        with time_stage("education"):
+            score, matches, misses = calculate_education_match(
+                document, job_profile.requirements, job_profile.required_level
             )
+        education.append(score)
+        education_details.append((matches, misses))
+    
+    keyword_hits, keyword_scores = score_keyword_rows(keyword_rows, documents, job_profile)
+    variation_matrix = np.zeros((len(documents), len(skill_matcher.variations)), dtype=np.int32)
+    variation_matrix[np.array(variation_hits[0], dtype=np.intp), np.array(variation_hits[1], dtype=np.intp)] = 1
+    skill_hits = variation_matrix @ skill_matcher.skill_incidence > 0
+    
+    # Semantic matches add the skills that no variation hits lexically
+    semantic_matches = None
+    if SKILL_MATCHING == "semantic" and required_skills:
+        with time_stage("semantic"):
+            semantic_matches = semantic_skill_matches(documents, required_skills)
+        column_of = {skill: column for column, skill in enumerate(skill_matcher.skill_columns)}
+        for row, matches in enumerate(semantic_matches):
+            for skill in matches:
+                skill_hits[row, column_of[skill]] = True
+    
+    skills_scores = coverage_scores(skill_hits, len(required_skills))
+    experience = np.array(experience, dtype=np.int64)
+    education = np.array(education, dtype=np.int64)
+    return BatchScores(
+        keyword_hits=keyword_hits,
+        skill_hits=skill_hits,
+        keyword=keyword_scores,
+        skills=skills_scores,
+        experience=experience,
+        education=education,
+        overall=calculate_overall_score(keyword_scores, skills_scores, experience, education),
+        experience_details=experience_details,
+        education_details=education_details,
+        semantic_matches=semantic_matches
+    )
+
+def decode_base64_file(base64_data):
+    """Decode a base64 file, with or without a data URL prefix."""
+    return base64.b64decode(base64_data.split(',')[1] if ',' in base64_data else base64_data)
+
+def resolve_resume_text(resume):
+    """Return the resume text, preferring text extracted from the attached file when present."""
+    resume_text = resume.content
+    
+    # If we have base64 data, try to extract text from the file
+    if resume.base64Data:
+        try:
+            # Decode base64 data
+            file_data = decode_base64_file(resume.base64Data)
             
-            # Generate evaluation details
-            evaluation_details = []
-            
-            # Keyword match evaluation
-            if keyword_score >= 80:
-                evaluation_details.append(f"Excellent keyword match with the job description. The resume contains most of the important terms required.")
-            elif keyword_score >= 60:
-                evaluation_details.append(f"Good keyword match found. Consider adding more specific terms from the job description.")
-            else:
-                evaluation_details.append(f"Low keyword match. The resume lacks many important terms from the job description.")
-            
-            # Skills match evaluation with context information
-            if skills_score >= 80:
-                evaluation_details.append(f"Excellent skills alignment. The resume demonstrates proficiency in {len(skills_matches)} of {len(job_description.skills)} required skills.")
-            elif skills_score >= 60:
-                evaluation_details.append(f"Good skills match, but some key skills could be highlighted more prominently. Found {len(skills_matches)} of {len(job_description.skills)} required skills.")
-            else:
-                evaluation_details.append(f"Low skills match. Only found {len(skills_matches)} of {len(job_description.skills)} required skills.")
-            
-            # Add project insight
-            if project_descriptions:
-                num_projects = len(project_descriptions)
-                evaluation_details.append(f"Resume includes {num_projects} projects that demonstrate practical application of skills.")
-            
-            # Experience match evaluation
-            if experience_score >= 80:
-                evaluation_details.append(f"Work experience aligns very well with the job requirements.")
-            elif experience_score >= 60:
-                evaluation_details.append(f"Relevant work experience found, but could better highlight achievements related to the requirements.")
-            else:
-                evaluation_details.append(f"Experience seems insufficient compared to job requirements. Consider highlighting relevant projects or achievements.")
-            
-            # Education match evaluation
-            if education_score >= 80:
-                evaluation_details.append(f"Education background is a great match for this role.")
-            elif education_score >= 60:
-                evaluation_details.append(f"Educational qualifications meet basic requirements, but could highlight relevant coursework or certifications.")
-            else:
-                evaluation_details.append(f"Educational background may need supplementing with relevant certifications or courses for this role.")
-            
-            # Enhanced skills details with context
-            detailed_skill_feedback = []
-            for skill in skills_matches:
-                if skill in skills_contexts:
-                    contexts = skills_contexts[skill]
-                    if contexts:
-                        # Use the first context for each skill (we will include others in the detailed view)
-                        detailed_skill_feedback.append(f"{skill}: {contexts[0]}")
-            
-            if detailed_skill_feedback:
-                evaluation_details.append("Skill context analysis: " + "; ".join(detailed_skill_feedback[:3]) + 
-                                        (f" and {len(detailed_skill_feedback) - 3} more" if len(detailed_skill_feedback) > 3 else ""))
-            
-            # Create detailed score breakdowns
-            # Enhanced skills details to include the context information
-            skills_detail_matches = []
-            for skill in skills_matches:
-                if skill in skills_contexts:
-                    contexts = skills_contexts[skill]
-                    if contexts:
-                        # Include skill with its first context
-                        skills_detail_matches.append(f"{skill} ({contexts[0]})")
-                    else:
-                        skills_detail_matches.append(skill)
-                else:
-                    skills_detail_matches.append(skill)
-            
-            score_details = [
-                {
-                    "category": "Keywords",
-                    "score": keyword_score,
-                    "matches": keyword_matches[:10],  # Limit to top 10
-                    "misses": keyword_misses[:10],   # Limit to top 10
-                    "feedback": evaluation_details[0]
-                },
-                {
-                    "category": "Skills",
-                    "score": skills_score,
-                    "matches": skills_detail_matches,
-                    "misses": skills_misses,
-                    "feedback": evaluation_details[1] if len(evaluation_details) > 1 else "",
-                    "contexts": skills_contexts   # Add the skill contexts to the Skills detail
-                },
-                {
-                    "category": "Experience",
-                    "score": experience_score,
-                    "matches": experience_matches,
-                    "misses": experience_misses,
-                    "feedback": evaluation_details[-3] if len(evaluation_details) >= 3 else ""
-                },
-                {
-                    "category": "Education",
-                    "score": education_score,
-                    "matches": education_matches,
-                    "misses": education_misses,
-                    "feedback": evaluation_details[-2] if len(evaluation_details) >= 2 else ""
-                }
-            ]
+            # Determine file extension
+            file_extension = os.path.splitext(resume.fileName)[1]
             
-            # Add contextual information about projects if available
-            if project_descriptions:
-                project_highlights = []
-                for i, project in enumerate(project_descriptions[:3]):  # Include up to 3 projects
-                    # Truncate long project descriptions
-                    brief = project[:100] + "..." if len(project) > 100 else project
-                    project_highlights.append(brief)
+            try:
+                # Extract text based on file type
+                extracted_text = extract_text_from_file(file_data, file_extension)
                 
-                score_details.append({
-                    "category": "Projects",
-                    "score": min(100, 60 + len(project_descriptions) * 10),  # More projects = higher score
-                    "matches": project_highlights,
-                    "misses": [],
-                    "feedback": f"Resume includes {len(project_descriptions)} projects demonstrating practical skills application."
-                })
-            
-            # Create the resume score object
-            resume_score = {
-                "resumeId": resume.id,
-                "resumeName": resume.name,
+                # If we got text from the file, use it instead of the provided content
+                if is_extracted_text(extracted_text):
+                    resume_text = extracted_text
+            except Exception as extraction_error:
+                logger.warning("Error extracting text from file: %s", extraction_error)
+                # Continue with the provided content if extraction fails
+        
+        except Exception as e:
+            logger.warning("Error processing base64 data: %s", e)
+            # Continue with the provided content if extraction fails
+    
+    return resume_text
+
+def extract_upload_batch(uploads):
+    """
+    Extract the text of uploaded (file name, file bytes) pairs. Files that cannot
+    be read yield an empty string so they still appear, unmatched, in the ranking.
+    """
+    texts = []
+    for file_name, file_data in uploads:
+        try:
+            extracted_text = extract_text_from_file(file_data, os.path.splitext(file_name)[1])
+        except Exception as e:
+            logger.warning("Error extracting text from %s: %s", file_name, e)
+            extracted_text = ""
+        texts.append(extracted_text if is_extracted_text(extracted_text) else "")
+    return texts
+
+def matched_skills(job_profile, scores, row):
+    """The skill columns hit by resume `row` of the BatchScores."""
+    skill_columns = get_skill_matcher(list(job_profile.skills)).skill_columns
+    return [skill for skill, hit in zip(skill_columns, scores.skill_hits[row].tolist()) if hit]
+
+def build_resume_score(resume, job_profile, document, scores, row):
+    """
+    The full result for one resume of a batch: its sub-scores from row `row` of the
+    BatchScores, plus evaluation texts, matches, misses and skill contexts.
+    """
+    project_descriptions = document.project_descriptions
+    
+    # Keyword matches are the hits in the resume's row of the keyword matrix
+    keyword_score = int(scores.keyword[row])
+    keyword_hits = scores.keyword_hits[row].tolist()
+    keyword_matches = [keyword for keyword, hit in zip(job_profile.keywords, keyword_hits) if hit]
+    keyword_misses = [keyword for keyword, hit in zip(job_profile.keywords, keyword_hits) if not hit]
+    
+    # Matched skills in context order; the section scans are shared with score_matrix
+    skills_score = int(scores.skills[row])
+    matched_skill_columns = matched_skills(job_profile, scores, row)
+    _, skills_matches, skills_misses, skills_contexts = enhanced_skills_match(document, list(job_profile.skills))
+    
+    # Skills only matched semantically, with their most similar resume phrases as contexts
+    if scores.semantic_matches is not None:
+        for skill, similar in scores.semantic_matches[row].items():
+            if skill in skills_contexts:
+                continue
+            skills_matches.append(skill)
+            skills_contexts[skill] = [f"Semantically similar to '{phrase}' ({similarity:.2f})" for phrase, similarity in similar]
+        skills_misses = [skill for skill in skills_misses if skill not in skills_contexts]
+    
+    # Log values for debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Resume %s: matched %d of %d skills, skills score %d",
+            resume.fileName, len(skills_matches), len(job_profile.skills), skills_score,
+            extra={
                 "fileName": resume.fileName,
-                "overallScore": overall_score,
-                "keywordMatch": keyword_score,
-                "skillsMatch": skills_score,
-                "experienceMatch": experience_score,
-                "educationMatch": education_score,
-                "evaluationDetails": evaluation_details,
-                "scoreDetails": score_details
+                "skillsToMatch": list(job_profile.skills),
+                "skillsMatched": skills_matches,
+                "skillsScore": skills_score
             }
-            
-            results.append(resume_score)
+        )
+    
+    # Experience match with added context from projects, and education match
+    experience_score = int(scores.experience[row])
+    experience_matches, experience_misses = scores.experience_details[row]
+    education_score = int(scores.education[row])
+    education_matches, education_misses = scores.education_details[row]
+    
+    # Overall score (weighted average)
+    overall_score = int(scores.overall[row])
+    
+    # Generate evaluation details
+    evaluation_details = []
+    
+    # Keyword match evaluation
+    if keyword_score >= 80:
+        evaluation_details.append(f"Excellent keyword match with the job description. The resume contains most of the important terms required.")
+    elif keyword_score >= 60:
+        evaluation_details.append(f"Good keyword match found. Consider adding more specific terms from the job description.")
+    else:
+        evaluation_details.append(f"Low keyword match. The resume lacks many important terms from the job description.")
+    
+    # Skills match evaluation with context information
+    if skills_score >= 80:
+        evaluation_details.append(f"Excellent skills alignment. The resume demonstrates proficiency in {len(skills_matches)} of {len(job_profile.skills)} required skills.")
+    elif skills_score >= 60:
+        evaluation_details.append(f"Good skills match, but some key skills could be highlighted more prominently. Found {len(skills_matches)} of {len(job_profile.skills)} required skills.")
+    else:
+        evaluation_details.append(f"Low skills match. Only found {len(skills_matches)} of {len(job_profile.skills)} required skills.")
+    
+    # Add project insight
+    if project_descriptions:
+        num_projects = len(project_descriptions)
+        evaluation_details.append(f"Resume includes {num_projects} projects that demonstrate practical application of skills.")
+    
+    # Experience match evaluation
+    if experience_score >= 80:
+        evaluation_details.append(f"Work experience aligns very well with the job requirements.")
+    elif experience_score >= 60:
+        evaluation_details.append(f"Relevant work experience found, but could better highlight achievements related to the requirements.")
+    else:
+        evaluation_details.append(f"Experience seems insufficient compared to job requirements. Consider highlighting relevant projects or achievements.")
+    
+    # Education match evaluation
+    if education_score >= 80:
+        evaluation_details.append(f"Education background is a great match for this role.")
+    elif education_score >= 60:
+        evaluation_details.append(f"Educational qualifications meet basic requirements, but could highlight relevant coursework or certifications.")
+    else:
+        evaluation_details.append(f"Educational background may need supplementing with relevant certifications or courses for this role.")
+    
+    # Enhanced skills details with context
+    detailed_skill_feedback = []
+    for skill in skills_matches:
+        if skill in skills_contexts:
+            contexts = skills_contexts[skill]
+            if contexts:
+                # Use the first context for each skill (we will include others in the detailed view)
+                detailed_skill_feedback.append(f"{skill}: {contexts[0]}")
+    
+    if detailed_skill_feedback:
+        evaluation_details.append("Skill context analysis: " + "; ".join(detailed_skill_feedback[:3]) + 
+                                (f" and {len(detailed_skill_feedback) - 3} more" if len(detailed_skill_feedback) > 3 else ""))
+    
+    # Create detailed score breakdowns
+    # Enhanced skills details to include the context information
+    skills_detail_matches = []
+    for skill in skills_matches:
+        if skill in skills_contexts:
+            contexts = skills_contexts[skill]
+            if contexts:
+                # Include skill with its first context
+                skills_detail_matches.append(f"{skill} ({contexts[0]})")
+            else:
+                skills_detail_matches.append(skill)
+        else:
+            skills_detail_matches.append(skill)
+    
+    score_details = [
+        {
+            "category": "Keywords",
+            "score": keyword_score,
+            "matches": keyword_matches[:10],  # Limit to top 10
+            "misses": keyword_misses[:10],   # Limit to top 10
+            "feedback": evaluation_details[0]
+        },
+        {
+            "category": "Skills",
+            "score": skills_score,
+            "matches": skills_detail_matches,
+            "misses": skills_misses,
+            "feedback": evaluation_details[1] if len(evaluation_details) > 1 else "",
+            "contexts": skills_contexts   # Add the skill contexts to the Skills detail
+        },
+        {
+            "category": "Experience",
+            "score": experience_score,
+            "matches": experience_matches,
+            "misses": experience_misses,
+            "feedback": evaluation_details[-3] if len(evaluation_details) >= 3 else ""
+        },
+        {
+            "category": "Education",
+            "score": education_score,
+            "matches": education_matches,
+            "misses": education_misses,
+            "feedback": evaluation_details[-2] if len(evaluation_details) >= 2 else ""
+        }
+    ]
+    
+    # Add contextual information about projects if available
+    if project_descriptions:
+        project_highlights = []
+        for i, project in enumerate(project_descriptions[:3]):  # Include up to 3 projects
+            # Truncate long project descriptions
+            brief = project[:100] + "..." if len(project) > 100 else project
+            project_highlights.append(brief)
+        
+        score_details.append({
+            "category": "Projects",
+            "score": min(100, 60 + len(project_descriptions) * 10),  # More projects = higher score
+            "matches": project_highlights,
+            "misses": [],
+            "feedback": f"Resume includes {len(project_descriptions)} projects demonstrating practical skills application."
+        })
+    
+    # Create the resume score object
+    resume_score = {
+        "resumeId": resume.id,
+        "resumeName": resume.name,
+        "fileName": resume.fileName,
+        "overallScore": overall_score,
+        "keywordMatch": keyword_score,
+        "skillsMatch": skills_score,
+        "experienceMatch": experience_score,
+        "educationMatch": education_score,
+        "evaluationDetails": evaluation_details,
+        "scoreDetails": score_details,
+        # Not part of ResumeScore: the hit skill columns, kept for re-ranking
+        "matchedSkills": matched_skill_columns
+    }
+    
+    return resume_score
+
+def score_documents(resumes, documents, job_profile):
+    """Score resumes with their ResumeDocuments: sub-scores for the whole batch at once, then each full result."""
+    scores = score_matrix(documents, job_profile)
+    return [
+        build_resume_score(resume, job_profile, document, scores, row)
+        for row, (resume, document) in enumerate(zip(resumes, documents))
+    ]
+
+def summarize_documents(resumes, documents, job_profile):
+    """
+    Only the ids and sub-scores of resumes, as ResumeSummary dicts: the scores of
+    score_documents without building evaluation texts, matches or skill contexts.
+    """
+    scores = score_matrix(documents, job_profile)
+    return [
+        {
+            "resumeId": resume.id,
+            "resumeName": resume.name,
+            "fileName": resume.fileName,
+            "overallScore": int(scores.overall[row]),
+            "keywordMatch": int(scores.keyword[row]),
+            "skillsMatch": int(scores.skills[row]),
+            "experienceMatch": int(scores.experience[row]),
+            "educationMatch": int(scores.education[row]),
+            # Not part of ResumeSummary: the hit skill columns, kept for re-ranking
+            "matchedSkills": matched_skills(job_profile, scores, row)
+        }
+        for row, resume in enumerate(resumes)
+    ]
+
+def score_resume(resume, job_profile, document=None):
+    """
+    Score a single resume against a compiled job profile. A ResumeDocument for the
+    resolved resume text may be passed in to share its features across scorers.
+    """
+    if document is None:
+        document = ResumeDocument(resolve_resume_text(resume))
+    return score_documents([resume], [document], job_profile)[0]
+
+def score_resume_batch(resumes, job_profile):
+    """Score a list of resumes in order; this is the unit of work sent to a scoring worker."""
+    documents = [ResumeDocument(resolve_resume_text(resume)) for resume in resumes]
+    return score_documents(resumes, documents, job_profile)
+
+def summarize_resume_batch(resumes, job_profile):
+    """score_resume_batch returning ResumeSummary dicts."""
+    documents = [ResumeDocument(resolve_resume_text(resume)) for resume in resumes]
+    return summarize_documents(resumes, documents, job_profile)
+
+def get_scoring_pool():
+    """Return the shared scoring process pool, creating it on first use."""
+    global _scoring_pool
+    if SCORING_WORKERS <= 0:
+        return None
+    with _scoring_pool_lock:
+        if _scoring_pool is None:
+            _scoring_pool = ProcessPoolExecutor(
+                max_workers=SCORING_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _scoring_pool
+
+def _discard_scoring_pool(pool):
+    """Drop a broken pool so the next request starts a fresh one."""
+    global _scoring_pool
+    with _scoring_pool_lock:
+        if _scoring_pool is pool:
+            _scoring_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+async def map_resume_batches(batch_function, resumes, *args):
+    """
+    Run batch_function(chunk, *args) over the resumes off the event loop and return the
+    concatenated results in input order. Batches larger than one chunk are fanned out
+    across the scoring worker pool; smaller ones run on a thread in this process.
+    Stage timings observed by the workers are recorded here.
+    """
+    chunks = [resumes[i:i + SCORING_CHUNK_SIZE] for i in range(0, len(resumes), SCORING_CHUNK_SIZE)]
+    pool = get_scoring_pool() if len(chunks) > 1 else None
+    if pool is None:
+        return await run_in_threadpool(batch_function, resumes, *args)
+    
+    loop = asyncio.get_running_loop()
+    try:
+        batches = await asyncio.gather(*[
+            loop.run_in_executor(pool, metrics.run_collecting_timings, batch_function, chunk, *args)
+            for chunk in chunks
+        ])
+    except BrokenProcessPool:
+        _discard_scoring_pool(pool)
+        raise
+    
+    results = []
+    for batch, timings in batches:
+        results.extend(batch)
+        metrics.record_stage_timings(timings)
+    return results
+
+async def score_resumes(resumes, job_profile, summary=False):
+    """
+    Score resumes off the event loop and return the results in input order, as
+    ResumeSummary dicts when summary is set.
+    """
+    batch_function = summarize_resume_batch if summary else score_resume_batch
+    with metrics.in_flight(metrics.RESUMES_IN_FLIGHT, len(resumes)):
+        results = await map_resume_batches(batch_function, resumes, job_profile)
+    metrics.RESUMES_SCORED.inc(len(results))
+    return results
+
+def term_statistics_batch(resumes, terms):
+    """Per resume its length in tokens and the positions of the given terms it contains."""
+    statistics = []
+    for resume in resumes:
+        counts, length = term_counts(resolve_resume_text(resume))
+        statistics.append((length, [position for position, term in enumerate(terms) if counts[term]]))
+    return statistics
+
+async def weigh_job_keywords(resumes, job_profile, corpus=None):
+    """
+    The job profile to score this batch with: unchanged with the substring keyword
+    scorer, otherwise carrying BM25 keyword weights. Document frequencies are counted
+    over the stored corpus when one is given and over the batch itself otherwise; the
+    average resume length always comes from the batch.
+    """
+    return (await weigh_jobs_keywords(resumes, [job_profile], corpus))[0]
+
+async def weigh_jobs_keywords(resumes, job_profiles, corpus=None):
+    """weigh_job_keywords for several job profiles, counting the terms of all of them in one pass."""
+    if KEYWORD_SCORER != "bm25":
+        return list(job_profiles)
+    
+    job_terms = [keyword_terms(job_profile.keywords) for job_profile in job_profiles]
+    terms = tuple(dict.fromkeys(term for profile_terms, _ in job_terms for term in profile_terms))
+    statistics = await map_resume_batches(term_statistics_batch, resumes, terms)
+    if corpus is not None:
+        frequencies, total = await run_in_threadpool(corpus.document_frequencies, terms)
+        document_frequencies = [frequencies[term] for term in terms]
+    else:
+        document_frequencies = [0] * len(terms)
+        for _, present in statistics:
+            for position in present:
+                document_frequencies[position] += 1
+        total = len(statistics)
+    
+    idf = {term: bm25_idf(frequency, total) for term, frequency in zip(terms, document_frequencies)}
+    average_length = sum(length for length, _ in statistics) / len(statistics) if statistics else 0
+    return [
+        replace(job_profile, keyword_weights=KeywordWeights(
+            terms=profile_terms,
+            keyword_terms=positions,
+            idf=tuple(idf[term] for term in profile_terms),
+            average_length=max(average_length, 1.0)
+        ))
+        for job_profile, (profile_terms, positions) in zip(job_profiles, job_terms)
+    ]
+
+def bound_resume_score(document, job_profile):
+    """
+    Cheap upper bound on the overall score of a resume. Keyword, experience and
+    education scores are exact; the contextual skills score is bounded by the number
+    of required skills with any variation appearing anywhere in the resume, or
+    matched semantically.
+    """
+    _, keyword_score = score_keyword_rows([keyword_row(document, job_profile)], [document], job_profile)
+    keyword_score = int(keyword_score[0])
+    
+    skills = list(job_profile.skills)
+    if document.text and skills:
+        matcher = get_skill_matcher(skills)
+        present = {matcher.variations[skill_var] for skill_var in matcher.contained_in(document.lower)}
+        if SKILL_MATCHING == "semantic":
+            present.update(semantic_skill_matches([document], skills)[0])
+        skills_bound = min(100, int((len(present) / len(skills)) * 100))
+    else:
+        skills_bound = 0
+    
+    experience_score, _, _ = calculate_experience_match(
+        document.experience_text, job_profile.requirements, job_profile.required_years
+    )
+    education_score, _, _ = calculate_education_match(
+        document, job_profile.requirements, job_profile.required_level
+    )
+    return calculate_overall_score(keyword_score, skills_bound, experience_score, education_score)
+
+def bound_resume_batch(resumes, job_profile):
+    """
+    First ranking stage for a list of resumes: return (score bound, resolved resume)
+    pairs, where attached files have already been replaced by their extracted text.
+    """
+    bounds = []
+    for resume in resumes:
+        resume_text = resolve_resume_text(resume)
+        if resume.base64Data:
+            resume = resume.model_copy(update={"content": resume_text, "base64Data": None})
+        bounds.append((bound_resume_score(ResumeDocument(resume_text), job_profile), resume))
+    return bounds
+
+async def score_top_resumes(resumes, job_profile, top_k, summary=False):
+    """
+    Return the top_k results (summaries when summary is set) in ranking order without
+    fully scoring every resume.
+    Resumes are fully scored in waves, best bound first, and scoring stops once no
+    remaining bound can beat the weakest of the current top K (kept in a min-heap).
+    """
+    if top_k <= 0:
+        return []
+    
+    bounded = await map_resume_batches(bound_resume_batch, resumes, job_profile)
+    order = sorted(range(len(bounded)), key=lambda index: bounded[index][0], reverse=True)
+    wave_size = max(top_k, SCORING_CHUNK_SIZE * max(SCORING_WORKERS, 1))
+    
+    # Heap entries are (score, -index) so the weakest entry, with later resumes
+    # losing ties, is always on top
+    heap = []
+    position = 0
+    while position < len(order):
+        if len(heap) == top_k:
+            weakest_score = heap[0][0]
+            wave = [index for index in order[position:position + wave_size] if bounded[index][0] >= weakest_score]
+            if not wave:
+                break
+        else:
+            wave = order[position:position + wave_size]
+        position += wave_size
+        
+        results = await score_resumes([bounded[index][1] for index in wave], job_profile, summary)
+        for index, result in zip(wave, results):
+            result["inputIndex"] = index
+            entry = (result["overallScore"], -index, result)
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+    
+    ranked = sorted(heap, key=lambda entry: (-entry[0], -entry[1]))
+    return [result for _, _, result in ranked]
+
+async def iter_scored_resumes(resumes, job_profile):
+    """
+    Yield (index, result) pairs as soon as each resume has been scored, in completion
+    order. Every resume is its own task so the first result never waits on the batch.
+    """
+    pool = get_scoring_pool() if len(resumes) > 1 else None
+    if pool is None:
+        for index, resume in enumerate(resumes):
+            with metrics.in_flight(metrics.RESUMES_IN_FLIGHT):
+                batch = await run_in_threadpool(score_resume_batch, [resume], job_profile)
+            metrics.RESUMES_SCORED.inc()
+            yield index, batch[0]
+        return
+    
+    loop = asyncio.get_running_loop()
+    pending = {
+        loop.run_in_executor(pool, metrics.run_collecting_timings, score_resume_batch, [resume], job_profile): index
+        for index, resume in enumerate(resumes)
+    }
+    metrics.RESUMES_IN_FLIGHT.inc(len(pending))
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                metrics.RESUMES_IN_FLIGHT.dec()
+                batch, timings = future.result()
+                metrics.record_stage_timings(timings)
+                metrics.RESUMES_SCORED.inc()
+                yield index, batch[0]
+    except BrokenProcessPool:
+        _discard_scoring_pool(pool)
+        raise
+    finally:
+        # The client may have gone away; don't keep scoring for nobody
+        metrics.RESUMES_IN_FLIGHT.dec(len(pending))
+        for future in pending:
+            future.cancel()
+
+def rank_results(results):
+    """Indices of results ordered by overall score (highest first), ties in input order."""
+    return sorted(range(len(results)), key=lambda index: results[index]["overallScore"], reverse=True)
+
+class ScoredBatch:
+    """
+    The component scores of a ranked batch, in ranking order, and which skill columns
+    each resume hit. Re-ranking with other weights only recomputes the overall score;
+    skills scores are recomputed once per set of disabled skills and then reused.
+    The batch also keeps the job profile it was scored with, so the full result of
+    any of its resumes (kept apart, in _batch_resume_cache) can be built on request.
+    """
+
+    def __init__(self, job_profile, resume_ids, keyword, skills, experience, education, skill_hits):
+        """Resume ids, score arrays and the resumes × skill columns hit matrix, all in ranking order."""
+        self.job_profile = job_profile
+        self.job_skills = list(job_profile.skills)
+        self.skill_columns = get_skill_matcher(self.job_skills).skill_columns
+        self.resume_ids = resume_ids
+        self.keyword = keyword
+        self.experience = experience
+        self.education = education
+        self.skill_hits = skill_hits
+        self._skills_scores = {frozenset(): skills}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_results(cls, job_profile, results):
+        """The batch of ranked result dicts, which list their hit skill columns as matchedSkills."""
+        skill_columns = get_skill_matcher(list(job_profile.skills)).skill_columns
+        column_of = {skill: column for column, skill in enumerate(skill_columns)}
+        skill_hits = np.zeros((len(results), len(skill_columns)), dtype=bool)
+        for row, result in enumerate(results):
+            for skill in result["matchedSkills"]:
+                skill_hits[row, column_of[skill]] = True
+        
+        def component(name):
+            return np.array([result[name] for result in results], dtype=np.int64)
         
-        # Sort results by overall score (highest first)
-        results.sort(key=lambda x: x["overallScore"], reverse=True)
+        return cls(
+            job_profile, [result["resumeId"] for result in results], component("keywordMatch"),
+            component("skillsMatch"), component("experienceMatch"), component("educationMatch"), skill_hits
+        )
+
+    def skills_scores(self, disabled_skills):
+        """Skills scores counting only the job skills not in disabled_skills."""
+        key = frozenset(disabled_skills)
+        with self._lock:
+            scores = self._skills_scores.get(key)
+        if scores is None:
+            enabled = [column for column, skill in enumerate(self.skill_columns) if skill not in key]
+            total = sum(1 for skill in self.job_skills if skill not in key)
+            scores = coverage_scores(self.skill_hits[:, enabled], total)
+            with self._lock:
+                self._skills_scores[key] = scores
+        return scores
+
+    def rerank(self, weights, disabled_skills=(), top_k=None):
+        """
+        RerankedResume dicts ordered by the overall score under the given weights,
+        ties in the previous ranking order; only the best top_k when given.
+        """
+        skills = self.skills_scores(disabled_skills)
+        overall = calculate_overall_score(self.keyword, skills, self.experience, self.education, weights)
+        order = np.argsort(-overall, kind="stable")
+        if top_k is not None:
+            order = order[:max(top_k, 0)]
+        return [
+            {
+                "resumeId": self.resume_ids[row],
+                "overallScore": int(overall[row]),
+                "keywordMatch": int(self.keyword[row]),
+                "skillsMatch": int(skills[row]),
+                "experienceMatch": int(self.experience[row]),
+                "educationMatch": int(self.education[row])
+            }
+            for row in order.tolist()
+        ]
+
+def match_jobs_batch(resumes, job_profiles):
+    """
+    Scores of resumes against several job profiles, one list per resume with a
+    (keyword, skills, experience, education, overall, skill column hits) tuple per
+    job. Each resume's text is resolved and its features derived once for all jobs.
+    """
+    documents = [ResumeDocument(resolve_resume_text(resume)) for resume in resumes]
+    job_scores = [score_matrix(documents, job_profile) for job_profile in job_profiles]
+    return [
+        [
+            (
+                int(scores.keyword[row]), int(scores.skills[row]), int(scores.experience[row]),
+                int(scores.education[row]), int(scores.overall[row]), scores.skill_hits[row].tolist()
+            )
+            for scores in job_scores
+        ]
+        for row in range(len(documents))
+    ]
+
+async def match_jobs(resumes, job_profiles, titles, top_k=None):
+    """
+    Score every resume against every job profile in one pass over the resumes and
+    return a JobMatchResponse dict, with the job titles in its rankings. Each job's
+    ranked batch is kept for /rerank.
+    """
+    job_profiles = await weigh_jobs_keywords(resumes, job_profiles)
+    with metrics.in_flight(metrics.RESUMES_IN_FLIGHT, len(resumes)):
+        rows = await map_resume_batches(match_jobs_batch, resumes, job_profiles)
+    metrics.RESUMES_SCORED.inc(len(rows))
+    
+    # resumes × jobs × (keyword, skills, experience, education, overall)
+    components = np.array(
+        [[entry[:5] for entry in row] for row in rows], dtype=np.int64
+    ).reshape(len(resumes), len(job_profiles), 5)
+    resume_ids = [resume.id for resume in resumes]
+    rankings = []
+    for job, (job_profile, title) in enumerate(zip(job_profiles, titles)):
+        keyword, skills, experience, education, overall = components[:, job, :].T
+        skill_columns = get_skill_matcher(list(job_profile.skills)).skill_columns
+        skill_hits = np.array([row[job][5] for row in rows], dtype=bool).reshape(len(resumes), len(skill_columns))
         
+        # Same order as rank_resumes: highest score first, ties in input order
+        order = np.argsort(-overall, kind="stable")
+        batch = ScoredBatch(
+            job_profile, [resume_ids[row] for row in order.tolist()], keyword[order], skills[order],
+            experience[order], education[order], skill_hits[order]
+        )
+        batch_id = keep_scored_batch(batch, [resumes[row] for row in order.tolist()])
+        ranked = order if top_k is None else order[:max(top_k, 0)]
+        rankings.append({"title": title, "batchId": batch_id, "ranking": [resume_ids[row] for row in ranked.tolist()]})
+    
+    by_job = components.transpose(2, 1, 0).tolist()
+    return {
+        "resumeIds": resume_ids,
+        "overallScores": by_job[4],
+        "keywordScores": by_job[0],
+        "skillsScores": by_job[1],
+        "experienceScores": by_job[2],
+        "educationScores": by_job[3],
+        "rankings": rankings
+    }
+
+def keep_scored_batch(batch, ranked_resumes):
+    """
+    Keep a ScoredBatch for /rerank and its resolved resumes, one per ranking position,
+    for the detail endpoint; returns the new batch id. The resumes are bounded by
+    BATCH_RESUME_CACHE_MB as well and may be evicted before the scores.
+    """
+    batch_id = str(uuid.uuid4())
+    _scored_batch_cache.put(batch_id, batch)
+    _batch_resume_cache.put(batch_id, ranked_resumes, sum(len(resume.content) for resume in ranked_resumes))
+    return batch_id
+
+def remember_scored_batch(job_profile, resumes, results):
+    """
+    Keep the component scores of ranked results, and their resumes, for /rerank and
+    the detail endpoint; returns their batch id. job_profile is the profile the
+    results were scored with, including any keyword weights, and every result has
+    the inputIndex of its resume in resumes.
+    """
+    batch = ScoredBatch.from_results(job_profile, results)
+    return keep_scored_batch(batch, [resumes[result["inputIndex"]] for result in results])
+
+def get_job_analysis_cache():
+    """The cache of LLM job description analyses, loaded from its file on first use."""
+    global _job_analysis_cache
+    with _job_analysis_cache_lock:
+        if _job_analysis_cache is None:
+            _job_analysis_cache = JobAnalysisCache()
+        return _job_analysis_cache
+
+def get_resume_corpus():
+    """The persistent resume corpus, opened on first use."""
+    global _resume_corpus
+    with _resume_corpus_lock:
+        if _resume_corpus is None:
+            _resume_corpus = ResumeCorpus()
+        return _resume_corpus
+
+def find_corpus_resumes(job_profile, resume_ids=None):
+    """
+    Load the stored resumes to rank: the given ids, or every resume whose postings
+    intersect the skill variations of the job profile.
+    """
+    corpus = get_resume_corpus()
+    if resume_ids is None:
+        resume_ids = sorted(corpus.candidates(build_skill_variations(job_profile.skills)))
+    return [Resume(**resume) for resume in corpus.get_many(resume_ids)]
+
+def get_extracted_text_cache():
+    """The extracted text cache of the API process."""
+    global _extracted_text_cache
+    with _extracted_text_cache_lock:
+        if _extracted_text_cache is None:
+            _extracted_text_cache = ExtractedTextCache()
+        return _extracted_text_cache
+
+def lookup_file_texts(files):
+    """Cache keys and cached texts (None when missing) for (file name, file bytes) pairs."""
+    cache = get_extracted_text_cache()
+    keys = [file_key(file_data, os.path.splitext(file_name)[1]) for file_name, file_data in files]
+    return keys, [cache.get(key) for key in keys]
+
+def store_file_texts(texts_by_key):
+    cache = get_extracted_text_cache()
+    for key, text in texts_by_key.items():
+        cache.put(key, text)
+
+async def extract_file_texts(files):
+    """
+    Extracted text for (file name, file bytes) pairs, empty for unreadable files.
+    Cached texts are reused; every distinct uncached file is extracted once on the
+    scoring workers and added to the cache.
+    """
+    keys, texts = await run_in_threadpool(lookup_file_texts, files)
+    pending = {}
+    for index, text in enumerate(texts):
+        if text is None:
+            pending.setdefault(keys[index], index)
+    if not pending:
+        return texts
+    
+    extracted = await map_resume_batches(extract_upload_batch, [files[index] for index in pending.values()])
+    extracted = dict(zip(pending, extracted))
+    await run_in_threadpool(store_file_texts, extracted)
+    return [text if text is not None else extracted[key] for key, text in zip(keys, texts)]
+
+def extract_text_cached(file_name, file_data):
+    """Extract a single file through the extracted text cache. Extraction errors are raised."""
+    cache = get_extracted_text_cache()
+    key = file_key(file_data, os.path.splitext(file_name)[1])
+    text = cache.get(key)
+    if text is None:
+        text = extract_text_from_file(file_data, os.path.splitext(file_name)[1])
+        text = text if is_extracted_text(text) else ""
+        cache.put(key, text)
+    return text
+
+def decode_attached_files(resumes):
+    """Decoded attached files of resumes as {index: (file name, file bytes)}; undecodable files are skipped."""
+    files = {}
+    for index, resume in enumerate(resumes):
+        if resume.base64Data:
+            try:
+                files[index] = (resume.fileName, decode_base64_file(resume.base64Data))
+            except Exception as e:
+                logger.warning("Error processing base64 data: %s", e)
+    return files
+
+async def resolve_resume_files(resumes):
+    """
+    First phase of scoring: replace the files attached to resumes with their
+    extracted text, going through the extracted text cache. Resumes whose file
+    yields no text keep their provided content.
+    """
+    if not any(resume.base64Data for resume in resumes):
+        return resumes
+    
+    files = await run_in_threadpool(decode_attached_files, resumes)
+    texts = dict(zip(files, await extract_file_texts(list(files.values()))))
+    resolved = []
+    for index, resume in enumerate(resumes):
+        if resume.base64Data:
+            resume = resume.model_copy(update={"content": texts.get(index) or resume.content, "base64Data": None})
+        resolved.append(resume)
+    return resolved
+
+async def rank_resumes(resumes, job_profile, top_k=None, summary=False):
+    """
+    Score resumes and return them sorted by overall score, or only the best top_k;
+    as ResumeSummary dicts when summary is set. Each result has the inputIndex of its
+    resume. The job profile is expected to come from weigh_job_keywords.
+    """
+    metrics.BATCH_SIZE.observe(len(resumes))
+    if top_k is not None and 0 <= top_k < len(resumes):
+        return await score_top_resumes(resumes, job_profile, top_k, summary)
+    
+    # Score every resume, in parallel when the batch is large enough
+    results = await score_resumes(resumes, job_profile, summary)
+    for index, result in enumerate(results):
+        result["inputIndex"] = index
+    
+    # Sort results by overall score (highest first)
+    results.sort(key=lambda x: x["overallScore"], reverse=True)
+    return results
+
+def get_ranking_job_store():
+    """The persistent ranking job queue, opened on first use."""
+    global _ranking_job_store
+    with _ranking_job_store_lock:
+        if _ranking_job_store is None:
+            _ranking_job_store = RankingJobStore()
+        return _ranking_job_store
+
+async def run_ranking_job(store, job_id, request_json):
+    """
+    Rank the resumes of a job like /analyze-resumes. Without a top K the resumes are
+    scored RANKING_JOB_STEP at a time and every step is stored with the job's progress;
+    resumes already stored by an interrupted run are skipped. Returns False if the
+    job was deleted or taken over by another process meanwhile.
+    """
+    request = ResumeAnalysisRequest.model_validate_json(request_json)
+    job_profile = await run_in_threadpool(compile_job_profile, request.jobDescription)
+    resumes = await resolve_resume_files(request.resumes)
+    job_profile = await weigh_job_keywords(resumes, job_profile)
+    
+    if request.topK is not None and 0 <= request.topK < len(resumes):
+        results = await rank_resumes(resumes, job_profile, request.topK)
+        stored = [
+            (rank, result["overallScore"], ResumeScore(**result).model_dump_json()) for rank, result in enumerate(results)
+        ]
+        if not await run_in_threadpool(store.record_results, job_id, stored):
+            return False
+        return await run_in_threadpool(store.finish, job_id, range(len(results)))
+    
+    metrics.BATCH_SIZE.observe(len(resumes))
+    scored = await run_in_threadpool(store.scored_positions, job_id)
+    pending = [position for position in range(len(resumes)) if position not in scored]
+    for start in range(0, len(pending), RANKING_JOB_STEP):
+        positions = pending[start:start + RANKING_JOB_STEP]
+        results = await score_resumes([resumes[position] for position in positions], job_profile)
+        stored = [
+            (position, result["overallScore"], ResumeScore(**result).model_dump_json())
+            for position, result in zip(positions, results)
+        ]
+        if not await run_in_threadpool(store.record_results, job_id, stored):
+            return False
+    
+    # Same order as rank_resumes: highest score first, ties in input order
+    scores = await run_in_threadpool(store.result_scores, job_id)
+    ranking = sorted(scores, key=lambda position: (-scores[position], position))
+    return await run_in_threadpool(store.finish, job_id, ranking)
+
+async def renew_ranking_job_lease(store, job_id):
+    """Heartbeat a running job so other processes sharing the queue don't take it over."""
+    while True:
+        await asyncio.sleep(store.lease / 4)
+        if not await run_in_threadpool(store.heartbeat, job_id):
+            return
+
+async def ranking_job_worker(store):
+    """Run queued ranking jobs one at a time until cancelled."""
+    while True:
+        job = await run_in_threadpool(store.claim)
+        if job is None:
+            # Submissions wake a worker up; the timeout covers a wake-up that raced with the claim
+            try:
+                await asyncio.wait_for(_ranking_job_wakeup.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                pass
+            _ranking_job_wakeup.clear()
+            continue
+        
+        job_id, request_json = job
+        started = time.perf_counter()
+        lease = asyncio.ensure_future(renew_ranking_job_lease(store, job_id))
+        try:
+            if await run_ranking_job(store, job_id, request_json):
+                logger.info("Ranking job %s finished in %.1fs", job_id, time.perf_counter() - started)
+        except asyncio.CancelledError:
+            # Shutting down: let the next process resume the job without waiting for the lease
+            store.release(job_id)
+            raise
+        except Exception as e:
+            logger.error("Ranking job %s failed: %s", job_id, e)
+            await run_in_threadpool(store.fail, job_id, str(e))
+        finally:
+            lease.cancel()
+
+@app.on_event("startup")
+async def start_ranking_job_workers():
+    # Expired jobs are removed; jobs of a process that died are claimed again once their lease expires
+    global _ranking_job_wakeup
+    _ranking_job_wakeup = asyncio.Event()
+    if RANKING_JOB_WORKERS <= 0:
+        return
+    store = get_ranking_job_store()
+    await run_in_threadpool(store.purge)
+    for _ in range(RANKING_JOB_WORKERS):
+        _ranking_job_workers.append(asyncio.ensure_future(ranking_job_worker(store)))
+
+@app.on_event("shutdown")
+async def stop_ranking_job_workers():
+    for worker in _ranking_job_workers:
+        worker.cancel()
+    await asyncio.gather(*_ranking_job_workers, return_exceptions=True)
+    _ranking_job_workers.clear()
+
+@app.on_event("shutdown")
+async def stop_warm_up():
+    if _warm_up_task is not None:
+        _warm_up_task.cancel()
+        await asyncio.gather(_warm_up_task, return_exceptions=True)
+
+@app.on_event("shutdown")
+def flush_job_analysis_cache():
+    # Changes still waiting for the background flush
+    if _job_analysis_cache is not None:
+        _job_analysis_cache.flush()
+
+@app.on_event("shutdown")
+def shutdown_scoring_pool():
+    if _scoring_pool is not None:
+        _scoring_pool.shutdown(wait=False, cancel_futures=True)
+
+@app.on_event("shutdown")
+async def close_openai_client():
+    if client is not None:
+        await client.close()
+
+def _warm_up_scoring_worker():
+    """
+    Prepare a scoring worker for its first batch. Workers load the spaCy model only
+    when a batch needs it, which is when skills are matched semantically with the
+    spacy embedding backend, so the embedder is created now only in that case.
+    """
+    if SKILL_MATCHING == "semantic":
+        get_phrase_embedder()
+    return os.getpid()
+
+def warm_up():
+    """
+    Load the NLP model and file parsers, and start the scoring workers. The model
+    is loaded here first, so a missing one fails the warm-up before any worker starts.
+    """
+    get_nlp()("warm up")
+    
+    # Import the file parsers now rather than on the first upload
+    import PyPDF2
+    import docx2txt
+    
+    pool = get_scoring_pool() if WARM_UP_SCORING_POOL else None
+    if pool is not None:
+        try:
+            for future in [pool.submit(_warm_up_scoring_worker) for _ in range(SCORING_WORKERS)]:
+                future.result()
+        except BrokenProcessPool:
+            # A worker died; don't leave the broken pool to the first request
+            _discard_scoring_pool(pool)
+            raise
+
+async def run_warm_up():
+    """
+    Warm up in the background and report the outcome through /readyz. A scoring
+    worker dying while starting is retried with a fresh pool and exponential backoff;
+    any other failure, such as a missing spaCy model, would fail again and is final.
+    """
+    started = time.perf_counter()
+    delay = 1.0
+    while True:
+        try:
+            await run_in_threadpool(warm_up)
+            _warm_up.update(status="ready", detail=None, seconds=round(time.perf_counter() - started, 3))
+            return
+        except BrokenProcessPool as e:
+            logger.error("Warm-up failed, retrying in %.0fs: %s", delay, e)
+            _warm_up.update(status="failed", detail=str(e), seconds=round(time.perf_counter() - started, 3))
+        except Exception as e:
+            logger.error("Warm-up failed: %s", e)
+            _warm_up.update(status="failed", detail=str(e), seconds=round(time.perf_counter() - started, 3))
+            return
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, WARM_UP_MAX_RETRY_DELAY)
+
+@app.on_event("startup")
+async def start_warm_up():
+    # Runs in the background so the server accepts requests (e.g. /parse-resume) right away
+    global _warm_up_task
+    _warm_up_task = asyncio.ensure_future(run_warm_up())
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness probe: the server is up and handling requests."""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """
+    Readiness probe: 200 once the NLP model and scoring workers are warm, 503 before,
+    including while a failed warm-up waits for its next attempt.
+    """
+    body = {"status": _warm_up["status"], "detail": _warm_up["detail"], "seconds": _warm_up["seconds"]}
+    if _warm_up["status"] != "ready":
+        return JSONResponse(body, status_code=503)
+    return body
+
+def check_view(view):
+    if view not in ("full", "summary"):
+        raise HTTPException(status_code=400, detail="view must be 'full' or 'summary'")
+
+def response_encoder(http_request):
+    """
+    The encoder a scoring response is sent with: "msgpack" for clients that accept
+    application/msgpack, "orjson" with JSON_ENCODER=orjson, or None to let FastAPI
+    validate and encode it through the response model.
+    """
+    accept = http_request.headers.get("accept", "")
+    if "application/msgpack" in accept or "application/x-msgpack" in accept:
+        if msgpack is None:
+            raise HTTPException(status_code=406, detail="MessagePack responses need the msgpack package")
+        return "msgpack"
+    return "orjson" if JSON_ENCODER == "orjson" else None
+
+def encoded_response(encoder, content, headers=None):
+    """A response of content, already shaped like its response model, encoded by a fast encoder."""
+    if encoder == "msgpack":
+        return Response(content=msgpack.packb(content), media_type="application/msgpack", headers=headers)
+    return Response(content=orjson.dumps(content), media_type="application/json", headers=headers)
+
+def public_result(result):
+    """
+    A result dict shaped exactly as its response model serializes it: without
+    matchedSkills and inputIndex and with the contexts of every score detail, even
+    when None.
+    """
+    result = {key: value for key, value in result.items() if key not in ("matchedSkills", "inputIndex")}
+    if "scoreDetails" in result:
+        result["scoreDetails"] = [{**detail, "contexts": detail.get("contexts")} for detail in result["scoreDetails"]]
+    return result
+
+def ranking_response(encoder, response, results, batch_id):
+    """The ranked results of a scoring endpoint, with their batch id in the X-Batch-Id header."""
+    if encoder is None:
+        response.headers["X-Batch-Id"] = batch_id
         return results
+    return encoded_response(encoder, [public_result(result) for result in results], {"X-Batch-Id": batch_id})
+
+@app.post("/analyze-resumes", response_model=Union[List[ResumeScore], List[ResumeSummary]])
+async def analyze_resumes(
+    response: Response,
+    http_request: Request,
+    request: ResumeAnalysisRequest = Body(...),
+    view: str = "full"
+):
+    """
+    Score and rank resumes. The X-Batch-Id response header identifies the scored
+    batch for /rerank and /batches/{batchId}/resumes/{resumeId}. With ?view=summary
+    only ids and scores are returned, and no evaluation texts are built.
+    """
+    check_view(view)
+    encoder = response_encoder(http_request)
+    try:
+        job_description = request.jobDescription
+        resumes = request.resumes
+        
+        # Compile the job description once for the whole batch
+        job_profile = await run_in_threadpool(compile_job_profile, job_description)
+        
+        # Extract attached files first so repeated uploads come from the cache
+        resumes = await resolve_resume_files(resumes)
+        job_profile = await weigh_job_keywords(resumes, job_profile)
+        
+        # With a top K, only resumes that can still make the cut are fully scored
+        results = await rank_resumes(resumes, job_profile, request.topK, summary=view == "summary")
+        batch_id = remember_scored_batch(job_profile, resumes, results)
+        return ranking_response(encoder, response, results, batch_id)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing resumes: {str(e)}")
 
-@app.post("/parse-resume")
-async def parse_resume(file: UploadFile = File(...)):
-    temp_file_path = None
+@app.post("/analyze-resumes/upload", response_model=Union[List[ResumeScore], List[ResumeSummary]])
+async def analyze_resume_uploads(
+    response: Response,
+    http_request: Request,
+    files: List[UploadFile] = File(...),
+    jobDescription: str = Form(...),
+    topK: Optional[int] = Form(None),
+    view: str = "full"
+):
+    """
+    Multipart variant of /analyze-resumes: resume files are sent as raw file parts
+    and the job description as a JSON form field, so nothing is base64 encoded.
+    Files not in the extracted text cache are extracted across the scoring workers.
+    """
+    check_view(view)
+    encoder = response_encoder(http_request)
+    try:
+        job_description = JobDescription.model_validate_json(jobDescription)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid jobDescription: {str(e)}")
+    
     try:
-        # Create a temporary file to store the uploaded content
-        file_extension = os.path.splitext(file.filename)[1]
+        job_profile = await run_in_threadpool(compile_job_profile, job_description)
+        
+        uploads = []
+        for file in files:
+            uploads.append((file.filename, await file.read()))
+            await file.close()
+        texts = await extract_file_texts(uploads)
+        del uploads
         
+        upload_date = datetime.now().isoformat()
+        resumes = [
+            Resume(
+                id=str(uuid.uuid4()),
+                name=os.path.splitext(file.filename)[0],
+                fileName=file.filename,
+                uploadDate=upload_date,
+                content=text
+            )
+            for file, text in zip(files, texts)
+        ]
+        job_profile = await weigh_job_keywords(resumes, job_profile)
+        results = await rank_resumes(resumes, job_profile, topK, summary=view == "summary")
+        batch_id = remember_scored_batch(job_profile, resumes, results)
+        return ranking_response(encoder, response, results, batch_id)
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error analyzing resumes: {str(e)}")
+
+@app.post("/corpus/rank", response_model=Union[List[ResumeScore], List[ResumeSummary]])
+async def rank_corpus_resumes(
+    response: Response,
+    http_request: Request,
+    request: CorpusRankRequest = Body(...),
+    view: str = "full"
+):
+    """
+    Rank stored resumes against a job description. Without resumeIds, only resumes
+    that mention at least one of the job's skills are loaded and scored.
+    """
+    check_view(view)
+    encoder = response_encoder(http_request)
+    try:
+        job_profile = await run_in_threadpool(compile_job_profile, request.jobDescription)
+        resumes = await run_in_threadpool(find_corpus_resumes, job_profile, request.resumeIds)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading stored resumes: {str(e)}")
+    
+    if request.resumeIds is not None and len(resumes) < len(set(request.resumeIds)):
+        found = {resume.id for resume in resumes}
+        missing = [resume_id for resume_id in request.resumeIds if resume_id not in found]
+        raise HTTPException(status_code=404, detail=f"Unknown resume ids: {', '.join(missing)}")
+    
+    try:
+        job_profile = await weigh_job_keywords(resumes, job_profile, corpus=get_resume_corpus())
+        results = await rank_resumes(resumes, job_profile, request.topK, summary=view == "summary")
+        batch_id = remember_scored_batch(job_profile, resumes, results)
+        return ranking_response(encoder, response, results, batch_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error analyzing resumes: {str(e)}")
+
+@app.delete("/corpus/resumes/{resume_id}")
+async def delete_corpus_resume(resume_id: str):
+    if not await run_in_threadpool(get_resume_corpus().remove, resume_id):
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return {"deleted": resume_id}
+
+@app.post("/match-jobs", response_model=JobMatchResponse)
+async def match_jobs_to_resumes(http_request: Request, request: JobMatchRequest = Body(...)):
+    """
+    Score a shared pool of resumes against several job descriptions at once. Every
+    job description is compiled once and every resume extracted, sectioned and
+    tagged once; the response holds jobs × resumes score matrices and a ranking
+    per job, whose batch id works with /rerank and the detail endpoint.
+    """
+    encoder = response_encoder(http_request)
+    try:
+        job_profiles = await run_in_threadpool(compile_job_profiles, request.jobDescriptions)
+        resumes = await resolve_resume_files(request.resumes)
+        metrics.BATCH_SIZE.observe(len(resumes))
+        titles = [job_description.title for job_description in request.jobDescriptions]
+        matched = await match_jobs(resumes, job_profiles, titles, request.topK)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error matching jobs: {str(e)}")
+    return matched if encoder is None else encoded_response(encoder, matched)
+
+@app.get("/batches/{batch_id}/resumes/{resume_id}", response_model=ResumeScore)
+async def get_batch_resume(http_request: Request, batch_id: str, resume_id: str, position: Optional[int] = None):
+    """
+    The full result of one resume of a ranked batch, with evaluation texts, matches
+    and skill contexts. It is built only now, with the job profile the batch was
+    scored with, so it agrees with the batch's scores; pairs with ?view=summary.
+    An id sent more than once is looked up at its best rank unless ?position= (its
+    0-based position in the ranking) picks another.
+    """
+    encoder = response_encoder(http_request)
+    batch = _scored_batch_cache.get(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired batch id")
+    if position is None:
+        position = next((row for row, ranked_id in enumerate(batch.resume_ids) if ranked_id == resume_id), None)
+    elif not (0 <= position < len(batch.resume_ids) and batch.resume_ids[position] == resume_id):
+        position = None
+    if position is None:
+        raise HTTPException(status_code=404, detail="Resume not in this batch")
+    resumes = _batch_resume_cache.get(batch_id)
+    if resumes is None:
+        raise HTTPException(status_code=410, detail="The resumes of this batch are no longer kept; rank them again")
+    resume = resumes[position]
+    result = await run_in_threadpool(score_resume, resume, batch.job_profile)
+    return result if encoder is None else encoded_response(encoder, public_result(result))
+
+@app.post("/rerank", response_model=List[RerankedResume])
+async def rerank_resumes(http_request: Request, request: RerankRequest = Body(...)):
+    """
+    Re-rank a batch ranked by /analyze-resumes (see its X-Batch-Id header) with other
+    score weights or without some of the job skills. Nothing is scored again: the
+    stored component scores are combined anew.
+    """
+    encoder = response_encoder(http_request)
+    batch = _scored_batch_cache.get(request.batchId)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired batch id")
+    unknown = [skill for skill in request.disabledSkills if skill not in batch.job_skills]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Not skills of this job: {', '.join(unknown)}")
+    
+    weights = request.weights or ScoreWeights()
+    values = (weights.keyword, weights.skills, weights.experience, weights.education)
+    if min(values) < 0 or sum(values) <= 0:
+        raise HTTPException(status_code=400, detail="Weights must be non-negative and not all zero")
+    if request.weights is None:
+        values = SCORE_WEIGHTS
+    else:
+        total = sum(values)
+        values = tuple(value / total for value in values)
+    reranked = batch.rerank(values, request.disabledSkills, request.topK)
+    return reranked if encoder is None else encoded_response(encoder, reranked)
+
+def _ranking_job(job):
+    job = dict(job)
+    return RankingJob(jobId=job.pop("id"), **job)
+
+@app.post("/ranking-jobs", response_model=RankingJob, status_code=202)
+async def submit_ranking_job(request: ResumeAnalysisRequest = Body(...)):
+    """
+    Queue an /analyze-resumes request as a background job and return its id right away.
+    Poll GET /ranking-jobs/{id} for progress and page through the ranking with
+    GET /ranking-jobs/{id}/results once it is done. Servers without ranking job
+    workers refuse jobs, which would otherwise stay queued forever.
+    """
+    if RANKING_JOB_WORKERS <= 0:
+        raise HTTPException(status_code=503, detail="Ranking jobs are disabled on this server (RANKING_JOB_WORKERS=0)")
+    store = get_ranking_job_store()
+    job_id = await run_in_threadpool(store.submit, request.model_dump_json(), len(request.resumes))
+    if _ranking_job_wakeup is not None:
+        _ranking_job_wakeup.set()
+    return _ranking_job(await run_in_threadpool(store.get, job_id))
+
+@app.get("/ranking-jobs/{job_id}", response_model=RankingJob)
+async def get_ranking_job(job_id: str):
+    job = await run_in_threadpool(get_ranking_job_store().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ranking job not found")
+    return _ranking_job(job)
+
+@app.get("/ranking-jobs/{job_id}/results", response_model=RankingJobResults)
+async def get_ranking_job_results(job_id: str, offset: int = 0, limit: int = 50):
+    """A page of the ranked results of a finished job, best first."""
+    if offset < 0 or not 1 <= limit <= 1000:
+        raise HTTPException(status_code=400, detail="offset must be >= 0 and limit between 1 and 1000")
+    store = get_ranking_job_store()
+    job = await run_in_threadpool(store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ranking job not found")
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Ranking job is {job['status']}")
+    results = await run_in_threadpool(store.results, job_id, offset, limit)
+    total = await run_in_threadpool(store.result_count, job_id)
+    return RankingJobResults(
+        jobId=job_id, total=total, offset=offset, limit=limit, results=[json.loads(result) for result in results]
+    )
+
+@app.delete("/ranking-jobs/{job_id}")
+async def delete_ranking_job(job_id: str):
+    """Delete a job and its results; a queued or running job is abandoned."""
+    if not await run_in_threadpool(get_ranking_job_store().delete, job_id):
+        raise HTTPException(status_code=404, detail="Ranking job not found")
+    return {"deleted": job_id}
+
+def _stream_message(message, stream_format):
+    """Encode one streaming message as an NDJSON line or a Server-Sent Event."""
+    if stream_format == "sse":
+        return f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+    return json.dumps(message) + "\n"
+
+@app.post("/analyze-resumes/stream")
+async def analyze_resumes_stream(request: ResumeAnalysisRequest = Body(...), format: str = "ndjson"):
+    """
+    Streaming variant of /analyze-resumes. Emits a "result" message with progress counts
+    for each resume as soon as it is scored, then one "ranking" message with the resume
+    ids sorted by overall score. Use ?format=sse for Server-Sent Events instead of NDJSON.
+    """
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+    
+    resumes = request.resumes
+    total = len(resumes)
+    
+    async def messages():
+        try:
+            job_profile = await run_in_threadpool(compile_job_profile, request.jobDescription)
+            resolved = await resolve_resume_files(resumes)
+            metrics.BATCH_SIZE.observe(total)
+            job_profile = await weigh_job_keywords(resolved, job_profile)
+            results = [None] * total
+            completed = 0
+            async for index, result in iter_scored_resumes(resolved, job_profile):
+                result["inputIndex"] = index
+                results[index] = result
+                completed += 1
+                payload = ResumeScore(**result).model_dump()
+                yield _stream_message(
+                    {"type": "result", "index": index, "completed": completed, "total": total, "result": payload},
+                    format
+                )
+            
+            ranked = [results[index] for index in rank_results(results)]
+            yield _stream_message({
+                "type": "ranking",
+                "completed": completed,
+                "total": total,
+                "ranking": [result["resumeId"] for result in ranked],
+                "batchId": remember_scored_batch(job_profile, resolved, ranked)
+            }, format)
+        except Exception as e:
+            logger.error("Error streaming resume analysis: %s", e)
+            yield _stream_message({"type": "error", "detail": f"Error analyzing resumes: {str(e)}"}, format)
+    
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(messages(), media_type=media_type)
+
+@app.post("/parse-resume")
+async def parse_resume(file: UploadFile = File(...), store: bool = False):
+    try:
         try:
             # Read file content
             content = await file.read()
             
-            # Check for common PDF errors in content
-            if file_extension.lower() == '.pdf' and b'startxref' in content:
-                print("Detected potential PDF with startxref - applying special handling")
-                # Ensure proper EOF marking
-                if not content.strip().endswith(b"%%EOF"):
-                    content = content + b"\n%%EOF"
-            
-            # Write to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-                temp_file.write(content)
-                temp_file_path = temp_file.name
-            
-            # Extract text based on file type
-            resume_text = extract_text_from_resume(temp_file_path, file_extension)
+            # Extract text based on file type, straight from memory or from the cache
+            resume_text = await run_in_threadpool(extract_text_cached, file.filename, content)
         except Exception as e:
-            print(f"Error processing file: {str(e)}")
+            logger.warning("Error processing file: %s", e)
             # Check if it's a startxref error
             if "startxref" in str(e).lower():
                 return {
                     "error": "The PDF file appears to be corrupted (incorrect startxref pointer). Please try another PDF file or convert this file to a different format."
                 }
             return {"error": f"Error processing the uploaded file: {str(e)}"}
-        finally:
-            # Clean up the temporary file
-            if temp_file_path and os.path.exists(temp_file_path):
-                try:
-                    os.unlink(temp_file_path)
-                except:
-                    pass  # Ignore cleanup errors
         
-        if not resume_text or not resume_text.strip() or resume_text.startswith("Could not extract"):
+        if not is_extracted_text(resume_text):
             return {"error": "Could not extract text from the uploaded file. The file might be corrupted or password-protected."}
         
         # Generate a unique ID and create Resume object
@@ -1306,11 +3524,15 @@ async def parse_resume(file: UploadFile = File(...)):
             "content": resume_text
         }
         
+        # Keep the parsed resume so it can be ranked later without resending it
+        if store:
+            await run_in_threadpool(get_resume_corpus().add, resume)
+        
         return resume
     
     except Exception as e:
         error_msg = str(e)
-        print(f"Exception in parse_resume: {error_msg}")
+        logger.error("Exception in parse_resume: %s", error_msg)
         # Check for common PDF errors
         if "startxref" in error_msg.lower():
             return {
@@ -1318,6 +3540,35 @@ async def parse_resume(file: UploadFile = File(...)):
             }
         raise HTTPException(status_code=500, detail=f"Error parsing resume: {error_msg}")
 
+def collect_cache_stats():
+    stats = {
+        "extractedText": get_extracted_text_cache().stats(),
+        "jobAnalyses": get_job_analysis_cache().stats(),
+        "jobProfiles": _job_profile_cache.stats(),
+        "skillMatchers": _skill_matcher_cache.stats(),
+        "scoredBatches": _scored_batch_cache.stats(),
+        "batchResumes": _batch_resume_cache.stats()
+    }
+    if _phrase_embedder is not None:
+        stats["phraseVectors"] = _phrase_embedder.stats()
+    return stats
+
+metrics.register_cache_stats(collect_cache_stats)
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit and miss counts and sizes of the extracted text, job analysis and in-process caches."""
+    return collect_cache_stats()
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """
+    Metrics in the Prometheus text format: per-stage latency histograms, request,
+    batch size and LLM call counters, in-flight gauges and cache hit ratios.
+    """
+    content, content_type = metrics.render()
+    return Response(content=content, headers={"Content-Type": content_type})
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=False) 
\ No newline at end of file
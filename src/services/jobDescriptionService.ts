@@ -334,7 +334,71 @@ const generateFallbackAnalysis = (jobData: CompleteJobData): JobDescriptionAnaly
   return { sections };
 };
 
-export const analyzeJobDescription = async (jobData: CompleteJobData): Promise<JobDescriptionAnalysis> => {
+// Callback invoked for each analyzed section as soon as the server has parsed it
+export type AnalyzedSectionCallback = (section: AnalyzedSection) => void;
+
+// Stream the job description analysis from the server (NDJSON), reporting each section as it arrives
+const streamJobDescriptionAnalysis = async (
+  jobData: CompleteJobData,
+  onSection: AnalyzedSectionCallback
+): Promise<JobDescriptionAnalysis> => {
+  const response = await fetch(`${API_BASE_URL}/analyze-job-description/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(jobData)
+  });
+  
+  if (!response.ok || !response.body) {
+    throw new Error(`Streaming request failed with status ${response.status}`);
+  }
+  
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let analysis: JobDescriptionAnalysis | null = null;
+  
+  const handleLine = (line: string) => {
+    if (!line.trim()) return;
+    const message = JSON.parse(line);
+    
+    if (message.type === 'section') {
+      onSection(message.section);
+    } else if (message.type === 'done') {
+      analysis = { sections: message.sections };
+    } else if (message.type === 'error') {
+      throw new Error(message.detail);
+    }
+  };
+  
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop() || '';
+    lines.forEach(handleLine);
+  }
+  handleLine(buffer);
+  
+  if (!analysis) {
+    throw new Error('Job description analysis stream ended early');
+  }
+  return analysis;
+};
+
+export const analyzeJobDescription = async (
+  jobData: CompleteJobData,
+  onSection?: AnalyzedSectionCallback
+): Promise<JobDescriptionAnalysis> => {
+  if (onSection) {
+    try {
+      return await streamJobDescriptionAnalysis(jobData, onSection);
+    } catch (error) {
+      console.warn('Streaming job description analysis failed, retrying without streaming:', error);
+    }
+  }
+  
   try {
     // Use retry mechanism for resilience
     const response = await retryRequest(() => 
@@ -0,0 +1,84 @@
+"""
+Thread-safe LRU mapping shared by the in-process caches.
+
+Entries are bounded by count, by the total of the sizes given when they are
+put, or both. Lookups with get count hits and misses for the cache statistics;
+peek looks without counting or refreshing the entry.
+"""
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    LRU mapping of at most maxsize entries (unbounded when None). The total size
+    given with each put can be bounded by max_total_size as well.
+    """
+
+    def __init__(self, maxsize, max_total_size=None):
+        self.maxsize = maxsize
+        self.max_total_size = max_total_size
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._total_size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def peek(self, key, default=None):
+        with self._lock:
+            return self._data.get(key, default)
+
+    def put(self, key, value, size=0):
+        """Store a value as the most recently used entry; returns the evicted (key, value) pairs."""
+        evicted = []
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._total_size += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+            while self._data and (
+                self.maxsize is not None and len(self._data) > self.maxsize
+                or self.max_total_size is not None and self._total_size > self.max_total_size
+            ):
+                evicted_key, evicted_value = self._data.popitem(last=False)
+                self._total_size -= self._sizes.pop(evicted_key)
+                evicted.append((evicted_key, evicted_value))
+        return evicted
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._total_size -= self._sizes.pop(key)
+            return self._data.pop(key)
+
+    def items(self):
+        """(key, value) pairs, least recently used first."""
+        with self._lock:
+            return list(self._data.items())
+
+    @property
+    def total_size(self):
+        return self._total_size
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            stats = {"hits": self.hits, "misses": self.misses, "entries": len(self._data)}
+            if self.max_total_size is not None:
+                stats["totalSize"] = self._total_size
+            return stats
@@ -0,0 +1,242 @@
+"""
+Durable queue of asynchronous ranking jobs backed by SQLite.
+
+A job holds the submitted /analyze-resumes request and moves from "queued" to
+"running" to "done" or "failed". A running job is leased to the store (one per
+process) that claimed it, which renews the lease with heartbeats while it works.
+Several processes can share the database: a job is only taken over once its lease
+has expired, e.g. because its process died. Results are written as batches of
+resumes are scored, so a job taken over or interrupted by a restart only scores
+the resumes it had not finished. Finished results stay stored with their rank until
+the job is deleted or expires, and pages of them are read straight from the table.
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# Location of the job database, and how long finished jobs are kept
+RANKING_JOBS_PATH = os.getenv("RANKING_JOBS_PATH", "ranking_jobs.db")
+RANKING_JOB_RETENTION = float(os.getenv("RANKING_JOB_RETENTION", str(7 * 24 * 3600)))
+# Seconds a running job stays leased to its process without a heartbeat
+RANKING_JOB_LEASE = float(os.getenv("RANKING_JOB_LEASE", "60"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    request TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    owner TEXT,
+    heartbeatAt REAL,
+    createdAt REAL NOT NULL,
+    updatedAt REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, createdAt);
+CREATE TABLE IF NOT EXISTS results (
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    rank INTEGER,
+    result TEXT NOT NULL,
+    PRIMARY KEY (job_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_rank ON results (job_id, rank);
+"""
+
+JOB_FIELDS = ("id", "status", "total", "completed", "error", "createdAt", "updatedAt")
+
+class RankingJobStore:
+    """Ranking jobs and their results stored on disk."""
+
+    def __init__(self, path=RANKING_JOBS_PATH, lease=RANKING_JOB_LEASE):
+        self.path = path
+        self.lease = lease
+        # Identifies the jobs leased to this store
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        
+        # Databases created before jobs were leased
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in (("owner", "TEXT"), ("heartbeatAt", "REAL")):
+            if column not in columns:
+                self._connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+
+    def submit(self, request_json, total):
+        """Queue a job for a serialized ResumeAnalysisRequest with total resumes. Returns the job id."""
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO jobs (id, status, request, total, createdAt, updatedAt) VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, request_json, total, now, now)
+            )
+        return job_id
+
+    def claim(self):
+        """
+        Lease the oldest queued job, or a running job whose lease expired, to this store,
+        mark it as running and return (job id, request JSON), or None.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    "SELECT id, request FROM jobs WHERE status = 'queued' "
+                    "OR (status = 'running' AND (heartbeatAt IS NULL OR heartbeatAt < ?)) "
+                    "ORDER BY createdAt LIMIT 1",
+                    (now - self.lease,)
+                ).fetchone()
+                if row is not None:
+                    self._connection.execute(
+                        "UPDATE jobs SET status = 'running', owner = ?, heartbeatAt = ?, updatedAt = ? WHERE id = ?",
+                        (self.owner, now, now, row[0])
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return row
+
+    def heartbeat(self, job_id):
+        """Renew the lease of a running job. Returns False when this store no longer holds it."""
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE jobs SET heartbeatAt = ? WHERE id = ? AND status = 'running' AND owner = ?",
+                (time.time(), job_id, self.owner)
+            )
+        return cursor.rowcount > 0
+
+    def release(self, job_id):
+        """Queue a job leased to this store again right away, e.g. when shutting down."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, heartbeatAt = NULL, updatedAt = ? "
+                "WHERE id = ? AND status = 'running' AND owner = ?",
+                (time.time(), job_id, self.owner)
+            )
+
+    def scored_positions(self, job_id):
+        """Input positions of the resumes of a job that already have a result."""
+        with self._lock:
+            rows = self._connection.execute("SELECT position FROM results WHERE job_id = ?", (job_id,))
+            return {row[0] for row in rows}
+
+    def record_results(self, job_id, results):
+        """
+        Store (position, overall score, result JSON) triples of a job leased to this store,
+        advance its progress and renew the lease. Returns False when the job no longer
+        exists or was taken over by another process.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._connection.execute(
+                    "UPDATE jobs SET completed = completed + ?, heartbeatAt = ?, updatedAt = ? "
+                    "WHERE id = ? AND status = 'running' AND owner = ?",
+                    (len(results), now, now, job_id, self.owner)
+                )
+                if cursor.rowcount:
+                    self._connection.executemany(
+                        "INSERT OR REPLACE INTO results (job_id, position, score, result) VALUES (?, ?, ?, ?)",
+                        [(job_id, position, score, result) for position, score, result in results]
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return cursor.rowcount > 0
+
+    def result_scores(self, job_id):
+        """Overall score of every stored result of a job, by input position."""
+        with self._lock:
+            rows = self._connection.execute("SELECT position, score FROM results WHERE job_id = ?", (job_id,))
+            return dict(rows.fetchall())
+
+    def finish(self, job_id, ranking):
+        """
+        Store the rank of every result, given the result positions in ranking order, and
+        mark the job done. Returns False when this store no longer holds the job.
+        """
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._connection.execute(
+                    "UPDATE jobs SET status = 'done', completed = total, owner = NULL, updatedAt = ? "
+                    "WHERE id = ? AND status = 'running' AND owner = ?",
+                    (time.time(), job_id, self.owner)
+                )
+                if cursor.rowcount:
+                    self._connection.executemany(
+                        "UPDATE results SET rank = ? WHERE job_id = ? AND position = ?",
+                        [(rank, job_id, position) for rank, position in enumerate(ranking)]
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return cursor.rowcount > 0
+
+    def fail(self, job_id, error):
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, owner = NULL, updatedAt = ? WHERE id = ? AND owner = ?",
+                (error, time.time(), job_id, self.owner)
+            )
+
+    def get(self, job_id):
+        """Status and progress of a job as a dict, or None for an unknown id."""
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(zip(JOB_FIELDS, row)) if row is not None else None
+
+    def results(self, job_id, offset, limit):
+        """Result JSON of a finished job in ranking order, limit entries starting at offset."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT result FROM results WHERE job_id = ? AND rank >= ? ORDER BY rank LIMIT ?",
+                (job_id, offset, limit)
+            )
+            return [row[0] for row in rows]
+
+    def result_count(self, job_id):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results WHERE job_id = ?", (job_id,)).fetchone()[0]
+
+    def delete(self, job_id):
+        """Delete a job and its results. Returns whether it existed."""
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute("DELETE FROM results WHERE job_id = ?", (job_id,))
+                cursor = self._connection.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return cursor.rowcount > 0
+
+    def purge(self, retention=RANKING_JOB_RETENTION):
+        """Delete finished or failed jobs last updated more than retention seconds ago. Returns how many."""
+        expired_before = time.time() - retention
+        with self._lock:
+            expired = [row[0] for row in self._connection.execute(
+                "SELECT id FROM jobs WHERE status IN ('done', 'failed') AND updatedAt < ?", (expired_before,)
+            )]
+        for job_id in expired:
+            self.delete(job_id)
+        return len(expired)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
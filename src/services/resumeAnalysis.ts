@@ -167,6 +167,74 @@ const batchProcessResumes = async (
   return results;
 };
 
+// Callback invoked for each resume score as soon as the server has computed it
+export type ResumeScoreCallback = (
+  score: ResumeScore,
+  progress: { completed: number; total: number }
+) => void;
+
+// Stream resume scores from the server (NDJSON), reporting each one as it arrives
+const streamProcessResumes = async (
+  resumes: Resume[],
+  jobDescription: JobDescription,
+  onResult: ResumeScoreCallback
+): Promise<ResumeScore[]> => {
+  const results: ResumeScore[] = [];
+  
+  try {
+    const response = await fetch(`${API_BASE_URL}/analyze-resumes/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ jobDescription, resumes })
+    });
+    
+    if (!response.ok || !response.body) {
+      throw new Error(`Streaming request failed with status ${response.status}`);
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    const handleLine = (line: string) => {
+      if (!line.trim()) return;
+      const message = JSON.parse(line);
+      
+      if (message.type === 'result') {
+        results.push(message.result);
+        onResult(message.result, { completed: message.completed, total: message.total });
+      } else if (message.type === 'error') {
+        throw new Error(message.detail);
+      }
+    };
+    
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop() || '';
+      lines.forEach(handleLine);
+    }
+    handleLine(buffer);
+  } catch (error) {
+    console.error('Error streaming resume analysis:', error);
+    
+    // Create fallback results for resumes the server did not get to
+    const scoredIds = new Set(results.map(result => result.resumeId));
+    const fallbackResults = await Promise.all(
+      resumes
+        .filter(resume => !scoredIds.has(resume.id))
+        .map(resume => createFallbackResult(resume, jobDescription))
+    );
+    
+    results.push(...fallbackResults);
+  }
+  
+  return results;
+};
+
 // Helper function to create a fallback result for a resume
 const createFallbackResult = async (
   resume: Resume, 
@@ -226,9 +294,11 @@ const createFallbackResult = async (
 };
 
 // Main function to analyze resumes against a job description
+// When onResult is given, scores are streamed and reported one by one as they are computed
 export const analyzeResumes = async (
   resumes: Resume[],
-  jobDescription: JobDescription
+  jobDescription: JobDescription,
+  onResult?: ResumeScoreCallback
 ): Promise<ResumeScore[]> => {
   try {
     // Prepare enhanced job description
@@ -260,9 +330,13 @@ export const analyzeResumes = async (
       return Promise.all(errorResumes.map(resume => createFallbackResult(resume, enhancedJobDescription)));
     }
 
-    // Process valid resumes in batches for better performance
-    const validResults = validResumes.length > 0 ? 
-      await batchProcessResumes(validResumes, enhancedJobDescription) : [];
+    // Process valid resumes in batches for better performance, or stream them
+    let validResults: ResumeScore[] = [];
+    if (validResumes.length > 0) {
+      validResults = onResult
+        ? await streamProcessResumes(validResumes, enhancedJobDescription, onResult)
+        : await batchProcessResumes(validResumes, enhancedJobDescription);
+    }
 
     // Create fallback results for resumes with errors
     const errorResults = await Promise.all(
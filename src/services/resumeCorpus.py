@@ -0,0 +1,167 @@
+"""
+Persistent resume corpus backed by SQLite.
+
+Parsed resumes are stored under their id together with an inverted index from
+normalized tokens to resume ids, so a job description can be matched against
+only the resumes that mention at least one of its skills. The same index gives
+the document frequencies used to weigh job keywords with BM25.
+"""
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+
+# Location of the corpus database file
+RESUME_CORPUS_PATH = os.getenv("RESUME_CORPUS_PATH", "resume_corpus.db")
+
+# Dotted terms such as "node.js" and "asp.net" are kept whole; "c++" and "c#" keep their symbols
+TOKEN_PATTERN = re.compile(r'[a-z0-9+#]+(?:\.[a-z0-9+#]+)*')
+TOKEN_PART_PATTERN = re.compile(r'[a-z0-9+#]+')
+
+# Upper bound for a prefix range scan over the token index
+PREFIX_END = "\U0010ffff"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    fileName TEXT NOT NULL,
+    uploadDate TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    token TEXT NOT NULL,
+    resume_id TEXT NOT NULL,
+    PRIMARY KEY (token, resume_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_resume ON postings (resume_id);
+"""
+
+RESUME_FIELDS = ("id", "name", "fileName", "uploadDate", "content")
+
+def tokenize(text):
+    """Lowercased tokens of a text, in order of appearance."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def index_tokens(text):
+    """Distinct tokens stored in the inverted index for a text, including the parts of dotted terms."""
+    tokens = set()
+    for token in tokenize(text):
+        tokens.add(token)
+        if "." in token:
+            tokens.update(TOKEN_PART_PATTERN.findall(token))
+    return tokens
+
+def term_counts(text):
+    """
+    How often each index token occurs in a text, counting the parts of dotted terms
+    like index_tokens, and the number of tokens in the text.
+    """
+    counts = Counter()
+    tokens = tokenize(text)
+    for token in tokens:
+        counts[token] += 1
+        if "." in token:
+            counts.update(TOKEN_PART_PATTERN.findall(token))
+    return counts, len(tokens)
+
+class ResumeCorpus:
+    """Resumes stored on disk with an inverted token index."""
+
+    def __init__(self, path=RESUME_CORPUS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+
+    def add(self, resume):
+        """Store a resume (a mapping with the Resume fields), replacing any resume with the same id."""
+        row = tuple(resume[field] for field in RESUME_FIELDS)
+        tokens = index_tokens(resume["content"])
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM postings WHERE resume_id = ?", (row[0],))
+            self._connection.execute("INSERT OR REPLACE INTO resumes VALUES (?, ?, ?, ?, ?)", row)
+            self._connection.executemany(
+                "INSERT INTO postings VALUES (?, ?)", [(token, row[0]) for token in tokens]
+            )
+
+    def remove(self, resume_id):
+        """Delete a resume and its postings. Returns whether it existed."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM postings WHERE resume_id = ?", (resume_id,))
+            cursor = self._connection.execute("DELETE FROM resumes WHERE id = ?", (resume_id,))
+            return cursor.rowcount > 0
+
+    def get_many(self, resume_ids):
+        """Stored resumes for the given ids, in the same order. Unknown ids are skipped."""
+        found = {}
+        ids = list(dict.fromkeys(resume_ids))
+        with self._lock:
+            # Stay well below SQLite's limit on bound parameters
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                rows = self._connection.execute(
+                    f"SELECT {', '.join(RESUME_FIELDS)} FROM resumes WHERE id IN ({', '.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+                for row in rows:
+                    found[row[0]] = dict(zip(RESUME_FIELDS, row))
+        return [found[resume_id] for resume_id in ids if resume_id in found]
+
+    def _postings(self, token, prefix=False):
+        if prefix:
+            rows = self._connection.execute(
+                "SELECT DISTINCT resume_id FROM postings WHERE token >= ? AND token < ?",
+                (token, token + PREFIX_END)
+            )
+        else:
+            rows = self._connection.execute("SELECT resume_id FROM postings WHERE token = ?", (token,))
+        return {row[0] for row in rows}
+
+    def candidates(self, terms):
+        """
+        Ids of the resumes that mention any of the given terms (skills or their
+        variations). Every token of a term must be present; the last one may also
+        be a prefix, so "react" finds "reactjs" and "api" finds "apis".
+        """
+        postings = {}
+        matched = set()
+        with self._lock:
+            for term in terms:
+                tokens = tokenize(term)
+                if not tokens:
+                    continue
+                keys = [(token, False) for token in tokens[:-1]] + [(tokens[-1], True)]
+                term_ids = None
+                for key in keys:
+                    if key not in postings:
+                        postings[key] = self._postings(*key)
+                    term_ids = postings[key] if term_ids is None else term_ids & postings[key]
+                    if not term_ids:
+                        break
+                matched |= term_ids
+        return matched
+
+    def document_frequencies(self, tokens):
+        """Number of stored resumes containing each token, and the number of stored resumes."""
+        tokens = list(dict.fromkeys(tokens))
+        frequencies = dict.fromkeys(tokens, 0)
+        with self._lock:
+            for start in range(0, len(tokens), 500):
+                batch = tokens[start:start + 500]
+                frequencies.update(self._connection.execute(
+                    f"SELECT token, COUNT(*) FROM postings WHERE token IN ({', '.join('?' * len(batch))}) GROUP BY token",
+                    batch
+                ))
+            total = self._connection.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+        return frequencies, total
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,157 @@
+"""
+Prometheus metrics of the resume ranking service.
+
+Counters, gauges and histograms are prometheus_client metrics in its default
+registry, rendered in the Prometheus text exposition format by /metrics; cache
+statistics are read from the caches when scraped. Scoring runs in worker processes
+whose metrics are never scraped, so the stage timings observed there are
+collected per batch and sent back to the API process with the results.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+import prometheus_client
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Only the counts themselves, without a *_created series per counter
+prometheus_client.disable_created_metrics()
+
+# Histogram buckets in seconds, from fast regex stages to slow LLM calls
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# Histogram buckets for the number of resumes per ranking request
+BATCH_SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+STAGE_SECONDS = Histogram(
+    "resume_rank_stage_seconds",
+    "Time spent in each processing stage (extraction, sectioning, nlp, keywords, skills, semantic, experience, education, llm)",
+    ["stage"], buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS = Counter(
+    "resume_rank_http_requests_total", "HTTP requests by method, route and status code", ["method", "route", "status"]
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "resume_rank_http_request_duration_seconds", "HTTP request latency until the response is fully sent",
+    ["method", "route"], buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge("resume_rank_http_requests_in_flight", "HTTP requests currently being handled")
+BATCH_SIZE = Histogram(
+    "resume_rank_batch_size", "Resumes per ranking request", buckets=BATCH_SIZE_BUCKETS
+)
+RESUMES_SCORED = Counter("resume_rank_resumes_scored_total", "Resumes fully scored")
+RESUMES_IN_FLIGHT = Gauge("resume_rank_resumes_in_flight", "Resumes currently being scored")
+LLM_REQUESTS = Counter("resume_rank_llm_requests_total", "Azure OpenAI calls by outcome", ["outcome"])
+LLM_REQUESTS_IN_FLIGHT = Gauge("resume_rank_llm_requests_in_flight", "Azure OpenAI calls currently running")
+
+@contextmanager
+def in_flight(gauge, amount=1):
+    """Add amount to a gauge for the duration of a block, e.g. to count work in flight."""
+    gauge.inc(amount)
+    try:
+        yield
+    finally:
+        gauge.dec(amount)
+
+class CacheStatsCollector:
+    """
+    Hits, misses, hit ratio and entries of every cache, read from the stats() the
+    caches keep themselves whenever metrics are scraped. collect_stats returns
+    {cache name: stats dict}.
+    """
+
+    def __init__(self, collect_stats):
+        self.collect_stats = collect_stats
+
+    def _families(self):
+        return (
+            CounterMetricFamily("resume_rank_cache_hits", "Cache hits", labels=["cache"]),
+            CounterMetricFamily("resume_rank_cache_misses", "Cache misses", labels=["cache"]),
+            GaugeMetricFamily("resume_rank_cache_hit_ratio", "Share of cache lookups that were hits", labels=["cache"]),
+            GaugeMetricFamily("resume_rank_cache_entries", "Entries held in memory by each cache", labels=["cache"])
+        )
+
+    def describe(self):
+        return self._families()
+
+    def collect(self):
+        hits, misses, hit_ratio, entries = families = self._families()
+        for cache, stats in self.collect_stats().items():
+            cache_hits, cache_misses = stats.get("hits", 0), stats.get("misses", 0)
+            hits.add_metric([cache], cache_hits)
+            misses.add_metric([cache], cache_misses)
+            hit_ratio.add_metric([cache], cache_hits / (cache_hits + cache_misses) if cache_hits + cache_misses else 0.0)
+            entries.add_metric([cache], stats.get("entries", 0))
+        return families
+
+def register_cache_stats(collect_stats):
+    """Report the cache stats returned by collect_stats() with every scrape."""
+    REGISTRY.register(CacheStatsCollector(collect_stats))
+
+def render():
+    """All metrics in the Prometheus text exposition format, and its content type."""
+    return prometheus_client.generate_latest(REGISTRY), prometheus_client.CONTENT_TYPE_LATEST
+
+# Stage timings of the current thread are buffered here while a batch is collecting them
+_local = threading.local()
+
+def observe_stage(stage, seconds):
+    timings = getattr(_local, "timings", None)
+    if timings is None:
+        STAGE_SECONDS.labels(stage).observe(seconds)
+    else:
+        timings.append((stage, seconds))
+
+@contextmanager
+def time_stage(stage):
+    """Record the duration of a block as one observation of a stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+def run_collecting_timings(function, *args):
+    """
+    Call function(*args) and return (result, stage timings) instead of recording the
+    timings here. Used as the task of a worker process so its timings reach the API process.
+    """
+    previous = getattr(_local, "timings", None)
+    _local.timings = timings = []
+    try:
+        return function(*args), timings
+    finally:
+        _local.timings = previous
+
+def record_stage_timings(timings):
+    for stage, seconds in timings:
+        STAGE_SECONDS.labels(stage).observe(seconds)
+
+class MetricsMiddleware:
+    """ASGI middleware counting requests, their latency and the requests in flight, per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            with in_flight(HTTP_REQUESTS_IN_FLIGHT):
+                await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope; unmatched paths share one label
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            HTTP_REQUESTS.labels(scope["method"], route_path, status[0]).inc()
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route_path).observe(time.perf_counter() - started)
@@ -0,0 +1,160 @@
+"""
+Local phrase embeddings for semantic skill matching.
+
+Phrases are turned into unit vectors on the CPU by one of two backends:
+"hashing" hashes character n-grams into a fixed number of dimensions and needs
+no model, so "postgres" lands close to "postgresql"; "spacy" averages the word
+vectors of the loaded spaCy model and works best with a model that ships
+vectors, such as en_core_web_md. Phrase vectors are cached per process,
+optionally quantized to int8, and a SkillIndex matches a batch of phrases
+against the vectors of a skill set with one matrix product.
+"""
+import os
+import zlib
+
+import numpy as np
+
+from lruCache import LRUCache
+
+# Embedding backend ("hashing" or "spacy") and the size of hashed vectors
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "hashing").lower()
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "256"))
+# Phrase vectors kept per process, and whether they are stored as int8
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "20000"))
+EMBEDDING_INT8 = os.getenv("EMBEDDING_INT8", "0").lower() not in ("0", "false", "no")
+
+# Components of a unit vector are scaled by this before rounding to int8
+INT8_SCALE = 127.0
+
+def normalize_rows(matrix):
+    """Rows scaled to unit length; all-zero rows stay zero."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+def quantize(matrix):
+    return np.round(matrix * INT8_SCALE).astype(np.int8)
+
+def dequantize(matrix):
+    return matrix.astype(np.float32) / INT8_SCALE
+
+class HashingEmbedder:
+    """
+    Character n-grams of the padded phrase, each hashed to a signed bucket of a
+    fixed-size vector. Deterministic across processes, no model required.
+    """
+
+    def __init__(self, dimensions=EMBEDDING_DIMENSIONS, ngram_sizes=(2, 3)):
+        self.dimensions = dimensions
+        self.ngram_sizes = ngram_sizes
+
+    def embed(self, phrases):
+        rows, columns, signs = [], [], []
+        for row, phrase in enumerate(phrases):
+            padded = f" {phrase} "
+            for size in self.ngram_sizes:
+                for start in range(len(padded) - size + 1):
+                    digest = zlib.crc32(padded[start:start + size].encode())
+                    rows.append(row)
+                    columns.append(digest % self.dimensions)
+                    signs.append(1.0 if digest & 0x80000000 else -1.0)
+        matrix = np.zeros((len(phrases), self.dimensions), dtype=np.float32)
+        np.add.at(matrix, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), signs)
+        return normalize_rows(matrix)
+
+class SpacyEmbedder:
+    """Average word vectors of each phrase from a spaCy model."""
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+        self.has_vectors = len(nlp.vocab.vectors) > 0
+
+    def embed(self, phrases):
+        if self.has_vectors:
+            docs = [self.nlp.make_doc(phrase) for phrase in phrases]
+        else:
+            # Models without word vectors fall back to the output of their tok2vec layer
+            disabled = [name for name in self.nlp.pipe_names if name != "tok2vec"]
+            docs = list(self.nlp.pipe(phrases, disable=disabled))
+        vectors = [doc.vector for doc in docs]
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        return normalize_rows(np.array(vectors, dtype=np.float32))
+
+class CachedEmbedder:
+    """
+    An embedder whose phrase vectors are kept in an LRU cache, as int8 when
+    quantized. Only phrases missing from the cache are embedded, in one batch.
+    """
+
+    def __init__(self, embedder, max_entries=EMBEDDING_CACHE_SIZE, int8=EMBEDDING_INT8):
+        self.embedder = embedder
+        self.int8 = int8
+        self._entries = LRUCache(max_entries)
+
+    def embed(self, phrases):
+        """One float32 unit vector per phrase, as the rows of a matrix."""
+        vectors = [None] * len(phrases)
+        missing = {}
+        for index, phrase in enumerate(phrases):
+            vector = self._entries.get(phrase)
+            if vector is None:
+                missing.setdefault(phrase, []).append(index)
+            else:
+                vectors[index] = vector
+
+        if missing:
+            embedded = self.embedder.embed(list(missing))
+            if self.int8:
+                embedded = quantize(embedded)
+            for (phrase, indices), vector in zip(missing.items(), embedded):
+                self._entries.put(phrase, vector)
+                for index in indices:
+                    vectors[index] = vector
+
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        matrix = np.stack(vectors)
+        return dequantize(matrix) if self.int8 else matrix
+
+    def stats(self):
+        return {**self._entries.stats(), "int8": self.int8}
+
+class SkillIndex:
+    """
+    Precomputed vectors of every variation of a skill set. The similarity of a
+    phrase to a skill is its best cosine similarity with any of the skill's variations.
+    """
+
+    def __init__(self, variations, skills, embedder):
+        """variations maps each variation to its skill; skills fixes the column order of the results."""
+        self.skills = list(skills)
+        column_of = {skill: column for column, skill in enumerate(self.skills)}
+        self.matrix = embedder.embed(list(variations))
+        self._variation_columns = {}
+        for row, skill in enumerate(variations.values()):
+            self._variation_columns.setdefault(column_of[skill], []).append(row)
+
+    def similarities(self, phrase_matrix):
+        """phrases × skills matrix of cosine similarities."""
+        similarities = np.zeros((phrase_matrix.shape[0], len(self.skills)), dtype=np.float32)
+        if not phrase_matrix.shape[0] or not self.matrix.size:
+            return similarities
+        variation_similarities = phrase_matrix @ self.matrix.T
+        for column, rows in self._variation_columns.items():
+            similarities[:, column] = variation_similarities[:, rows].max(axis=1)
+        return similarities
+
+    def top_k(self, phrase_matrix, k):
+        """
+        For every skill the k phrases most similar to it, best first: a (k × skills
+        matrix of phrase rows, k × skills matrix of similarities) pair.
+        """
+        similarities = self.similarities(phrase_matrix)
+        k = min(k, similarities.shape[0])
+        if k == 0:
+            return np.zeros((0, len(self.skills)), dtype=np.intp), np.zeros((0, len(self.skills)), dtype=np.float32)
+        rows = np.argpartition(-similarities, k - 1, axis=0)[:k]
+        top = np.take_along_axis(similarities, rows, axis=0)
+        order = np.argsort(-top, axis=0, kind="stable")
+        return np.take_along_axis(rows, order, axis=0), np.take_along_axis(top, order, axis=0)
@@ -0,0 +1,86 @@
+"""Streamed parsing of the LLM analysis gives exactly the sections of parsing the whole text."""
+import itertools
+import random
+
+import pytest
+
+from jobDescriptionAnalyzer import AnalysisSectionParser, parse_analysis_sections
+
+ANALYSIS = """## Technical Skills:
+- Python, React, Docker
+- Kubernetes
+**Soft Skills**
+* Communication
+EXPERIENCE REQUIREMENTS
+1. 5+ years of backend development
+2) Led a team of engineers
+Education:
+• Bachelor's degree in Computer Science
+"""
+
+# Lines the generated analyses are made of: every header form, bullet and numbering
+# style the parser knows, lines it ignores, and blank or padded lines
+LINES = [
+    "## Technical Skills:", "# Responsibilities", "**Qualifications**", "Nice to have:", "SOFT SKILLS",
+    "### Tools & Technologies", "- Python, SQL, AWS", "- Go", "• Strong communication skills", "* Docker",
+    "> Mentoring", "· Kubernetes, Terraform", "1. 3+ years of experience", "2) Bachelor's degree",
+    "10. On-call rotation", "Location: Remote", "A sentence without any marker at all", "-", "",
+    "   ", "  - Indented bullet point", "ALL CAPS LINE", "Trailing spaces   ", "12"
+]
+
+def generate_analysis(rng):
+    """A random analysis text, sometimes with CRLF line ends or without a final newline."""
+    lines = [rng.choice(LINES) for _ in range(rng.randint(0, 25))]
+    text = ("\r\n" if rng.random() < 0.2 else "\n").join(lines)
+    return text + ("\n" if rng.random() < 0.5 else "")
+
+def stream(chunks):
+    """Sections emitted while feeding the chunks and on finish(), and the parser's final sections."""
+    parser = AnalysisSectionParser()
+    emitted = []
+    for chunk in chunks:
+        emitted.extend(parser.feed(chunk))
+    emitted.extend(parser.finish())
+    return emitted, parser.sections
+
+def split_at(text, positions):
+    bounds = [0, *sorted(positions), len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+def random_chunks(text, rng):
+    """text split at random positions, including empty chunks and one character chunks."""
+    count = rng.randint(0, min(len(text), 30))
+    return split_at(text, [rng.randint(0, len(text)) for _ in range(count)])
+
+def assert_streams_like_whole(text, chunks):
+    assert "".join(chunks) == text
+    expected = parse_analysis_sections(text)
+    emitted, sections = stream(chunks)
+    assert sections == expected
+    assert emitted == expected
+
+def test_every_single_split_point():
+    for position in range(len(ANALYSIS) + 1):
+        assert_streams_like_whole(ANALYSIS, split_at(ANALYSIS, [position]))
+
+def test_every_pair_of_split_points():
+    text = ANALYSIS[:120]
+    for positions in itertools.combinations(range(len(text) + 1), 2):
+        assert_streams_like_whole(text, split_at(text, positions))
+
+def test_one_character_at_a_time():
+    assert_streams_like_whole(ANALYSIS, list(ANALYSIS))
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_analyses_and_chunkings(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        text = generate_analysis(rng)
+        for _ in range(5):
+            assert_streams_like_whole(text, random_chunks(text, rng))
+
+def test_streamed_text_matches_the_stripped_response():
+    # The non-streamed endpoint strips the response before parsing; the stream does not
+    text = "\n\n  " + ANALYSIS + "\n  \n"
+    emitted, sections = stream(random_chunks(text, random.Random(0)))
+    assert sections == emitted == parse_analysis_sections(text.strip())
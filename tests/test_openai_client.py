@@ -0,0 +1,146 @@
+"""The Azure OpenAI client against a local stub server: timeouts, retries and a free event loop."""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+import jobDescriptionAnalyzer as service
+from jobAnalysisCache import JobAnalysisCache
+
+ANALYSIS = """## Technical Skills:
+- Python, Docker
+## Experience Requirements:
+1. 5+ years of backend development
+"""
+
+COMPLETION = {
+    "id": "stub", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": ANALYSIS}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+}
+
+JOB_DESCRIPTION = {"title": "Backend Engineer", "company": "Acme", "description": "Python services"}
+
+class AzureStub(ThreadingHTTPServer):
+    """
+    Chat completions endpoint answering each request with the next scripted reply:
+    "slow" (answers only once released, long after the client timeout), "429" or "ok".
+    """
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self, replies):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.replies = list(replies)
+        self.arrivals = []
+        self.release = threading.Event()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.arrivals.append(time.perf_counter())
+        reply = self.server.replies.pop(0) if self.server.replies else "ok"
+        if reply == "slow":
+            self.server.release.wait(10)
+            reply = "ok"
+        if reply == "429":
+            self.respond(429, {"error": {"code": "429", "message": "Rate limit exceeded"}}, {"retry-after-ms": "100"})
+        else:
+            self.respond(200, COMPLETION)
+
+    def respond(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+        except OSError:
+            # The client gave up on this request already
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def azure_stub(monkeypatch):
+    """Start a stub server with the given replies and point a fresh client at it."""
+    servers = []
+
+    def start(replies, timeout=0.5, max_retries=2):
+        server = AzureStub(replies)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        monkeypatch.setattr(service, "endpoint", server.url)
+        monkeypatch.setattr(service, "api_key", "test-key")
+        monkeypatch.setattr(service, "OPENAI_TIMEOUT", timeout)
+        monkeypatch.setattr(service, "OPENAI_MAX_RETRIES", max_retries)
+        monkeypatch.setattr(service, "client", None)
+        monkeypatch.setattr(service, "_job_analysis_cache", JobAnalysisCache(path=None))
+        monkeypatch.setattr(service, "_job_analysis_requests", {})
+        return server
+
+    yield start
+    for server in servers:
+        server.release.set()
+        server.shutdown()
+        server.server_close()
+
+async def call_while_probing(path):
+    """
+    POST JOB_DESCRIPTION to path while probing /healthz every 50 ms. Returns the
+    response and the (latency, finished while the call was pending) of each probe.
+    """
+    transport = httpx.ASGITransport(app=service.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        call = asyncio.ensure_future(http.post(path, json=JOB_DESCRIPTION))
+        probes = []
+        while not call.done():
+            started = time.perf_counter()
+            probe = await http.get("/healthz")
+            assert probe.status_code == 200
+            probes.append((time.perf_counter() - started, not call.done()))
+            await asyncio.sleep(0.05)
+        response = await call
+    await service.client.close()
+    return response, probes
+
+def test_timeout_and_rate_limit_are_retried_without_blocking_the_loop(azure_stub):
+    stub = azure_stub(["slow", "429", "ok"], timeout=0.5, max_retries=2)
+
+    response, probes = asyncio.run(call_while_probing("/analyze-job-description"))
+
+    assert response.status_code == 200
+    sections = response.json()["sections"]
+    assert [section["section_name"] for section in sections] == ["Technical Skills", "Experience Requirements"]
+
+    # The slow reply is abandoned after the timeout (plus backoff), not after the stub answers
+    assert len(stub.arrivals) == 3
+    assert 0.5 <= stub.arrivals[1] - stub.arrivals[0] < 2.5
+    # The 429 asked for 100 ms before the next attempt
+    assert 0.1 <= stub.arrivals[2] - stub.arrivals[1] < 1.5
+
+    # Other requests kept being served while the upstream call was pending
+    pending_probes = [latency for latency, pending in probes if pending]
+    assert len(pending_probes) >= 5
+    assert max(pending_probes) < 0.25
+
+def test_gives_up_after_max_retries(azure_stub):
+    stub = azure_stub(["slow", "429", "ok"], timeout=0.5, max_retries=1)
+
+    response, probes = asyncio.run(call_while_probing("/analyze-job-description"))
+
+    assert response.status_code == 500
+    assert len(stub.arrivals) == 2
+    assert max(latency for latency, _ in probes) < 0.25
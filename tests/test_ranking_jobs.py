@@ -0,0 +1,150 @@
+"""Crash recovery of ranking jobs: interrupted jobs resume without losing or repeating resumes."""
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import jobDescriptionAnalyzer as service
+from rankingJobs import RankingJobStore
+
+def spacy_model_installed():
+    try:
+        import spacy
+    except ImportError:
+        return False
+    return spacy.util.is_package(service.SPACY_MODEL)
+
+class RecordingStore(RankingJobStore):
+    """Remembers the positions it stores results for, and crashes after crash_after calls."""
+
+    def __init__(self, path, crash_after=None, lease=60):
+        super().__init__(path, lease)
+        self.crash_after = crash_after
+        self.recorded = []
+
+    def record_results(self, job_id, results):
+        if self.crash_after is not None and len(self.recorded) == self.crash_after:
+            raise RuntimeError("simulated crash")
+        self.recorded.append([position for position, _, _ in results])
+        return super().record_results(job_id, results)
+
+def make_request(resume_count):
+    job_description = service.JobDescription(
+        title="Backend Engineer",
+        description="Backend engineer building Python services on AWS with 3+ years of experience.",
+        skills=["Python", "AWS", "Docker"],
+        requirements=["3+ years of Python development", "Bachelor's degree in Computer Science"]
+    )
+    resumes = [
+        service.Resume(
+            id=f"resume-{index}",
+            name=f"Candidate {index}",
+            fileName=f"candidate-{index}.txt",
+            uploadDate="2024-01-01",
+            content=(
+                f"Experience\nSoftware engineer with {index} years of experience in Python"
+                + (", AWS" if index % 2 else "") + (" and Docker" if index % 3 == 0 else "")
+                + ".\nEducation\nBachelor of Science in Computer Science"
+            )
+        )
+        for index in range(resume_count)
+    ]
+    return service.ResumeAnalysisRequest(jobDescription=job_description, resumes=resumes)
+
+def test_store_takes_over_a_job_only_after_its_lease_expired(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = RankingJobStore(path, lease=0.3)
+    job_id = store.submit("{}", 5)
+    assert store.claim()[0] == job_id
+    assert store.record_results(job_id, [(0, 40, '{"position": 0}'), (1, 70, '{"position": 1}')])
+    
+    # Another process sharing the queue leaves the leased job alone
+    other = RankingJobStore(path, lease=0.3)
+    assert other.claim() is None
+    
+    # The first process stops sending heartbeats, e.g. because it died
+    time.sleep(0.4)
+    assert other.claim()[0] == job_id
+    assert other.scored_positions(job_id) == {0, 1}
+    
+    # Whatever the first process still tries to write is refused
+    assert not store.heartbeat(job_id)
+    assert not store.record_results(job_id, [(2, 0, '{"position": 2}')])
+    assert not store.finish(job_id, [0, 1])
+    
+    assert other.record_results(
+        job_id, [(position, 10 * position, json.dumps({"position": position})) for position in (2, 3, 4)]
+    )
+    scores = other.result_scores(job_id)
+    assert sorted(scores) == [0, 1, 2, 3, 4]
+    assert other.finish(job_id, sorted(scores, key=lambda position: (-scores[position], position)))
+    
+    results = [json.loads(result)["position"] for result in other.results(job_id, 0, 10)]
+    assert results == [1, 0, 4, 3, 2]
+    assert other.get(job_id)["status"] == "done"
+    assert other.get(job_id)["completed"] == 5
+    store.close()
+    other.close()
+
+def test_heartbeats_keep_the_lease_and_release_hands_it_over(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = RankingJobStore(path, lease=0.3)
+    other = RankingJobStore(path, lease=0.3)
+    job_id = store.submit("{}", 1)
+    store.claim()
+    for _ in range(4):
+        time.sleep(0.1)
+        assert store.heartbeat(job_id)
+        assert other.claim() is None
+    
+    store.release(job_id)
+    assert other.claim()[0] == job_id
+    store.close()
+    other.close()
+
+@pytest.mark.skipif(not spacy_model_installed(), reason="needs the spaCy model")
+def test_interrupted_job_resumes_without_duplicate_or_missing_positions(tmp_path, monkeypatch):
+    monkeypatch.setattr(service, "RANKING_JOB_STEP", 3)
+    path = str(tmp_path / "jobs.db")
+    request = make_request(8)
+    
+    store = RecordingStore(path, crash_after=1)
+    job_id = store.submit(request.model_dump_json(), len(request.resumes))
+    store.claim()
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.run_ranking_job(store, job_id, request.model_dump_json()))
+    assert store.recorded == [[0, 1, 2]]
+    store.close()
+    
+    # A new process claims the job once the crashed one's lease has expired
+    store = RecordingStore(path, lease=0)
+    claimed_id, request_json = store.claim()
+    assert claimed_id == job_id
+    assert asyncio.run(service.run_ranking_job(store, job_id, request_json))
+    
+    # Only the resumes without a stored result were scored again
+    assert store.recorded == [[3, 4, 5], [6, 7]]
+    job = store.get(job_id)
+    assert job["status"] == "done"
+    assert job["completed"] == job["total"] == 8
+    assert store.result_count(job_id) == 8
+    
+    results = [json.loads(result) for result in store.results(job_id, 0, 100)]
+    assert sorted(result["resumeId"] for result in results) == sorted(resume.id for resume in request.resumes)
+    
+    # Same ranking as scoring the whole batch in one go
+    async def rank_all():
+        job_profile = service.compile_job_profile(request.jobDescription)
+        job_profile = await service.weigh_job_keywords(request.resumes, job_profile)
+        return await service.rank_resumes(request.resumes, job_profile)
+    
+    expected = asyncio.run(rank_all())
+    assert results == [service.ResumeScore(**result).model_dump() for result in expected]
+    store.close()
+
+def test_submit_is_refused_without_ranking_job_workers(monkeypatch):
+    monkeypatch.setattr(service, "RANKING_JOB_WORKERS", 0)
+    response = TestClient(service.app).post("/ranking-jobs", json=make_request(1).model_dump())
+    assert response.status_code == 503